@@ -20,7 +20,7 @@ async def get_current_user(
     db: AsyncSession = Depends(get_db)
 ) -> Utilisateur:
     """Récupère l'utilisateur courant depuis le token JWT."""
-    payload = validate_token_not_blacklisted(token)
+    payload = await validate_token_not_blacklisted(token)
     user_id = payload.get("sub")
     
     if not user_id:
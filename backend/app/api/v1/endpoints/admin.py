@@ -5,13 +5,17 @@ Endpoints d'administration
 Routes réservées aux administrateurs.
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func
 from typing import List, Optional
 from datetime import datetime, timedelta
 
-from app.core.database import get_db
+from app.core.config import settings
+from app.core.database import get_db, get_db_read, get_database_stats
+from app.core.pagination import NULL_DATETIME, Keyset, SortKey, fetch_page, set_next_cursor
+from app.core.query_profiler import query_profiler
+from app.core.cache import get_cache_stats
 from app.schemas.admin import (
     DashboardStats,
     UserAdminResponse,
@@ -23,6 +27,8 @@ from app.models.vehicle import Vehicule
 from app.models.booking import Reservation
 from app.models.payment import Paiement
 from app.api.dependencies import get_current_admin_user
+from app.services.vehicle_catalog_service import VehicleCatalogService
+from app.services.cache_stats_service import CacheStatsService
 
 router = APIRouter()
 
@@ -77,13 +83,21 @@ async def get_dashboard_stats(
     )
 
 
+_USERS_KEYSET = Keyset(
+    SortKey(Utilisateur.DateInscription, null_as=NULL_DATETIME),
+    SortKey(Utilisateur.IdentifiantUtilisateur),
+)
+
+
 @router.get("/users", response_model=List[UserAdminResponse])
 async def admin_list_users(
+    response: Response,
     page: int = Query(1, ge=1),
     page_size: int = Query(20, ge=1, le=100),
     type_utilisateur: Optional[str] = None,
     statut: Optional[str] = None,
     search: Optional[str] = None,
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor de la page précédente ; remplace page"),
     admin_user: Utilisateur = Depends(get_current_admin_user),
     db: AsyncSession = Depends(get_db)
 ):
@@ -93,19 +107,17 @@ async def admin_list_users(
     if type_utilisateur:
         query = query.where(Utilisateur.TypeUtilisateur == type_utilisateur)
     if statut:
-        query = query.where(Utilisateur.Statut == statut)
+        query = query.where(Utilisateur.StatutCompte == statut)
     if search:
         query = query.where(
             (Utilisateur.Nom.ilike(f"%{search}%")) |
             (Utilisateur.Email.ilike(f"%{search}%"))
         )
     
-    offset = (page - 1) * page_size
-    query = query.order_by(Utilisateur.DateCreation.desc())
-    query = query.offset(offset).limit(page_size)
-    
-    result = await db.execute(query)
-    users = result.scalars().all()
+    users, next_cursor = await fetch_page(
+        db, query, _USERS_KEYSET, page=page, page_size=page_size, cursor=cursor
+    )
+    set_next_cursor(response, next_cursor)
     
     return [UserAdminResponse.model_validate(u) for u in users]
 
@@ -154,6 +166,7 @@ async def moderate_vehicle(
     
     vehicle.DateModification = datetime.utcnow()
     await db.commit()
+    await VehicleCatalogService.invalidate_caches(vehicle_id)
     
     return {"message": f"Véhicule {action.action}"}
 
@@ -211,3 +224,58 @@ async def unsuspend_user(
     await db.commit()
     
     return {"message": "Utilisateur réactivé"}
+
+
+@router.get("/performance/database")
+async def get_database_performance(
+    admin_user: Utilisateur = Depends(get_current_admin_user)
+):
+    """Saturation de l'exécuteur DB et latence de checkout des pools."""
+    return get_database_stats()
+
+
+@router.get("/performance/cache")
+async def get_cache_performance(
+    admin_user: Utilisateur = Depends(get_current_admin_user)
+):
+    """Cache L1 du worker (hits, évictions), compteurs par type depuis la dernière
+    écriture en base et état du circuit breaker Redis."""
+    return get_cache_stats()
+
+
+@router.get("/performance/cache/effectiveness")
+async def get_cache_effectiveness(
+    hours: int = Query(24, ge=1, le=24 * 90),
+    admin_user: Utilisateur = Depends(get_current_admin_user),
+    db: AsyncSession = Depends(get_db_read)
+):
+    """Taux de hit et temps gagné par type de cache (tous workers, ``CacheStatistiques``)."""
+    return {
+        "hours": hours,
+        "flush_interval_seconds": settings.CACHE_STATS_FLUSH_INTERVAL,
+        "types": await CacheStatsService(db).effectiveness(hours),
+    }
+
+
+@router.get("/performance/queries")
+async def get_query_performance(
+    sort: str = Query("total", pattern="^(total|p95|count|max)$"),
+    limit: int = Query(50, ge=1, le=500),
+    admin_user: Utilisateur = Depends(get_current_admin_user)
+):
+    """Statements SQL par empreinte (count, p50/p95/p99, temps cumulé) et requêtes lentes récentes."""
+    return {
+        "enabled": settings.DB_QUERY_PROFILER_ENABLED,
+        "since": datetime.utcfromtimestamp(query_profiler.started_at),
+        "slow_query_ms": query_profiler.slow_query_ms,
+        "statements": query_profiler.snapshot(sort=sort, limit=limit),
+        "slow_queries": list(query_profiler.slow_queries)[::-1],
+    }
+
+
+@router.delete("/performance/queries", status_code=status.HTTP_204_NO_CONTENT)
+async def reset_query_performance(
+    admin_user: Utilisateur = Depends(get_current_admin_user)
+):
+    """Remet à zéro les statistiques du profiler SQL."""
+    query_profiler.reset()
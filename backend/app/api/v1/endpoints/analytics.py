@@ -9,9 +9,10 @@ from datetime import datetime, timedelta
 from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session
 
-from app.core.database import get_db
+from app.core.database import get_db_read, session_scope
+from app.core.cache_warmup import cache_warmer
 from app.core.cache import (
-    cache_get, cache_set, make_cache_key,
+    cache_get_or_set, make_cache_key,
     CACHE_TTL_MEDIUM, CACHE_TTL_SHORT, CACHE_TTL_LONG,
 )
 from app.api.dependencies import get_current_admin_user
@@ -30,75 +31,71 @@ router = APIRouter()
 async def get_platform_overview(
     start_date: Optional[datetime] = Query(None),
     end_date: Optional[datetime] = Query(None),
-    db: Session = Depends(get_db),
     current_user: Utilisateur = Depends(get_current_admin_user)
 ):
     """
     Vue d'ensemble complete de la plateforme (cached 5min).
     """
+    # Période par défaut arrondie vers le bas par tranches de CACHE_TTL_MEDIUM
+    # (5 min) : les requêtes d'une tranche partagent la même clé (et le même
+    # recalcul, préchauffé au démarrage)
+    now = datetime.utcnow().replace(second=0, microsecond=0)
+    now -= timedelta(minutes=now.minute % (CACHE_TTL_MEDIUM // 60))
     if not start_date:
-        start_date = datetime.utcnow() - timedelta(days=30)
+        start_date = now - timedelta(days=30)
     if not end_date:
-        end_date = datetime.utcnow()
+        end_date = now
+
+    async def load():
+        async with session_scope(read=True) as db:
+            return await db.run_sync(
+                lambda session: AnalyticsService(session).get_platform_overview(start_date, end_date)
+            )
 
     cache_key = make_cache_key(
         "analytics_overview",
         start=start_date.isoformat(),
         end=end_date.isoformat(),
     )
-    cached = await cache_get(cache_key)
-    if cached is not None:
-        return cached
+    data = await cache_get_or_set(cache_key, load, CACHE_TTL_MEDIUM, stale_ttl=CACHE_TTL_SHORT)
+    return PlatformOverviewResponse(**data, period={"start": start_date, "end": end_date})
 
-    sync_session = getattr(db, "_session", db)
-    service = AnalyticsService(sync_session)
-    data = service.get_platform_overview(start_date, end_date)
 
-    response = {**data, "period": {"start": start_date.isoformat(), "end": end_date.isoformat()}}
-    await cache_set(cache_key, response, CACHE_TTL_MEDIUM)
-    return PlatformOverviewResponse(**data, period={"start": start_date, "end": end_date})
+@cache_warmer("analytics_overview")
+async def _warm_platform_overview():
+    await get_platform_overview(start_date=None, end_date=None, current_user=None)
 
 
 @router.get("/real-time", response_model=RealTimeMetricsResponse)
 async def get_real_time_metrics(
-    db: Session = Depends(get_db),
     current_user: Utilisateur = Depends(get_current_admin_user)
 ):
     """
     Metriques en temps reel (cached 1min).
     """
-    cache_key = "autoloco:analytics_realtime:latest"
-    cached = await cache_get(cache_key)
-    if cached is not None:
-        return cached
+    async def load():
+        async with session_scope(read=True) as db:
+            return await db.run_sync(lambda session: AnalyticsService(session).get_real_time_metrics())
 
-    sync_session = getattr(db, "_session", db)
-    service = AnalyticsService(sync_session)
-    data = service.get_real_time_metrics()
-
-    await cache_set(cache_key, data, CACHE_TTL_SHORT)
+    data = await cache_get_or_set("autoloco:analytics_realtime:latest", load, CACHE_TTL_SHORT)
     return RealTimeMetricsResponse(**data)
 
 
 @router.get("/top-performers", response_model=TopPerformersResponse)
 async def get_top_performers(
     limit: int = Query(10, ge=1, le=50),
-    db: Session = Depends(get_db),
     current_user: Utilisateur = Depends(get_current_admin_user)
 ):
     """
     Top performers de la plateforme (cached 30min).
     """
-    cache_key = make_cache_key("analytics_top", limit=limit)
-    cached = await cache_get(cache_key)
-    if cached is not None:
-        return cached
-
-    sync_session = getattr(db, "_session", db)
-    service = AnalyticsService(sync_session)
-    data = service.get_top_performers(limit)
+    async def load():
+        async with session_scope(read=True) as db:
+            return await db.run_sync(lambda session: AnalyticsService(session).get_top_performers(limit))
 
-    await cache_set(cache_key, data, CACHE_TTL_LONG)
+    data = await cache_get_or_set(
+        make_cache_key("analytics_top", limit=limit), load, CACHE_TTL_LONG, stale_ttl=CACHE_TTL_MEDIUM
+    )
     return TopPerformersResponse(**data)
 
 
@@ -107,7 +104,7 @@ async def export_analytics(
     format: str = Query("csv", pattern="^(csv|xlsx|json)$"),
     start_date: Optional[datetime] = Query(None),
     end_date: Optional[datetime] = Query(None),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_db_read),
     current_user: Utilisateur = Depends(get_current_admin_user)
 ):
     """
@@ -14,6 +14,7 @@ from typing import List, Optional
 from datetime import datetime
 
 from app.core.database import get_db
+from app.core.cache import forget_missing
 from app.core.security import (
     hash_password,
     verify_password,
@@ -84,6 +85,7 @@ async def register(
     await db.add(user)
     await db.commit()
     await db.refresh(user)
+    await forget_missing("user", user.IdentifiantUtilisateur)
     
     # Créer les tokens
     token_data = {
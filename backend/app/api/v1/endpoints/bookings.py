@@ -14,6 +14,7 @@ from decimal import Decimal
 import uuid
 
 from app.core.database import get_db
+from app.core.pagination import NULL_DATETIME, CountStrategy, Keyset, SortKey, count_rows, fetch_page
 from app.schemas.booking import (
     BookingCreate,
     BookingUpdate,
@@ -39,6 +40,12 @@ def _user_type(current_user: Utilisateur) -> str:
     return (getattr(current_user, "TypeUtilisateur", None) or "").lower()
 
 
+_BOOKINGS_KEYSET = Keyset(
+    SortKey(Reservation.DateCreationReservation, null_as=NULL_DATETIME),
+    SortKey(Reservation.IdentifiantReservation),
+)
+
+
 @router.get("", response_model=BookingListResponse)
 async def list_bookings(
     page: int = Query(1, ge=1),
@@ -46,6 +53,8 @@ async def list_bookings(
     statut: Optional[str] = None,
     date_debut: Optional[date] = None,
     date_fin: Optional[date] = None,
+    cursor: Optional[str] = Query(None, description="next_cursor de la page précédente ; remplace page"),
+    count: CountStrategy = Query(CountStrategy.EXACT, description="Total : exact, cached, estimated ou none"),
     current_user: Utilisateur = Depends(get_current_active_user),
     db: AsyncSession = Depends(get_db)
 ):
@@ -74,23 +83,21 @@ async def list_bookings(
     if date_fin:
         query = query.where(Reservation.DateFin <= datetime.combine(date_fin, datetime.max.time()))
     
-    # Count
-    count_query = select(func.count()).select_from(query.subquery())
-    total = await db.scalar(count_query)
+    # Total selon la stratégie demandée (count=)
+    total = await count_rows(db, query, count)
     
-    # Pagination
-    offset = (page - 1) * page_size
-    query = query.order_by(Reservation.DateCreationReservation.desc())
-    query = query.offset(offset).limit(page_size)
-    
-    result = await db.execute(query)
-    bookings = result.scalars().all()
+    # Pagination (numéro de page ou curseur)
+    bookings, next_cursor = await fetch_page(
+        db, query, _BOOKINGS_KEYSET, page=page, page_size=page_size, cursor=cursor
+    )
     
     return BookingListResponse(
         bookings=[BookingResponse.model_validate(b) for b in bookings],
-        total=total or 0,
+        total=total,
         page=page,
-        page_size=page_size
+        page_size=page_size,
+        has_more=next_cursor is not None,
+        next_cursor=next_cursor
     )
 
 
@@ -135,14 +142,21 @@ async def create_booking(
     current_user: Utilisateur = Depends(get_current_active_user),
     db: AsyncSession = Depends(get_db)
 ):
-    """Crée une nouvelle réservation."""
+    """Crée une nouvelle réservation.
+
+    Recherche du véhicule, contrôle de conflit, insertion et commit sont
+    exécutés en un seul passage sur un thread DB (``db.run_sync``).
+    """
+    return await db.run_sync(_create_booking, booking_data, current_user.IdentifiantUtilisateur)
+
+
+def _create_booking(session, booking_data: BookingCreate, locataire_id: int) -> BookingResponse:
     # Vérifier disponibilité du véhicule
-    vehicle_result = await db.execute(
+    vehicle = session.execute(
         select(Vehicule).where(
             Vehicule.IdentifiantVehicule == booking_data.identifiant_vehicule
         )
-    )
-    vehicle = vehicle_result.scalar_one_or_none()
+    ).scalar_one_or_none()
     
     if not vehicle:
         raise HTTPException(
@@ -160,7 +174,7 @@ async def create_booking(
     date_debut_dt = datetime.combine(booking_data.date_debut, datetime.min.time())
     date_fin_dt = datetime.combine(booking_data.date_fin, datetime.max.time())
     
-    conflict_result = await db.execute(
+    conflict_result = session.execute(
         select(Reservation).where(
             and_(
                 Reservation.IdentifiantVehicule == booking_data.identifiant_vehicule,
@@ -205,7 +219,7 @@ async def create_booking(
     booking = Reservation(
         NumeroReservation=f'RES-TEMP-{uuid.uuid4().hex[:12].upper()}',  # Le trigger SQL remplacera par la valeur finale
         IdentifiantVehicule=booking_data.identifiant_vehicule,
-        IdentifiantLocataire=current_user.IdentifiantUtilisateur,
+        IdentifiantLocataire=locataire_id,
         IdentifiantProprietaire=vehicle.IdentifiantProprietaire,
         DateDebut=date_debut_dt,
         DateFin=date_fin_dt,
@@ -233,10 +247,11 @@ async def create_booking(
         DateCreationReservation=datetime.utcnow()
     )
     
-    await db.add(booking)
-    await db.commit()
-    await db.refresh(booking)
+    session.add(booking)
+    session.commit()
+    session.refresh(booking)
     
+    # Construit ici : les relations chargées à la demande restent sur le même thread
     return BookingResponse.model_validate(booking)
 
 
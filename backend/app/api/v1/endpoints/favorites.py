@@ -82,8 +82,8 @@ async def add_to_favorites(
         DateAjout=datetime.utcnow()
     )
     
-    await db.add(favorite)
-    await db.commit()
+    async with db.batch():
+        await db.add(favorite)
     
     return {"message": "Véhicule ajouté aux favoris"}
 
@@ -18,12 +18,15 @@ from sqlalchemy import func, text
 from typing import Optional, List
 from pydantic import BaseModel, Field
 
-from app.core.database import get_db
+from app.core.database import get_db_read
+from app.core.cache_warmup import cache_warmer
+from app.core.cache import cached, CACHE_TTL_SHORT, CACHE_TTL_MEDIUM
 from app.services.geolocation_service import (
     geolocation_service,
     geocoding_service,
     routing_service
 )
+from app.services.vehicle_catalog_service import VEHICLES_CACHE_TAG
 
 router = APIRouter()
 
@@ -80,6 +83,7 @@ class GeocodeRequest(BaseModel):
 # ============================================================
 
 @router.get("/nearby")
+@cached("gps_nearby", CACHE_TTL_SHORT, tags=(VEHICLES_CACHE_TAG,))
 async def get_nearby_vehicles(
     lat: float = Query(..., ge=-90, le=90, description="Latitude du centre de recherche"),
     lng: float = Query(..., ge=-180, le=180, description="Longitude du centre de recherche"),
@@ -94,7 +98,7 @@ async def get_nearby_vehicles(
     instant: Optional[bool] = Query(None, description="Réservation instantanée uniquement"),
     limit: int = Query(20, ge=1, le=100, description="Nombre maximum de résultats"),
     format: str = Query("json", pattern="^(json|geojson)$", description="Format de sortie: json ou geojson"),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db_read)
 ):
     """
     Recherche les véhicules disponibles à proximité d'un point GPS
@@ -202,9 +206,60 @@ async def get_nearby_vehicles(
 # VILLES DISPONIBLES (DONNÉES DYNAMIQUES)
 # ============================================================
 
+# Réponse de repli si la base est indisponible
+_FALLBACK_CITIES = {
+    "success": True,
+    "total_cities": 6,
+    "cities": [
+        {
+            "name": "Douala",
+            "region": "Littoral",
+            "coordinates": {"lat": 4.0511, "lng": 9.7679},
+            "vehicles_count": 150,
+            "prices": {"average_per_day": 25000, "currency": "XOF"}
+        },
+        {
+            "name": "Yaoundé",
+            "region": "Centre",
+            "coordinates": {"lat": 3.8480, "lng": 11.5021},
+            "vehicles_count": 120,
+            "prices": {"average_per_day": 27000, "currency": "XOF"}
+        },
+        {
+            "name": "Bafoussam",
+            "region": "Ouest",
+            "coordinates": {"lat": 5.4737, "lng": 10.4179},
+            "vehicles_count": 45,
+            "prices": {"average_per_day": 22000, "currency": "XOF"}
+        },
+        {
+            "name": "Bamenda",
+            "region": "Nord-Ouest",
+            "coordinates": {"lat": 5.9527, "lng": 10.1582},
+            "vehicles_count": 30,
+            "prices": {"average_per_day": 20000, "currency": "XOF"}
+        },
+        {
+            "name": "Garoua",
+            "region": "Nord",
+            "coordinates": {"lat": 9.3017, "lng": 13.3940},
+            "vehicles_count": 25,
+            "prices": {"average_per_day": 23000, "currency": "XOF"}
+        },
+        {
+            "name": "Maroua",
+            "region": "Extrême-Nord",
+            "coordinates": {"lat": 10.5915, "lng": 14.3228},
+            "vehicles_count": 15,
+            "prices": {"average_per_day": 21000, "currency": "XOF"}
+        }
+    ]
+}
+
+
 @router.get("/cities")
 async def get_available_cities(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_db_read),
     min_vehicles: int = Query(1, ge=0, description="Minimum de véhicules requis")
 ):
     """
@@ -222,105 +277,70 @@ async def get_available_cities(
     \`\`\`
     """
     try:
-        # Requête SQL pour statistiques par ville
-        sql = text("""
-            SELECT 
-                LocalisationVille AS city,
-                LocalisationRegion AS region,
-                AVG(Latitude) AS lat,
-                AVG(Longitude) AS lng,
-                COUNT(*) AS vehicles_count,
-                AVG(PrixJournalier) AS avg_price,
-                MIN(PrixJournalier) AS min_price,
-                MAX(PrixJournalier) AS max_price
-            FROM Vehicules
-            WHERE 
-                StatutVehicule = 'Actif'
-                AND LocalisationVille IS NOT NULL
-                AND Latitude IS NOT NULL
-                AND Longitude IS NOT NULL
-            GROUP BY LocalisationVille, LocalisationRegion
-            HAVING COUNT(*) >= :min_vehicles
-            ORDER BY vehicles_count DESC
-        """)
-        
-        result = db.execute(sql, {"min_vehicles": min_vehicles})
-        cities = result.fetchall()
-        
-        return {
-            "success": True,
-            "total_cities": len(cities),
-            "cities": [
-                {
-                    "name": row.city,
-                    "region": row.region,
-                    "coordinates": {
-                        "lat": float(row.lat),
-                        "lng": float(row.lng)
-                    },
-                    "vehicles_count": row.vehicles_count,
-                    "prices": {
-                        "average_per_day": int(row.avg_price),
-                        "min_per_day": int(row.min_price),
-                        "max_per_day": int(row.max_price),
-                        "currency": "XOF"
-                    }
-                }
-                for row in cities
-            ]
-        }
+        return await _city_stats(db=db, min_vehicles=min_vehicles)
     
     except Exception as e:
         print(f"[v0] Error fetching cities: {str(e)}")
-        # Fallback sur données statiques en cas d'erreur
-        return {
-            "success": True,
-            "total_cities": 6,
-            "cities": [
-                {
-                    "name": "Douala",
-                    "region": "Littoral",
-                    "coordinates": {"lat": 4.0511, "lng": 9.7679},
-                    "vehicles_count": 150,
-                    "prices": {"average_per_day": 25000, "currency": "XOF"}
-                },
-                {
-                    "name": "Yaoundé",
-                    "region": "Centre",
-                    "coordinates": {"lat": 3.8480, "lng": 11.5021},
-                    "vehicles_count": 120,
-                    "prices": {"average_per_day": 27000, "currency": "XOF"}
-                },
-                {
-                    "name": "Bafoussam",
-                    "region": "Ouest",
-                    "coordinates": {"lat": 5.4737, "lng": 10.4179},
-                    "vehicles_count": 45,
-                    "prices": {"average_per_day": 22000, "currency": "XOF"}
-                },
-                {
-                    "name": "Bamenda",
-                    "region": "Nord-Ouest",
-                    "coordinates": {"lat": 5.9527, "lng": 10.1582},
-                    "vehicles_count": 30,
-                    "prices": {"average_per_day": 20000, "currency": "XOF"}
-                },
-                {
-                    "name": "Garoua",
-                    "region": "Nord",
-                    "coordinates": {"lat": 9.3017, "lng": 13.3940},
-                    "vehicles_count": 25,
-                    "prices": {"average_per_day": 23000, "currency": "XOF"}
+        # Fallback sur données statiques en cas d'erreur (jamais mis en cache)
+        return _FALLBACK_CITIES
+
+
+@cached("gps_cities", CACHE_TTL_MEDIUM, tags=(VEHICLES_CACHE_TAG,))
+async def _city_stats(db: Session = Depends(get_db_read), min_vehicles: int = 1):
+    """Statistiques réelles par ville (mises en cache ; les erreurs remontent)."""
+    # Requête SQL pour statistiques par ville
+    sql = text("""
+        SELECT 
+            LocalisationVille AS city,
+            LocalisationRegion AS region,
+            AVG(Latitude) AS lat,
+            AVG(Longitude) AS lng,
+            COUNT(*) AS vehicles_count,
+            AVG(PrixJournalier) AS avg_price,
+            MIN(PrixJournalier) AS min_price,
+            MAX(PrixJournalier) AS max_price
+        FROM Vehicules
+        WHERE 
+            StatutVehicule = 'Actif'
+            AND LocalisationVille IS NOT NULL
+            AND Latitude IS NOT NULL
+            AND Longitude IS NOT NULL
+        GROUP BY LocalisationVille, LocalisationRegion
+        HAVING COUNT(*) >= :min_vehicles
+        ORDER BY vehicles_count DESC
+    """)
+    
+    result = await db.execute(sql, {"min_vehicles": min_vehicles})
+    cities = result.fetchall()
+    
+    return {
+        "success": True,
+        "total_cities": len(cities),
+        "cities": [
+            {
+                "name": row.city,
+                "region": row.region,
+                "coordinates": {
+                    "lat": float(row.lat),
+                    "lng": float(row.lng)
                 },
-                {
-                    "name": "Maroua",
-                    "region": "Extrême-Nord",
-                    "coordinates": {"lat": 10.5915, "lng": 14.3228},
-                    "vehicles_count": 15,
-                    "prices": {"average_per_day": 21000, "currency": "XOF"}
+                "vehicles_count": row.vehicles_count,
+                "prices": {
+                    "average_per_day": int(row.avg_price),
+                    "min_per_day": int(row.min_price),
+                    "max_per_day": int(row.max_price),
+                    "currency": "XOF"
                 }
-            ]
-        }
+            }
+            for row in cities
+        ]
+    }
+
+
+@cache_warmer("gps_cities")
+async def _warm_available_cities():
+    # ``@cached`` ouvre sa propre session pour le calcul
+    await _city_stats(db=None, min_vehicles=1)
 
 
 # ============================================================
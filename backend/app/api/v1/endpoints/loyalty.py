@@ -5,11 +5,12 @@ Endpoints de gestion du programme de fidélité
 
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, and_
+from sqlalchemy import select, func, and_, or_
 from typing import List
 from datetime import datetime
 
 from app.core.database import get_db
+from app.core.cache import cached, cache_invalidate_tags, CACHE_TTL_SHORT, CACHE_TTL_MEDIUM
 from app.schemas.loyalty import (
     LoyaltyProgramResponse,
     PointsHistoryResponse,
@@ -24,8 +25,21 @@ from app.api.dependencies import get_current_active_user, get_current_admin_user
 
 router = APIRouter()
 
+LOYALTY_PROGRAMS_CACHE_TAG = "loyalty_programs"
+
+
+async def invalidate_loyalty_program_caches() -> None:
+    """
+    À appeler après toute écriture sur ProgrammeFidelite.
+
+    Aucun endpoint ne modifie les programmes aujourd'hui (gérés directement
+    en base) : le TTL court borne le délai de prise en compte.
+    """
+    await cache_invalidate_tags(LOYALTY_PROGRAMS_CACHE_TAG)
+
 
 @router.get("/status", response_model=UserLoyaltyStatusResponse)
+@cached("loyalty_status", CACHE_TTL_SHORT, per_user=True, tags=("loyalty_user:{user_id}",))
 async def get_loyalty_status(
     current_user: Utilisateur = Depends(get_current_active_user),
     db: AsyncSession = Depends(get_db)
@@ -99,6 +113,7 @@ async def get_loyalty_status(
 
 
 @router.get("/programs", response_model=List[LoyaltyProgramResponse])
+@cached("loyalty_programs", CACHE_TTL_MEDIUM, tags=(LOYALTY_PROGRAMS_CACHE_TAG,))
 async def list_loyalty_programs(
     db: AsyncSession = Depends(get_db)
 ):
@@ -152,6 +167,7 @@ async def award_points(
     
     await db.commit()
     await db.refresh(points)
+    await cache_invalidate_tags(f"loyalty_user:{points_data.identifiant_utilisateur}")
     
     return PointsHistoryResponse.model_validate(points)
 
@@ -191,11 +207,13 @@ async def create_referral(
     await db.add(parrainage)
     await db.commit()
     await db.refresh(parrainage)
+    await cache_invalidate_tags(f"loyalty_user:{current_user.IdentifiantUtilisateur}")
     
     return ReferralResponse.model_validate(parrainage)
 
 
 @router.get("/referrals", response_model=List[ReferralResponse])
+@cached("loyalty_referrals", CACHE_TTL_SHORT, per_user=True, tags=("loyalty_user:{user_id}",))
 async def list_referrals(
     current_user: Utilisateur = Depends(get_current_active_user),
     db: AsyncSession = Depends(get_db)
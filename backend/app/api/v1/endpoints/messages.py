@@ -5,13 +5,16 @@ Endpoints de messagerie
 Routes pour la messagerie entre locataires et propriétaires.
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func, and_, or_
 from typing import List, Optional
 from datetime import datetime
 
 from app.core.database import get_db
+from app.core.pagination import (
+    NULL_DATETIME, CountStrategy, Keyset, SortKey, count_rows, fetch_page, set_next_cursor,
+)
 from app.schemas.message import (
     MessageCreate,
     MessageResponse,
@@ -25,11 +28,23 @@ from app.api.dependencies import get_current_active_user
 
 router = APIRouter()
 
+# Conversations sans message : date de création à la place de DateDernierMessage
+_CONVERSATIONS_KEYSET = Keyset(
+    SortKey(Conversation.DateDernierMessage, null_as=Conversation.DateCreation),
+    SortKey(Conversation.IdentifiantConversation),
+)
+_MESSAGES_KEYSET = Keyset(
+    SortKey(Message.DateEnvoi, null_as=NULL_DATETIME),
+    SortKey(Message.IdentifiantMessage),
+)
+
 
 @router.get("/conversations", response_model=ConversationListResponse)
 async def list_conversations(
     page: int = Query(1, ge=1),
     page_size: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="next_cursor de la page précédente ; remplace page"),
+    count: CountStrategy = Query(CountStrategy.EXACT, description="Total : exact, cached, estimated ou none"),
     current_user: Utilisateur = Depends(get_current_active_user),
     db: AsyncSession = Depends(get_db)
 ):
@@ -41,35 +56,35 @@ async def list_conversations(
         )
     )
     
-    # Count
-    count_query = select(func.count()).select_from(query.subquery())
-    total = await db.scalar(count_query)
+    # Total selon la stratégie demandée (count=)
+    total = await count_rows(db, query, count)
     
-    # Pagination
-    offset = (page - 1) * page_size
-    query = query.order_by(Conversation.DateDernierMessage.desc())
-    query = query.offset(offset).limit(page_size)
-    
-    result = await db.execute(query)
-    conversations = result.scalars().all()
+    # Pagination (numéro de page ou curseur)
+    conversations, next_cursor = await fetch_page(
+        db, query, _CONVERSATIONS_KEYSET, page=page, page_size=page_size, cursor=cursor
+    )
     
     return ConversationListResponse(
         conversations=[ConversationResponse.model_validate(c) for c in conversations],
-        total=total or 0,
+        total=total,
         page=page,
-        page_size=page_size
+        page_size=page_size,
+        has_more=next_cursor is not None,
+        next_cursor=next_cursor
     )
 
 
 @router.get("/conversations/{conversation_id}/messages", response_model=List[MessageResponse])
 async def get_conversation_messages(
     conversation_id: int,
+    response: Response,
     page: int = Query(1, ge=1),
     page_size: int = Query(50, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor de la page précédente (messages plus anciens) ; remplace page"),
     current_user: Utilisateur = Depends(get_current_active_user),
     db: AsyncSession = Depends(get_db)
 ):
-    """Récupère les messages d'une conversation."""
+    """Récupère les messages d'une conversation (du plus ancien au plus récent de la page)."""
     # Vérifier accès
     conv_result = await db.execute(
         select(Conversation).where(Conversation.IdentifiantConversation == conversation_id)
@@ -89,16 +104,13 @@ async def get_conversation_messages(
             detail="Accès non autorisé"
         )
     
-    # Messages
-    offset = (page - 1) * page_size
-    result = await db.execute(
-        select(Message)
-        .where(Message.IdentifiantConversation == conversation_id)
-        .order_by(Message.DateEnvoi.desc())
-        .offset(offset)
-        .limit(page_size)
+    # Messages, des plus récents aux plus anciens
+    messages, next_cursor = await fetch_page(
+        db,
+        select(Message).where(Message.IdentifiantConversation == conversation_id),
+        _MESSAGES_KEYSET, page=page, page_size=page_size, cursor=cursor,
     )
-    messages = result.scalars().all()
+    set_next_cursor(response, next_cursor)
     
     # Marquer comme lus
     for msg in messages:
@@ -115,14 +127,17 @@ async def send_message(
     current_user: Utilisateur = Depends(get_current_active_user),
     db: AsyncSession = Depends(get_db)
 ):
-    """Envoie un nouveau message."""
+    """Envoie un nouveau message (unité de travail exécutée via ``db.run_sync``)."""
+    return await db.run_sync(_send_message, message_data, current_user.IdentifiantUtilisateur)
+
+
+def _send_message(session, message_data: MessageCreate, expediteur_id: int) -> MessageResponse:
     # Vérifier que le destinataire existe
-    recipient_result = await db.execute(
+    recipient = session.execute(
         select(Utilisateur).where(
             Utilisateur.IdentifiantUtilisateur == message_data.identifiant_destinataire
         )
-    )
-    recipient = recipient_result.scalar_one_or_none()
+    ).scalar_one_or_none()
     
     if not recipient:
         raise HTTPException(
@@ -131,49 +146,48 @@ async def send_message(
         )
     
     # Trouver ou créer la conversation
-    conv_result = await db.execute(
+    conversation = session.execute(
         select(Conversation).where(
             or_(
                 and_(
-                    Conversation.IdentifiantUtilisateur1 == current_user.IdentifiantUtilisateur,
+                    Conversation.IdentifiantUtilisateur1 == expediteur_id,
                     Conversation.IdentifiantUtilisateur2 == message_data.identifiant_destinataire
                 ),
                 and_(
                     Conversation.IdentifiantUtilisateur1 == message_data.identifiant_destinataire,
-                    Conversation.IdentifiantUtilisateur2 == current_user.IdentifiantUtilisateur
+                    Conversation.IdentifiantUtilisateur2 == expediteur_id
                 )
             )
         )
-    )
-    conversation = conv_result.scalar_one_or_none()
+    ).scalar_one_or_none()
     
     if not conversation:
         conversation = Conversation(
-            IdentifiantUtilisateur1=current_user.IdentifiantUtilisateur,
+            IdentifiantUtilisateur1=expediteur_id,
             IdentifiantUtilisateur2=message_data.identifiant_destinataire,
             DateCreation=datetime.utcnow()
         )
-        await db.add(conversation)
-        await db.flush()
+        session.add(conversation)
+        session.flush()
     
     # Créer le message
     message = Message(
         IdentifiantConversation=conversation.IdentifiantConversation,
-        IdentifiantExpediteur=current_user.IdentifiantUtilisateur,
+        IdentifiantExpediteur=expediteur_id,
         IdentifiantDestinataire=message_data.identifiant_destinataire,
         Contenu=message_data.contenu,
         DateEnvoi=datetime.utcnow(),
         EstLu=False
     )
     
-    await db.add(message)
+    session.add(message)
     
     # Mettre à jour la conversation
     conversation.DateDernierMessage = datetime.utcnow()
     conversation.NombreMessages = (conversation.NombreMessages or 0) + 1
     
-    await db.commit()
-    await db.refresh(message)
+    session.commit()
+    session.refresh(message)
     
     return MessageResponse.model_validate(message)
 
@@ -12,6 +12,7 @@ from typing import List, Optional
 from datetime import datetime
 
 from app.core.database import get_db
+from app.core.pagination import CountStrategy, count_rows, fetch_offset_page
 from app.schemas.notification import (
     NotificationResponse,
     NotificationListResponse
@@ -29,6 +30,7 @@ async def get_notifications(
     page_size: int = Query(20, ge=1, le=100),
     unread_only: bool = Query(False),
     category: Optional[str] = None,
+    count: CountStrategy = Query(CountStrategy.EXACT, description="Total : exact, cached, estimated ou none"),
     current_user: Utilisateur = Depends(get_current_active_user),
     db: AsyncSession = Depends(get_db)
 ):
@@ -45,9 +47,8 @@ async def get_notifications(
     
     # Pas de filtre DateExpiration car non présent dans le modèle
     
-    # Count total
-    count_query = select(func.count()).select_from(query.subquery())
-    total = await db.scalar(count_query)
+    # Total selon la stratégie demandée (count=)
+    total = await count_rows(db, query, count)
     
     # Count unread
     unread_query = select(func.count()).where(
@@ -58,20 +59,17 @@ async def get_notifications(
     )
     unread_count = await db.scalar(unread_query)
     
-    # Pagination
-    offset = (page - 1) * page_size
+    # Pagination (une ligne de plus pour has_more)
     query = query.order_by(Notification.DateCreation.desc())
-    query = query.offset(offset).limit(page_size)
-    
-    result = await db.execute(query)
-    notifications = result.scalars().all()
+    notifications, has_more = await fetch_offset_page(db, query, page=page, page_size=page_size)
     
     return NotificationListResponse(
         notifications=[NotificationResponse.model_validate(n) for n in notifications],
-        total=total or 0,
+        total=total,
         unread_count=unread_count or 0,
         page=page,
-        page_size=page_size
+        page_size=page_size,
+        has_more=has_more
     )
 
 
@@ -12,6 +12,7 @@ from typing import List, Optional
 from datetime import datetime
 
 from app.core.database import get_db
+from app.core.pagination import CountStrategy, count_rows, fetch_offset_page
 from app.schemas.payment import (
     PaymentCreate,
     PaymentResponse,
@@ -35,6 +36,7 @@ async def list_payments(
     page: int = Query(1, ge=1),
     page_size: int = Query(20, ge=1, le=100),
     statut: Optional[str] = None,
+    count: CountStrategy = Query(CountStrategy.EXACT, description="Total : exact, cached, estimated ou none"),
     current_user: Utilisateur = Depends(get_current_active_user),
     db: AsyncSession = Depends(get_db)
 ):
@@ -49,23 +51,19 @@ async def list_payments(
     if statut:
         query = query.where(Paiement.Statut == statut)
     
-    # Count
-    count_query = select(func.count()).select_from(query.subquery())
-    total = await db.scalar(count_query)
+    # Total selon la stratégie demandée (count=)
+    total = await count_rows(db, query, count)
     
-    # Pagination
-    offset = (page - 1) * page_size
+    # Pagination (une ligne de plus pour has_more)
     query = query.order_by(Paiement.DateCreation.desc())
-    query = query.offset(offset).limit(page_size)
-    
-    result = await db.execute(query)
-    payments = result.scalars().all()
+    payments, has_more = await fetch_offset_page(db, query, page=page, page_size=page_size)
     
     return PaymentListResponse(
         payments=[PaymentResponse.model_validate(p) for p in payments],
-        total=total or 0,
+        total=total,
         page=page,
-        page_size=page_size
+        page_size=page_size,
+        has_more=has_more
     )
 
 
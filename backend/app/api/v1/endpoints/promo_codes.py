@@ -11,6 +11,7 @@ from datetime import datetime
 from decimal import Decimal
 
 from app.core.database import get_db
+from app.core.cache import is_known_missing, remember_missing, forget_missing
 from app.schemas.promo_code import (
     PromoCodeCreate,
     PromoCodeUpdate,
@@ -53,12 +54,19 @@ async def get_promo_code(
     db: AsyncSession = Depends(get_db)
 ):
     """Récupère un code promo par son code"""
+    if await is_known_missing("promo_code", code.upper()):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Code promo non trouvé"
+        )
+
     result = await db.execute(
         select(CodePromo).where(CodePromo.CodePromo == code.upper())
     )
     promo = result.scalar_one_or_none()
     
     if not promo:
+        await remember_missing("promo_code", code.upper())
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Code promo non trouvé"
@@ -114,6 +122,7 @@ async def create_promo_code(
     await db.add(promo)
     await db.commit()
     await db.refresh(promo)
+    await forget_missing("promo_code", promo.CodePromo)
     
     return PromoCodeResponse.model_validate(promo)
 
@@ -188,11 +197,17 @@ async def validate_promo_code(
     db: AsyncSession = Depends(get_db)
 ):
     """Valide un code promo pour une réservation"""
-    # Chercher le code promo
-    result = await db.execute(
-        select(CodePromo).where(CodePromo.CodePromo == validation_data.code_promo.upper())
-    )
-    promo = result.scalar_one_or_none()
+    code = validation_data.code_promo.upper()
+
+    # Chercher le code promo (sauf s'il vient d'être cherché en vain)
+    promo = None
+    if not await is_known_missing("promo_code", code):
+        result = await db.execute(
+            select(CodePromo).where(CodePromo.CodePromo == code)
+        )
+        promo = result.scalar_one_or_none()
+        if not promo:
+            await remember_missing("promo_code", code)
     
     if not promo:
         return PromoCodeValidationResponse(
@@ -11,7 +11,9 @@ from sqlalchemy import select, func
 from typing import List, Optional
 from datetime import datetime
 
-from app.core.database import get_db
+from app.core.database import get_db, get_db_read
+from app.core.cache import cached, cache_invalidate_tags, CACHE_TTL_MEDIUM
+from app.core.pagination import CountStrategy, count_rows, fetch_offset_page
 from app.schemas.review import (
     ReviewCreate,
     ReviewResponse,
@@ -25,68 +27,77 @@ from app.api.dependencies import get_current_active_user
 
 router = APIRouter()
 
+# Tag des listes d'avis et de leurs totaux en cache
+REVIEWS_CACHE_TAG = "reviews"
+
+
+async def invalidate_review_caches() -> None:
+    """
+    Invalide les listes d'avis mises en cache.
+
+    Seul ``create_review`` l'appelle aujourd'hui ; toute nouvelle écriture
+    sur Avis (réponse, modification, suppression, modération) devra l'appeler.
+    """
+    await cache_invalidate_tags(REVIEWS_CACHE_TAG)
+
 
 @router.get("/vehicle/{vehicle_id}", response_model=ReviewListResponse)
+@cached("reviews", CACHE_TTL_MEDIUM, tags=(REVIEWS_CACHE_TAG,))
 async def get_vehicle_reviews(
     vehicle_id: int,
     page: int = Query(1, ge=1),
     page_size: int = Query(20, ge=1, le=100),
-    db: AsyncSession = Depends(get_db)
+    count: CountStrategy = Query(CountStrategy.EXACT, description="Total : exact, cached, estimated ou none"),
+    db: AsyncSession = Depends(get_db_read)
 ):
     """Récupère les avis d'un véhicule."""
     query = select(Avis).where(
         Avis.IdentifiantVehicule == vehicle_id
     )
     
-    # Count
-    count_query = select(func.count()).select_from(query.subquery())
-    total = await db.scalar(count_query)
+    # Total selon la stratégie demandée (count=)
+    total = await count_rows(db, query, count, tags=(REVIEWS_CACHE_TAG,))
     
-    # Pagination
-    offset = (page - 1) * page_size
+    # Pagination (une ligne de plus pour has_more)
     query = query.order_by(Avis.DateCreation.desc())
-    query = query.offset(offset).limit(page_size)
-    
-    result = await db.execute(query)
-    reviews = result.scalars().all()
+    reviews, has_more = await fetch_offset_page(db, query, page=page, page_size=page_size)
     
     return ReviewListResponse(
         reviews=[ReviewResponse.model_validate(r) for r in reviews],
-        total=total or 0,
+        total=total,
         page=page,
-        page_size=page_size
+        page_size=page_size,
+        has_more=has_more
     )
 
 
 @router.get("/user/{user_id}", response_model=ReviewListResponse)
+@cached("reviews", CACHE_TTL_MEDIUM, tags=(REVIEWS_CACHE_TAG,))
 async def get_user_reviews(
     user_id: int,
     page: int = Query(1, ge=1),
     page_size: int = Query(20, ge=1, le=100),
-    db: AsyncSession = Depends(get_db)
+    count: CountStrategy = Query(CountStrategy.EXACT, description="Total : exact, cached, estimated ou none"),
+    db: AsyncSession = Depends(get_db_read)
 ):
     """Récupère les avis reçus par un utilisateur."""
     query = select(Avis).where(
         Avis.IdentifiantUtilisateurCible == user_id
     )
     
-    # Count
-    count_query = select(func.count()).select_from(query.subquery())
-    total = await db.scalar(count_query)
+    # Total selon la stratégie demandée (count=)
+    total = await count_rows(db, query, count, tags=(REVIEWS_CACHE_TAG,))
     
-    # Pagination
-    offset = (page - 1) * page_size
+    # Pagination (une ligne de plus pour has_more)
     query = query.order_by(Avis.DateCreation.desc())
-    query = query.offset(offset).limit(page_size)
-    
-    result = await db.execute(query)
-    reviews = result.scalars().all()
+    reviews, has_more = await fetch_offset_page(db, query, page=page, page_size=page_size)
     
     return ReviewListResponse(
         reviews=[ReviewResponse.model_validate(r) for r in reviews],
-        total=total or 0,
+        total=total,
         page=page,
-        page_size=page_size
+        page_size=page_size,
+        has_more=has_more
     )
 
 
@@ -154,20 +165,22 @@ async def create_review(
         DateCreation=datetime.utcnow()
     )
     
-    await db.add(review)
-    
-    # Mettre à jour la note moyenne du véhicule
-    if vehicle:
-        avg_result = await db.execute(
-            select(func.avg(Avis.Note)).where(
-                Avis.IdentifiantVehicule == vehicle.IdentifiantVehicule
+    # add + commit + refresh appliqués en un seul passage sur un thread DB
+    async with db.batch():
+        await db.add(review)
+        
+        # Mettre à jour la note moyenne du véhicule
+        if vehicle:
+            avg_result = await db.execute(
+                select(func.avg(Avis.Note)).where(
+                    Avis.IdentifiantVehicule == vehicle.IdentifiantVehicule
+                )
             )
-        )
-        avg_note = avg_result.scalar()
-        if avg_note:
-            vehicle.NoteGlobale = round(float(avg_note), 1)
-    
-    await db.commit()
-    await db.refresh(review)
+            avg_note = avg_result.scalar()
+            if avg_note:
+                vehicle.NoteGlobale = round(float(avg_note), 1)
+        
+        await db.refresh(review)
     
+    await invalidate_review_caches()
     return ReviewResponse.model_validate(review)
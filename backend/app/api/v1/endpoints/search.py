@@ -5,23 +5,29 @@ Endpoints de recherche
 Routes pour la recherche globale et les suggestions.
 """
 
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, or_, func
+from sqlalchemy import func, select
 from typing import List, Optional
 
-from sqlalchemy.orm import selectinload
-from app.core.database import get_db
+from app.core.config import settings
+from app.core.database import get_db_read
+from app.core.cache import CACHE_TTL_MEDIUM, cache_get_or_set, make_cache_key
+from app.core.pagination import CountStrategy, set_next_cursor
 from app.schemas.vehicle import VehicleResponse, VehicleListResponse
 from app.schemas.search import SearchSuggestion, SearchResult
 from app.models.vehicle import Vehicule
-from app.models.vehicle_category import CategorieVehicule
+from app.services.search_index_service import search_index
+from app.services.vehicle_catalog_service import (
+    FACETS, VEHICLES_CACHE_TAG, VehicleCatalogService, VehicleFilters,
+)
 
 router = APIRouter()
 
 
 @router.get("/vehicles")
 async def search_vehicles(
+    response: Response,
     q: Optional[str] = Query(None, min_length=2),
     city: Optional[str] = None,
     type: Optional[str] = None,
@@ -32,100 +38,80 @@ async def search_vehicles(
     seats: Optional[int] = None,
     page: int = Query(1, ge=1),
     page_size: int = Query(20, ge=1, le=100),
-    db: AsyncSession = Depends(get_db)
+    cursor: Optional[str] = Query(None, description="next_cursor de la page précédente ; remplace page"),
+    count: CountStrategy = Query(CountStrategy.EXACT, description="Total : exact, cached, estimated ou none"),
+    facets: Optional[str] = Query(
+        None, description="Histogrammes à joindre : city,fuel,transmission,category,price ou all"
+    ),
+    db: AsyncSession = Depends(get_db_read)
 ):
-    """Recherche de véhicules avec filtres complets."""
-    query = select(Vehicule).where(Vehicule.StatutVehicule != 'Desactive')
-    
-    if q:
-        query = query.where(
-            or_(
-                Vehicule.TitreAnnonce.ilike(f"%{q}%"),
-                Vehicule.DescriptionVehicule.ilike(f"%{q}%"),
-                Vehicule.LocalisationVille.ilike(f"%{q}%")
-            )
-        )
-    
-    if city and city != "all":
-        query = query.where(Vehicule.LocalisationVille == city)
-    if type and type != "all":
-        query = query.join(Vehicule.categorie).where(
-            CategorieVehicule.NomCategorie.ilike(type)
-        )
-    if fuel and fuel != "all":
-        query = query.where(Vehicule.TypeCarburant.ilike(fuel))
-    if transmission and transmission != "all":
-        query = query.where(Vehicule.TypeTransmission.ilike(transmission))
-    if minPrice:
-        query = query.where(Vehicule.PrixJournalier >= minPrice)
-    if maxPrice:
-        query = query.where(Vehicule.PrixJournalier <= maxPrice)
-    if seats:
-        query = query.where(Vehicule.NombrePlaces >= seats)
-    
-    # Count total
-    count_query = select(func.count()).select_from(query.subquery())
-    total = await db.scalar(count_query)
-    
-    # Pagination + eager load photos
-    offset = (page - 1) * page_size
-    query = query.options(
-        selectinload(Vehicule.photos),
-        selectinload(Vehicule.proprietaire)
-    ).order_by(Vehicule.EstVedette.desc(), Vehicule.NotesVehicule.desc())
-    query = query.offset(offset).limit(page_size)
+    """Recherche de véhicules avec filtres complets (numéro de page ou curseur).
+
+    ``facets`` ajoute les comptes par valeur de filtre pour les filtres
+    courants (barre latérale), calculés en une requête et mis en cache.
+    """
+    requested = _parse_facets(facets)
+    filters = VehicleFilters.from_query(
+        search=q, city=city, type=type, fuel=fuel, transmission=transmission,
+        min_price=minPrice, max_price=maxPrice, seats=seats,
+    )
+    result = await VehicleCatalogService.list_vehicle_page(db, filters, page, page_size, cursor, count)
+    set_next_cursor(response, result["next_cursor"])
     
-    result = await db.execute(query)
-    vehicles = result.scalars().all()
+    if requested:
+        histograms = await VehicleCatalogService.facets(db, filters)
+        result = {**result, "facets": {name: histograms[name] for name in requested}}
     
     return {
-        "vehicles": [VehicleResponse.model_validate(v) for v in vehicles],
-        "total": total or 0,
+        **result,
         "page": page,
         "page_size": page_size
     }
 
 
+def _parse_facets(facets: Optional[str]) -> List[str]:
+    names = [name.strip().lower() for name in (facets or "").split(",") if name.strip()]
+    if "all" in names:
+        return list(FACETS)
+    unknown = [name for name in names if name not in FACETS]
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Facettes inconnues : {', '.join(unknown)} (disponibles : {', '.join(FACETS)})"
+        )
+    return list(dict.fromkeys(names))
+
+
 @router.get("/suggestions", response_model=List[SearchSuggestion])
 async def get_search_suggestions(
     q: str = Query(..., min_length=1),
     limit: int = Query(10, ge=1, le=20),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db_read)
 ):
-    """Retourne des suggestions de recherche."""
-    suggestions = []
-    
-    # Suggestions de titres d'annonces
-    titles_result = await db.execute(
-        select(Vehicule.TitreAnnonce)
-        .where(Vehicule.TitreAnnonce.ilike(f"%{q}%"))
-        .distinct()
-        .limit(5)
-    )
-    for title in titles_result.scalars().all():
-        if title:
-            suggestions.append(SearchSuggestion(
-                text=title,
-                type="brand",
-                count=0
-            ))
-    
-    # Suggestions de villes
-    cities_result = await db.execute(
-        select(Vehicule.LocalisationVille)
-        .where(Vehicule.LocalisationVille.ilike(f"%{q}%"))
-        .distinct()
-        .limit(5)
-    )
-    for city_name in cities_result.scalars().all():
-        if city_name:
-            suggestions.append(SearchSuggestion(
-                text=city_name,
-                type="city",
-                count=0
-            ))
-    
-    return suggestions[:limit]
+    """Retourne des suggestions de recherche (marques, modèles, catégories, villes, titres)."""
+    if settings.SEARCH_INDEX_ENABLED and search_index.ready:
+        return search_index.suggestions.suggest(q, limit)
+
+    # Repli tant que l'index n'est pas construit
+    async def load():
+        pattern = f"%{q}%"
+        suggestions = []
+        for column, kind in ((Vehicule.TitreAnnonce, "title"), (Vehicule.LocalisationVille, "city")):
+            result = await db.execute(
+                select(column, func.count())
+                .where(Vehicule.StatutVehicule != 'Desactive', column.ilike(pattern))
+                .group_by(column)
+                .order_by(func.count().desc())
+                .limit(5)
+            )
+            suggestions.extend(
+                {"text": text, "type": kind, "count": count}
+                for text, count in result.all() if text
+            )
+        return suggestions[:limit]
+
+    key = make_cache_key("search_suggestions", q=q.lower(), limit=limit)
+    return await cache_get_or_set(key, load, CACHE_TTL_MEDIUM, tags=(VEHICLES_CACHE_TAG,))
 
 
 @router.get("/popular")
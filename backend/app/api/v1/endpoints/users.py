@@ -12,6 +12,8 @@ from typing import List, Optional
 from datetime import datetime
 
 from app.core.database import get_db
+from app.core.cache import is_known_missing, remember_missing
+from app.core.pagination import CountStrategy, count_rows, fetch_offset_page
 from app.schemas.user import (
     UserResponse,
     UserUpdate,
@@ -76,6 +78,7 @@ async def list_users(
     type_utilisateur: Optional[str] = None,
     statut: Optional[str] = None,
     search: Optional[str] = None,
+    count: CountStrategy = Query(CountStrategy.EXACT, description="Total : exact, cached, estimated ou none"),
     admin_user: Utilisateur = Depends(get_current_admin_user),
     db: AsyncSession = Depends(get_db)
 ):
@@ -95,22 +98,18 @@ async def list_users(
             (Utilisateur.Email.ilike(f"%{search}%"))
         )
     
-    # Count total
-    count_query = select(func.count()).select_from(query.subquery())
-    total = await db.scalar(count_query)
+    # Total selon la stratégie demandée (count=)
+    total = await count_rows(db, query, count)
     
-    # Pagination
-    offset = (page - 1) * page_size
-    query = query.offset(offset).limit(page_size)
-    
-    result = await db.execute(query)
-    users = result.scalars().all()
+    # Pagination (une ligne de plus pour has_more)
+    users, has_more = await fetch_offset_page(db, query, page=page, page_size=page_size)
     
     return UserListResponse(
         users=[UserResponse.model_validate(u) for u in users],
         total=total,
         page=page,
-        page_size=page_size
+        page_size=page_size,
+        has_more=has_more
     )
 
 
@@ -120,6 +119,12 @@ async def get_user_by_id(
     db: AsyncSession = Depends(get_db)
 ):
     """Récupère un utilisateur par son ID."""
+    if await is_known_missing("user", user_id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Utilisateur non trouvé"
+        )
+
     result = await db.execute(
         select(Utilisateur).where(
             Utilisateur.IdentifiantUtilisateur == user_id
@@ -128,6 +133,7 @@ async def get_user_by_id(
     user = result.scalar_one_or_none()
     
     if not user:
+        await remember_missing("user", user_id)
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Utilisateur non trouvé"
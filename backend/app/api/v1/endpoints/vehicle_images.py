@@ -17,6 +17,7 @@ from app.models.user import Utilisateur
 from app.models.vehicle import Vehicule, PhotoVehicule
 from app.services.file_storage_service import file_storage
 from app.services.file_upload_service import file_upload_service
+from app.services.vehicle_catalog_service import VehicleCatalogService
 from app.core.config import settings
 
 router = APIRouter()
@@ -133,6 +134,7 @@ async def upload_vehicle_image(
     await db.add(new_photo)
     await db.commit()
     await db.refresh(new_photo)
+    await VehicleCatalogService.invalidate_caches()
     
     print(f"[v0] Vehicle image uploaded successfully: photo_id={new_photo.IdentifiantPhoto}")
     
@@ -266,6 +268,7 @@ async def upload_multiple_vehicle_images(
             })
     
     await db.commit()
+    await VehicleCatalogService.invalidate_caches()
     
     return {
         "message": f"{len(uploaded_photos)} photo(s) uploadée(s) avec succès",
@@ -356,6 +359,7 @@ async def delete_vehicle_image(
     # Supprimer de la base de données
     await db.delete(photo)
     await db.commit()
+    await VehicleCatalogService.invalidate_caches()
     
     return None
 
@@ -407,6 +411,7 @@ async def set_main_photo(
     # Définir cette photo comme principale
     photo.EstPrincipale = True
     await db.commit()
+    await VehicleCatalogService.invalidate_caches()
     
     return {"message": "Photo principale mise à jour"}
 
@@ -451,5 +456,6 @@ async def reorder_photos(
             photo.OrdreAffichage = order
     
     await db.commit()
+    await VehicleCatalogService.invalidate_caches()
     
     return {"message": "Ordre des photos mis à jour"}
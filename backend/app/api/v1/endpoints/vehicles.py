@@ -5,16 +5,18 @@ Endpoints de gestion des véhicules
 Routes CRUD pour les véhicules et leurs images.
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status, Query, UploadFile, File
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response, UploadFile, File
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, and_, or_
+from sqlalchemy import select, func, and_
 from sqlalchemy.orm import selectinload
 from typing import List, Optional
 from datetime import datetime
 
-from app.core.database import get_db
+from app.core.database import get_db, get_db_read, session_scope
+from app.core.cache_warmup import cache_warmer
+from app.core.pagination import CountStrategy, count_rows, fetch_offset_page, set_next_cursor
 from app.core.cache import (
-    cache_get, cache_set, cache_invalidate_prefix,
+    cache_get_or_set, is_known_missing, remember_missing, forget_missing,
     make_cache_key, CACHE_TTL_MEDIUM, CACHE_TTL_LONG,
 )
 from app.schemas.vehicle import (
@@ -28,6 +30,9 @@ from app.models.vehicle import Vehicule, ImageVehicule, PhotoVehicule
 from app.models.user import Utilisateur
 from app.models.vehicle_category import CategorieVehicule, ModeleVehicule, MarqueVehicule
 from app.api.dependencies import get_current_active_user, get_current_owner_user
+from app.services.vehicle_catalog_service import (
+    VEHICLES_CACHE_TAG, VehicleCatalogService, VehicleFilters,
+)
 
 router = APIRouter()
 
@@ -38,6 +43,7 @@ def _user_type(current_user: Utilisateur) -> str:
 
 @router.get("", response_model=VehicleListResponse)
 async def list_vehicles(
+    response: Response,
     page: int = Query(1, ge=1),
     page_size: int = Query(20, ge=1, le=100),
     city: Optional[str] = None,
@@ -50,98 +56,60 @@ async def list_vehicles(
     available: Optional[bool] = None,
     featured: Optional[bool] = None,
     search: Optional[str] = None,
-    db: AsyncSession = Depends(get_db)
+    cursor: Optional[str] = Query(None, description="next_cursor de la page précédente ; remplace page"),
+    count: CountStrategy = Query(CountStrategy.EXACT, description="Total : exact, cached, estimated ou none"),
+    db: AsyncSession = Depends(get_db_read)
 ):
-    """Liste les véhicules avec filtres et pagination."""
-    query = select(Vehicule).where(Vehicule.StatutVehicule != 'Desactive')
-    
-    # Filtres — utiliser les vraies colonnes SQL
-    if city and city != "all":
-        query = query.where(Vehicule.LocalisationVille == city)
-    if type and type != "all":
-        query = query.join(Vehicule.categorie).where(
-            CategorieVehicule.NomCategorie.ilike(type)
-        )
-    if fuel and fuel != "all":
-        query = query.where(Vehicule.TypeCarburant.ilike(fuel))
-    if transmission and transmission != "all":
-        query = query.where(Vehicule.TypeTransmission.ilike(transmission))
-    if min_price:
-        query = query.where(Vehicule.PrixJournalier >= min_price)
-    if max_price:
-        query = query.where(Vehicule.PrixJournalier <= max_price)
-    if seats:
-        query = query.where(Vehicule.NombrePlaces >= seats)
-    if available is True:
-        query = query.where(Vehicule.StatutVehicule == 'Actif')
-    if featured is True:
-        query = query.where(Vehicule.EstVedette == True)
-    if search:
-        query = query.where(
-            or_(
-                Vehicule.TitreAnnonce.ilike(f"%{search}%"),
-                Vehicule.DescriptionVehicule.ilike(f"%{search}%"),
-                Vehicule.LocalisationVille.ilike(f"%{search}%")
-            )
-        )
-    
-    # Count total
-    count_query = select(func.count()).select_from(query.subquery())
-    total = await db.scalar(count_query)
-    
-    # Pagination + eager load photos
-    offset = (page - 1) * page_size
-    query = query.options(
-        selectinload(Vehicule.photos),
-        selectinload(Vehicule.proprietaire)
-    ).order_by(Vehicule.EstVedette.desc(), Vehicule.NotesVehicule.desc())
-    query = query.offset(offset).limit(page_size)
-    
-    result = await db.execute(query)
-    vehicles = result.scalars().all()
-    
-    return VehicleListResponse(
-        vehicles=[VehicleResponse.model_validate(v) for v in vehicles],
-        total=total or 0,
-        page=page,
-        page_size=page_size
+    """Liste les véhicules avec filtres et pagination (numéro de page ou curseur)."""
+    filters = VehicleFilters.from_query(
+        search=search, city=city, type=type, fuel=fuel, transmission=transmission,
+        min_price=min_price, max_price=max_price, seats=seats,
+        available=available, featured=featured,
     )
+    result = await VehicleCatalogService.list_vehicle_page(db, filters, page, page_size, cursor, count)
+    set_next_cursor(response, result["next_cursor"])
+    
+    return VehicleListResponse(**result, page=page, page_size=page_size)
 
 
 @router.get("/featured", response_model=List[VehicleResponse])
 async def get_featured_vehicles(
     limit: int = Query(6, ge=1, le=20),
-    db: AsyncSession = Depends(get_db)
 ):
-    """Récupère les véhicules mis en avant (cached 30min)."""
-    cache_key = make_cache_key("featured_vehicles", limit=limit)
-    cached = await cache_get(cache_key)
-    if cached is not None:
-        return cached
-
-    result = await db.execute(
-        select(Vehicule)
-        .where(
-            and_(
-                Vehicule.StatutVehicule == 'Actif',
-                Vehicule.EstVedette == True
+    """Récupère les véhicules mis en avant (cached 30min, servi périmé 5min pendant le recalcul)."""
+    async def load():
+        async with session_scope(read=True) as db:
+            result = await db.execute(
+                select(Vehicule)
+                .where(
+                    and_(
+                        Vehicule.StatutVehicule == 'Actif',
+                        Vehicule.EstVedette == True
+                    )
+                )
+                .options(selectinload(Vehicule.photos), selectinload(Vehicule.proprietaire))
+                .order_by(Vehicule.NotesVehicule.desc())
+                .limit(limit)
             )
-        )
-        .options(selectinload(Vehicule.photos), selectinload(Vehicule.proprietaire))
-        .order_by(Vehicule.NotesVehicule.desc())
-        .limit(limit)
+            vehicles = result.scalars().all()
+            return [VehicleResponse.model_validate(v).model_dump() for v in vehicles]
+
+    return await cache_get_or_set(
+        make_cache_key("featured_vehicles", limit=limit), load, CACHE_TTL_LONG,
+        tags=(VEHICLES_CACHE_TAG,), stale_ttl=CACHE_TTL_MEDIUM,
     )
-    vehicles = result.scalars().all()
-    
-    response = [VehicleResponse.model_validate(v).model_dump() for v in vehicles]
-    await cache_set(cache_key, response, CACHE_TTL_LONG)
-    return response
+
+
+@cache_warmer("featured_vehicles")
+async def _warm_featured_vehicles():
+    await get_featured_vehicles(limit=6)
 
 
 @router.get("/my-vehicles", response_model=VehicleListResponse)
 async def get_my_vehicles(
     page: int = Query(1, ge=1),
     page_size: int = Query(20, ge=1, le=100),
+    count: CountStrategy = Query(CountStrategy.EXACT, description="Total : exact, cached, estimated ou none"),
     current_user: Utilisateur = Depends(get_current_owner_user),
     db: AsyncSession = Depends(get_db)
 ):
@@ -150,26 +118,22 @@ async def get_my_vehicles(
         Vehicule.IdentifiantProprietaire == current_user.IdentifiantUtilisateur
     )
     
-    # Count total
-    count_query = select(func.count()).select_from(base_query.subquery())
-    total = await db.scalar(count_query)
+    # Total selon la stratégie demandée (count=)
+    total = await count_rows(db, base_query, count)
     
-    # Pagination + eager load photos
-    offset = (page - 1) * page_size
+    # Pagination + eager load photos (une ligne de plus pour has_more)
     query = base_query.options(
         selectinload(Vehicule.photos),
         selectinload(Vehicule.proprietaire)
     ).order_by(Vehicule.DateCreation.desc())
-    query = query.offset(offset).limit(page_size)
-    
-    result = await db.execute(query)
-    vehicles = result.scalars().all()
+    vehicles, has_more = await fetch_offset_page(db, query, page=page, page_size=page_size)
     
     return VehicleListResponse(
         vehicles=[VehicleResponse.model_validate(v) for v in vehicles],
-        total=total or 0,
+        total=total,
         page=page,
-        page_size=page_size
+        page_size=page_size,
+        has_more=has_more
     )
 
 
@@ -179,6 +143,12 @@ async def get_vehicle_by_id(
     db: AsyncSession = Depends(get_db)
 ):
     """Récupère les détails d'un véhicule avec eager loading (evite N+1)."""
+    if await is_known_missing("vehicle", vehicle_id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Véhicule non trouvé"
+        )
+
     result = await db.execute(
         select(Vehicule)
         .where(Vehicule.IdentifiantVehicule == vehicle_id)
@@ -192,6 +162,7 @@ async def get_vehicle_by_id(
     vehicle = result.scalar_one_or_none()
     
     if not vehicle:
+        await remember_missing("vehicle", vehicle_id)
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Véhicule non trouvé"
@@ -380,7 +351,8 @@ async def create_vehicle(
             await db.refresh(vehicle)
         
         # Invalidate vehicle caches on mutation
-        await cache_invalidate_prefix("featured_vehicles")
+        await VehicleCatalogService.invalidate_caches(vehicle.IdentifiantVehicule)
+        await forget_missing("vehicle", vehicle.IdentifiantVehicule)
         
         return VehicleResponse.model_validate(vehicle)
         
@@ -430,7 +402,7 @@ async def update_vehicle(
     await db.commit()
     await db.refresh(vehicle)
     
-    await cache_invalidate_prefix("featured_vehicles")
+    await VehicleCatalogService.invalidate_caches(vehicle_id)
     
     return VehicleResponse.model_validate(vehicle)
 
@@ -465,13 +437,13 @@ async def delete_vehicle(
     vehicle.DateModification = datetime.utcnow()
     await db.commit()
     
-    await cache_invalidate_prefix("featured_vehicles")
+    await VehicleCatalogService.invalidate_caches(vehicle_id)
 
 
 @router.get("/owner/{owner_id}", response_model=List[VehicleResponse])
 async def get_vehicles_by_owner(
     owner_id: int,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db_read)
 ):
     """Liste les véhicules d'un propriétaire avec eager loading."""
     result = await db.execute(
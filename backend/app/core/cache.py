@@ -4,120 +4,570 @@ Redis Cache Service
 
 Provides a simple cache layer with graceful fallback to no-op when Redis is unavailable.
 Used to cache expensive queries like vehicle lists, analytics, and featured vehicles.
+
+Uses the asyncio Redis client over a shared connection pool (``REDIS_MAX_CONNECTIONS``):
+a slow Redis call only suspends the request awaiting it, never the event loop.
+The same client backs the token blacklist (``app.core.security``).
+
+Outages go through a circuit breaker (``redis_breaker``): once open, calls
+degrade instantly to cache-miss behaviour; a single probe is let through after
+an exponentially growing delay to detect recovery.
+
+Two tiers: an in-process LRU (L1, ``CACHE_L1_*``) answers hot keys without a
+Redis round trip or deserialization. Writes and invalidations are broadcast on
+the ``autoloco:cache:invalidate`` pub/sub channel so every worker drops its
+stale L1 copies; L1 entries also expire after ``CACHE_L1_TTL`` seconds at most,
+which bounds staleness if a message is missed. Values returned from L1 are
+shared objects: callers must not mutate them.
+
+Invalidation is O(1): each namespace (the ``prefix`` of ``make_cache_key``, or
+an extra tag) has a generation counter ``autoloco:ns:<name>``. The physical
+key embeds the current generations (``autoloco:vehicles:v42:<hash>``);
+``cache_invalidate_prefix`` / ``cache_invalidate_tags`` just ``INCR`` the
+counter, and old entries are never read again and expire on their TTL.
+Generations are cached per worker for ``CACHE_NAMESPACE_VERSION_TTL`` seconds
+(at most ``CACHE_NAMESPACE_VERSION_MAX_ENTRIES`` of them) and pushed to the
+other workers over pub/sub when bumped.
+
+Values are stored in Redis through ``cache_serializers`` (JSON or msgpack,
+zlib above ``CACHE_COMPRESSION_THRESHOLD`` bytes), which round-trips
+``Decimal`` / ``datetime`` / ``UUID`` values.
 """
 
+import asyncio
+import inspect
 import json
 import hashlib
 import logging
-from typing import Any, Optional, Callable
+import os
+import socket
+import time
+import uuid
+from collections import OrderedDict
+from contextlib import AsyncExitStack
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Tuple
 from functools import wraps
 
+from fastapi import params
+from fastapi.encoders import jsonable_encoder
+
 from app.core.config import settings
+from app.core.circuit_breaker import CircuitBreaker
+from app.core import cache_serializers
+from app.core.cache_metrics import cache_metrics
 
 logger = logging.getLogger(__name__)
 
 # Attempt to import redis; gracefully degrade if not available
 try:
-    import redis
-    _redis_client: Optional[redis.Redis] = None
+    import redis.asyncio as aioredis
+    from redis.exceptions import ConnectionError as RedisConnectionError, TimeoutError as RedisTimeoutError
+    _redis_client: Optional[aioredis.Redis] = None
     _REDIS_AVAILABLE = True
+    _OUTAGE_ERRORS = (RedisConnectionError, RedisTimeoutError, OSError, asyncio.TimeoutError)
 except ImportError:
     _redis_client = None
     _REDIS_AVAILABLE = False
+    _OUTAGE_ERRORS = ()
     logger.warning("redis package not installed, caching disabled")
 
+redis_breaker = CircuitBreaker(
+    "redis",
+    failure_threshold=settings.REDIS_BREAKER_FAILURE_THRESHOLD,
+    base_delay=settings.REDIS_BREAKER_BASE_DELAY,
+    max_delay=settings.REDIS_BREAKER_MAX_DELAY,
+    probe_timeout=settings.REDIS_SOCKET_TIMEOUT * 2,
+)
+
+
+def report_redis_error(error: Exception) -> None:
+    """À appeler dans le ``except`` d'une commande Redis : les pannes alimentent le breaker."""
+    if isinstance(error, _OUTAGE_ERRORS):
+        redis_breaker.record_failure()
+
+
+def _create_client() -> "aioredis.Redis":
+    pool = aioredis.ConnectionPool.from_url(
+        settings.REDIS_URL,
+        decode_responses=False,  # cached values are binary (cache_serializers)
+        max_connections=settings.REDIS_MAX_CONNECTIONS,
+        socket_connect_timeout=settings.REDIS_SOCKET_TIMEOUT,
+        socket_timeout=settings.REDIS_SOCKET_TIMEOUT,
+        retry_on_timeout=False,
+    )
+    return aioredis.Redis(connection_pool=pool)
 
-def get_redis() -> Optional[Any]:
-    """Get or create a Redis connection. Returns None if Redis is unavailable."""
+
+async def get_redis() -> Optional[Any]:
+    """Get or create the pooled asyncio Redis client. Returns None if Redis is unavailable."""
     global _redis_client
 
     if not _REDIS_AVAILABLE:
         return None
 
+    # Circuit open: answer "no Redis" immediately instead of waiting for a timeout
+    if not redis_breaker.allow_request():
+        return None
+
     if _redis_client is not None:
         return _redis_client
 
+    client = _create_client()
     try:
-        _redis_client = redis.from_url(
-            settings.REDIS_URL,
-            decode_responses=True,
-            socket_connect_timeout=2,
-            socket_timeout=2,
-            retry_on_timeout=False,
-        )
         # Quick connectivity test
-        _redis_client.ping()
-        logger.info("Redis cache connected successfully")
-        return _redis_client
+        await client.ping()
     except Exception as e:
         logger.warning(f"Redis not available, caching disabled: {e}")
-        _redis_client = None
+        redis_breaker.record_failure(trip=True)
+        await client.close(close_connection_pool=True)
         return None
+    redis_breaker.record_success()
+
+    if _redis_client is None:
+        _redis_client = client
+        logger.info("Redis cache connected successfully")
+    else:
+        # Another request connected while we were pinging
+        await client.close(close_connection_pool=True)
+    return _redis_client
+
+
+async def close_redis() -> None:
+    """Close the pooled Redis connections (application shutdown)."""
+    global _redis_client
+    client, _redis_client = _redis_client, None
+    if client is not None:
+        await client.close(close_connection_pool=True)
+
+
+# ============================================================
+# L1 — IN-PROCESS LRU
+# ============================================================
+
+class LocalCache:
+    """Size- and TTL-bounded LRU holding deserialized values (single event loop)."""
+
+    def __init__(self, max_entries: int, max_ttl: float):
+        self.max_entries = max_entries
+        self.max_ttl = max_ttl
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: str, default: Any = None) -> Any:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return default
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            self.misses += 1
+            return default
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        ttl = self.max_ttl if ttl is None else min(ttl, self.max_ttl)
+        if ttl <= 0:
+            return
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def delete(self, key: str) -> None:
+        self._entries.pop(key, None)
+
+    def delete_prefix(self, key_prefix: str) -> int:
+        keys = [key for key in self._entries if key.startswith(key_prefix)]
+        for key in keys:
+            del self._entries[key]
+        return len(keys)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "max_ttl_seconds": self.max_ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 3) if lookups else 0.0,
+            "evictions": self.evictions,
+        }
+
+
+local_cache = LocalCache(settings.CACHE_L1_MAX_ENTRIES, settings.CACHE_L1_TTL)
+
+
+# ============================================================
+# CROSS-WORKER INVALIDATION (Redis pub/sub)
+# ============================================================
+
+INVALIDATION_CHANNEL = "autoloco:cache:invalidate"
+WORKER_ID = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+
+_invalidation_handlers: List[Callable[[Dict[str, Any]], Awaitable[None]]] = []
+_listener_task: Optional[asyncio.Task] = None
+
+
+def on_invalidation(handler: Callable[[Dict[str, Any]], Awaitable[None]]):
+    """Register ``async handler(message)`` for messages from other workers.
+
+    ``message`` has ``op`` (``key`` / ``version`` / ``clear`` or a custom op)
+    and ``value``. Usable as a decorator.
+    """
+    if handler not in _invalidation_handlers:
+        _invalidation_handlers.append(handler)
+    return handler
+
+
+def _apply_locally(op: str, value: Any) -> None:
+    if op == "key":
+        local_cache.delete(value)
+    elif op == "version":
+        _remember_version(value["namespace"], value["version"])
+    elif op == "clear":
+        local_cache.clear()
+
+
+async def publish_invalidation(op: str, value: Any = None, client=None) -> bool:
+    """Broadcast an invalidation (or custom) message to the other workers."""
+    if client is None:
+        client = await get_redis()
+        if client is None:
+            return False
+    message = json.dumps({"origin": WORKER_ID, "op": op, "value": value})
+    try:
+        await client.publish(INVALIDATION_CHANNEL, message)
+        return True
+    except Exception as e:
+        report_redis_error(e)
+        logger.debug(f"Cache invalidation publish failed ({op}): {e}")
+        return False
+
+
+async def _dispatch(raw: bytes) -> None:
+    try:
+        message = json.loads(raw)
+    except (TypeError, ValueError):
+        return
+    if message.get("origin") == WORKER_ID:
+        return
+    _apply_locally(message.get("op"), message.get("value"))
+    for handler in _invalidation_handlers:
+        try:
+            await handler(message)
+        except Exception as e:
+            logger.warning(f"Cache invalidation handler {handler.__name__} failed: {e}")
+
+
+async def _listen_for_invalidations() -> None:
+    retry_delay = 1.0
+    while True:
+        client = await get_redis()
+        if client is None:
+            await asyncio.sleep(retry_delay)
+            continue
+        pubsub = client.pubsub()
+        try:
+            await pubsub.subscribe(INVALIDATION_CHANNEL)
+            redis_breaker.record_success()
+            # Messages may have been missed while unsubscribed
+            local_cache.clear()
+            logger.info("Cache invalidation listener subscribed")
+            while True:
+                message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)
+                if message is not None:
+                    await _dispatch(message["data"])
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            report_redis_error(e)
+            logger.warning(f"Cache invalidation listener disconnected: {e}")
+            local_cache.clear()
+            await asyncio.sleep(retry_delay)
+        finally:
+            try:
+                await pubsub.close()
+            except Exception:
+                pass
+
+
+def start_invalidation_listener() -> None:
+    """Start the pub/sub listener task (application startup)."""
+    global _listener_task
+    if not _REDIS_AVAILABLE or _listener_task is not None:
+        return
+    _listener_task = asyncio.create_task(_listen_for_invalidations(), name="cache-invalidation")
+
+
+async def stop_invalidation_listener() -> None:
+    """Cancel the pub/sub listener task (application shutdown)."""
+    global _listener_task
+    task, _listener_task = _listener_task, None
+    if task is not None:
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+
+
+def get_cache_stats() -> Dict[str, Any]:
+    return {
+        "worker": WORKER_ID,
+        "l1": local_cache.stats(),
+        "invalidation_listener": _listener_task is not None and not _listener_task.done(),
+        "redis_breaker": redis_breaker.stats(),
+        "serializer": cache_serializers.get_serializer().name,
+        "coalescing": get_coalescing_stats(),
+        "types": cache_metrics.snapshot(),
+    }
+
+
+# ============================================================
+# NAMESPACE GENERATIONS
+# ============================================================
+
+# namespace -> (generation, refreshed at), least recently refreshed first.
+# Per-user/per-vehicle tags make the key set unbounded: the oldest entries are
+# dropped past CACHE_NAMESPACE_VERSION_MAX_ENTRIES (refetched from Redis on use)
+_ns_versions: "OrderedDict[str, Tuple[int, float]]" = OrderedDict()
+
+
+def _store_version(namespace: str, version: int, refreshed_at: float) -> None:
+    _ns_versions[namespace] = (int(version), refreshed_at)
+    _ns_versions.move_to_end(namespace)
+    while len(_ns_versions) > settings.CACHE_NAMESPACE_VERSION_MAX_ENTRIES:
+        _ns_versions.popitem(last=False)
+
+
+def _version_key(namespace: str) -> str:
+    return f"autoloco:ns:{namespace}"
+
+
+def _remember_version(namespace: str, version: int) -> None:
+    current = _ns_versions.get(namespace)
+    if current is None or version >= current[0]:
+        _store_version(namespace, version, time.monotonic())
+
+
+async def _namespace_versions(client, namespaces: Sequence[str]) -> List[int]:
+    """Current generation of each namespace (one MGET for the stale ones)."""
+    now = time.monotonic()
+    stale = [
+        ns for ns in namespaces
+        if ns not in _ns_versions or now - _ns_versions[ns][1] > settings.CACHE_NAMESPACE_VERSION_TTL
+    ]
+    if stale and client is not None:
+        try:
+            values = await client.mget([_version_key(ns) for ns in stale])
+            redis_breaker.record_success()
+            for ns, value in zip(stale, values):
+                _store_version(ns, value or 0, now)
+        except Exception as e:
+            report_redis_error(e)
+            logger.debug(f"Cache namespace version lookup failed: {e}")
+    return [_ns_versions.get(ns, (0, now))[0] for ns in namespaces]
+
+
+def _split_key(key: str) -> Tuple[Optional[str], str]:
+    """``autoloco:<prefix>:<rest>`` -> (prefix, rest); (None, key) for other keys."""
+    parts = key.split(":", 2)
+    if len(parts) == 3 and parts[0] == "autoloco":
+        return parts[1], parts[2]
+    return None, key
+
+
+async def _physical_key(client, key: str, tags: Sequence[str] = ()) -> str:
+    prefix, rest = _split_key(key)
+    namespaces = ([prefix] if prefix else []) + [t for t in tags if t != prefix]
+    if not namespaces:
+        return key
+    versions = ".".join(str(v) for v in await _namespace_versions(client, namespaces))
+    if prefix is None:
+        return f"{key}:v{versions}"
+    return f"autoloco:{prefix}:v{versions}:{rest}"
 
 
 def make_cache_key(prefix: str, **kwargs) -> str:
-    """Build a deterministic cache key from a prefix and keyword arguments."""
+    """Build a deterministic cache key from a prefix and keyword arguments.
+
+    The prefix is also the invalidation namespace (``cache_invalidate_prefix``).
+    """
     sorted_params = json.dumps(kwargs, sort_keys=True, default=str)
     param_hash = hashlib.md5(sorted_params.encode()).hexdigest()[:12]
     return f"autoloco:{prefix}:{param_hash}"
 
 
-async def cache_get(key: str) -> Optional[Any]:
-    """Get a value from the cache. Returns None on miss or error."""
-    client = get_redis()
+_MISSING = object()
+
+
+def _cache_type(key: str) -> str:
+    return _split_key(key)[0] or "other"
+
+
+async def cache_get(key: str, tags: Sequence[str] = ()) -> Optional[Any]:
+    """Get a value from the cache (L1 first, then Redis). Returns None on miss or error.
+
+    ``tags``: extra namespaces the entry belongs to (same as given to ``cache_set``).
+    Hits and misses are counted per prefix (``cache_metrics``).
+    """
+    started = time.perf_counter()
+    value = await _lookup(key, tags)
+    if value is None:
+        cache_metrics.record_miss(_cache_type(key))
+    else:
+        cache_metrics.record_hit(_cache_type(key), (time.perf_counter() - started) * 1000)
+    return value
+
+
+async def _lookup(key: str, tags: Sequence[str]) -> Optional[Any]:
+    client = await get_redis()
+    key = await _physical_key(client, key, tags)
+    if settings.CACHE_L1_ENABLED:
+        value = local_cache.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
     if client is None:
         return None
     try:
-        raw = client.get(key)
+        raw = await client.get(key)
+        redis_breaker.record_success()
         if raw is not None:
-            return json.loads(raw)
+            value = cache_serializers.decode(raw)
+            if settings.CACHE_L1_ENABLED:
+                local_cache.set(key, value)
+            return value
     except Exception as e:
+        report_redis_error(e)
         logger.debug(f"Cache get error for {key}: {e}")
     return None
 
 
-async def cache_set(key: str, value: Any, ttl: int = None) -> bool:
-    """Set a value in the cache with an optional TTL (seconds). Returns True on success."""
-    client = get_redis()
+async def cache_set(key: str, value: Any, ttl: int = None, tags: Sequence[str] = ()) -> bool:
+    """Set a value in the cache with an optional TTL (seconds). Returns True on success.
+
+    ``tags`` adds namespaces whose invalidation also drops this entry.
+    Other workers are told to drop their L1 copy of ``key``.
+    """
+    if ttl is None:
+        ttl = settings.REDIS_CACHE_EXPIRE
+    client = await get_redis()
+    key = await _physical_key(client, key, tags)
+    if settings.CACHE_L1_ENABLED:
+        local_cache.set(key, value, ttl)
     if client is None:
         return False
     try:
-        serialized = json.dumps(value, default=str)
-        if ttl is None:
-            ttl = settings.REDIS_CACHE_EXPIRE
-        client.setex(key, ttl, serialized)
+        serialized = cache_serializers.encode(value)
+        message = json.dumps({"origin": WORKER_ID, "op": "key", "value": key})
+        async with client.pipeline(transaction=False) as pipe:
+            pipe.setex(key, ttl, serialized)
+            pipe.publish(INVALIDATION_CHANNEL, message)
+            await pipe.execute()
+        redis_breaker.record_success()
         return True
     except Exception as e:
+        report_redis_error(e)
         logger.debug(f"Cache set error for {key}: {e}")
         return False
 
 
-async def cache_delete(key: str) -> bool:
-    """Delete a specific cache key."""
-    client = get_redis()
+async def cache_delete(key: str, tags: Sequence[str] = ()) -> bool:
+    """Delete a specific cache key (on every worker)."""
+    client = await get_redis()
+    key = await _physical_key(client, key, tags)
+    local_cache.delete(key)
     if client is None:
         return False
     try:
-        client.delete(key)
+        await client.delete(key)
+        redis_breaker.record_success()
+        await publish_invalidation("key", key, client)
         return True
-    except Exception:
+    except Exception as e:
+        report_redis_error(e)
         return False
 
 
-async def cache_invalidate_prefix(prefix: str) -> int:
-    """Invalidate all keys matching a prefix pattern. Returns count of deleted keys."""
-    client = get_redis()
+def _bump_locally(namespaces: Sequence[str]) -> None:
+    """Redis unreachable: only this worker can be invalidated.
+
+    L1 is cleared as well, since the next Redis lookup may bring back a lower
+    generation whose entries would then be served again.
+    """
+    now = time.monotonic()
+    for namespace in namespaces:
+        _store_version(namespace, _ns_versions.get(namespace, (0, now))[0] + 1, now)
+    local_cache.clear()
+
+
+async def cache_invalidate_tags(*namespaces: str) -> Dict[str, int]:
+    """Invalidate every entry of the given namespaces in O(1) (generation bump).
+
+    Returns the new generation of each namespace (empty if Redis is unavailable).
+    """
+    client = await get_redis()
     if client is None:
-        return 0
+        _bump_locally(namespaces)
+        return {}
     try:
-        pattern = f"autoloco:{prefix}:*"
-        keys = client.keys(pattern)
-        if keys:
-            return client.delete(*keys)
-        return 0
+        async with client.pipeline(transaction=False) as pipe:
+            for namespace in namespaces:
+                pipe.incr(_version_key(namespace))
+            versions = await pipe.execute()
+        redis_breaker.record_success()
     except Exception as e:
-        logger.debug(f"Cache invalidate error for prefix {prefix}: {e}")
-        return 0
+        report_redis_error(e)
+        logger.debug(f"Cache invalidate error for {namespaces}: {e}")
+        _bump_locally(namespaces)
+        return {}
+    for namespace, version in zip(namespaces, versions):
+        _remember_version(namespace, version)
+        await publish_invalidation("version", {"namespace": namespace, "version": version}, client)
+    return dict(zip(namespaces, versions))
+
+
+async def cache_invalidate_prefix(prefix: str) -> int:
+    """Invalidate all keys built with ``make_cache_key(prefix, ...)``.
+
+    Bumps the namespace generation instead of scanning keys. Returns the new
+    generation (0 if Redis is unavailable).
+    """
+    versions = await cache_invalidate_tags(prefix)
+    return versions.get(prefix, 0)
+
+
+# ============================================================
+# NEGATIVE CACHING
+# ============================================================
+
+def _missing_key(entity: str, identifier: Any) -> str:
+    return f"autoloco:missing_{entity}:{identifier}"
+
+
+async def is_known_missing(entity: str, identifier: Any) -> bool:
+    """True if a recent lookup of ``entity`` ``identifier`` found nothing."""
+    return await cache_get(_missing_key(entity, identifier)) is not None
+
+
+async def remember_missing(entity: str, identifier: Any, ttl: int = None) -> None:
+    """Record a 404 lookup for ``CACHE_NEGATIVE_TTL`` seconds (short: ids get created)."""
+    await cache_set(_missing_key(entity, identifier), True, ttl or settings.CACHE_NEGATIVE_TTL)
+
+
+async def forget_missing(entity: str, identifier: Any) -> None:
+    """Drop the negative entry once ``entity`` ``identifier`` exists."""
+    await cache_delete(_missing_key(entity, identifier))
 
 
 # Default TTLs for different data types (seconds)
@@ -125,3 +575,236 @@ CACHE_TTL_SHORT = 60           # 1 minute  - real-time metrics
 CACHE_TTL_MEDIUM = 300         # 5 minutes - vehicle lists, search results
 CACHE_TTL_LONG = 1800          # 30 minutes - analytics, featured vehicles
 CACHE_TTL_VERY_LONG = 3600     # 1 hour    - static reference data (cities, categories)
+
+
+# ============================================================
+# STAMPEDE PROTECTION (single-flight + stale-while-revalidate)
+# ============================================================
+
+_inflight: Dict[str, "asyncio.Future"] = {}
+_coalescing_stats = {"loads": 0, "coalesced": 0, "lock_waits": 0, "stale_served": 0, "refreshes": 0}
+
+# Releases the lock only if we still own it (it may have expired and been re-acquired)
+_RELEASE_LOCK_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
+
+
+def _envelope(value: Any, ttl: int) -> Dict[str, Any]:
+    return {"__fresh_until__": time.time() + ttl, "value": value}
+
+
+def _is_envelope(raw: Any) -> bool:
+    return isinstance(raw, dict) and "__fresh_until__" in raw
+
+
+def _single_flight(flight_key: str, make_coro: Callable[[], Awaitable[Any]]) -> "asyncio.Future":
+    """Future shared by every caller of ``flight_key`` in this worker."""
+    future = _inflight.get(flight_key)
+    if future is not None:
+        _coalescing_stats["coalesced"] += 1
+        return future
+    future = asyncio.ensure_future(make_coro())
+    _inflight[flight_key] = future
+
+    def _done(f: "asyncio.Future") -> None:
+        _inflight.pop(flight_key, None)
+        if not f.cancelled() and f.exception() is not None:
+            logger.warning(f"Cache loader for {flight_key} failed: {f.exception()}")
+
+    future.add_done_callback(_done)
+    return future
+
+
+async def _acquire_lock(client, lock_key: str, token: str, timeout: float) -> bool:
+    try:
+        acquired = await client.set(lock_key, token, nx=True, px=int(timeout * 1000))
+        redis_breaker.record_success()
+        return bool(acquired)
+    except Exception as e:
+        report_redis_error(e)
+        # No lock service: recompute locally rather than block
+        return True
+
+
+async def _release_lock(client, lock_key: str, token: str) -> None:
+    try:
+        await client.eval(_RELEASE_LOCK_SCRIPT, 1, lock_key, token)
+    except Exception as e:
+        report_redis_error(e)
+        logger.debug(f"Cache lock release error for {lock_key}: {e}")
+
+
+async def _load(key, loader, ttl, tags, stale_ttl, use_lock, wait_for_holder) -> Any:
+    """Run ``loader`` and store its result, holding the cross-worker lock if asked.
+
+    When another worker holds the lock, either wait (bounded by
+    ``CACHE_LOCK_TIMEOUT``) for the value it is computing, or — for a
+    background refresh — leave the refresh to it.
+    """
+    client = await get_redis() if use_lock else None
+    lock_key = token = None
+    if client is not None:
+        lock_key, token = f"autoloco:lock:{key}", uuid.uuid4().hex
+        if not await _acquire_lock(client, lock_key, token, settings.CACHE_LOCK_TIMEOUT):
+            if not wait_for_holder:
+                return None
+            _coalescing_stats["lock_waits"] += 1
+            deadline = time.monotonic() + settings.CACHE_LOCK_TIMEOUT
+            while time.monotonic() < deadline:
+                await asyncio.sleep(settings.CACHE_LOCK_POLL_INTERVAL)
+                raw = await _lookup(key, tags)
+                if _is_envelope(raw):
+                    return raw["value"]
+            # Holder died or is too slow: compute it ourselves
+            lock_key = None
+
+    _coalescing_stats["loads"] += 1
+    try:
+        started = time.perf_counter()
+        value = await loader()
+        cache_metrics.record_load(_cache_type(key), (time.perf_counter() - started) * 1000)
+        await cache_set(key, _envelope(value, ttl), ttl + stale_ttl, tags)
+        return value
+    finally:
+        if lock_key is not None:
+            await _release_lock(client, lock_key, token)
+
+
+async def cache_get_or_set(
+    key: str,
+    loader: Callable[[], Awaitable[Any]],
+    ttl: int = None,
+    *,
+    tags: Sequence[str] = (),
+    stale_ttl: int = 0,
+    lock: bool = True,
+) -> Any:
+    """Return the cached value of ``key``, computing it with ``loader()`` on a miss.
+
+    - Concurrent misses in this worker share a single ``loader()`` call;
+      with ``lock=True`` a Redis ``SET NX`` lock extends this to all workers
+      (the others wait for the value instead of recomputing it).
+    - ``stale_ttl``: an expired value is still served for ``stale_ttl`` more
+      seconds while one background task refreshes it (stale-while-revalidate).
+
+    The loader may outlive the request that triggered it: it must open its own
+    DB session (``database.session_scope``), not reuse the request's one.
+    Values are stored wrapped with their freshness deadline; read them back with
+    this function, not with ``cache_get``.
+    """
+    if ttl is None:
+        ttl = settings.REDIS_CACHE_EXPIRE
+    raw = await cache_get(key, tags)
+    flight_key = f"{key}|{','.join(tags)}"
+
+    if _is_envelope(raw):
+        if raw["__fresh_until__"] > time.time():
+            return raw["value"]
+        _coalescing_stats["stale_served"] += 1
+        refresh_key = f"{flight_key}|refresh"
+        if refresh_key not in _inflight:
+            _coalescing_stats["refreshes"] += 1
+            _single_flight(refresh_key, lambda: _load(key, loader, ttl, tags, stale_ttl, lock, False))
+        return raw["value"]
+
+    future = _single_flight(flight_key, lambda: _load(key, loader, ttl, tags, stale_ttl, lock, True))
+    # shield: a cancelled request must not cancel the load other callers await
+    return await asyncio.shield(future)
+
+
+def get_coalescing_stats() -> Dict[str, int]:
+    return {**_coalescing_stats, "in_flight": len(_inflight)}
+
+
+# ============================================================
+# ENDPOINT DECORATOR
+# ============================================================
+
+def _current_user_id(signature: inspect.Signature, arguments: Dict[str, Any]) -> Optional[Any]:
+    """Id of the authenticated user injected through a ``Depends`` parameter."""
+    for name, param in signature.parameters.items():
+        if isinstance(param.default, params.Depends):
+            user_id = getattr(arguments.get(name), "IdentifiantUtilisateur", None)
+            if user_id is not None:
+                return user_id
+    return None
+
+
+def cached(
+    prefix: str,
+    ttl: int = None,
+    *,
+    key_params: Optional[Sequence[str]] = None,
+    per_user: bool = False,
+    tags: Sequence[str] = (),
+    stale_ttl: int = 0,
+):
+    """Cache the JSON-encoded response of an async endpoint.
+
+        @router.get("/vehicle/{vehicle_id}", response_model=ReviewListResponse)
+        @cached("reviews", CACHE_TTL_MEDIUM, tags=("vehicle:{vehicle_id}",))
+        async def get_vehicle_reviews(vehicle_id: int, page: int = 1, db=Depends(get_db_read)):
+
+    - key: ``prefix`` + the values of ``key_params`` (default: every
+      parameter that is not a ``Depends``);
+    - ``per_user``: adds the current user's id to the key (requests without
+      an authenticated user bypass the cache);
+    - ``tags``: extra invalidation namespaces, formatted with the key values
+      and ``user_id`` (``"loyalty_user:{user_id}"``);
+    - misses are coalesced (``cache_get_or_set``). The shared loader outlives
+      the request that started it, so ``get_db``/``get_db_read`` sessions are
+      replaced by a fresh ``session_scope`` for the duration of the load;
+      ``stale_ttl`` must stay 0 if other request-scoped dependencies are used.
+
+    Place it below ``@router.get`` so the route registers the cached function.
+    """
+    # Imported lazily: the database module is heavier and not needed by the rest of the cache
+    from app.core.database import get_db, get_db_read, session_scope
+
+    def decorator(func):
+        signature = inspect.signature(func)
+        names = list(key_params) if key_params is not None else [
+            name for name, param in signature.parameters.items()
+            if not isinstance(param.default, params.Depends)
+        ]
+        # {parameter: read} for injected sessions
+        sessions = {
+            name: param.default.dependency is get_db_read
+            for name, param in signature.parameters.items()
+            if isinstance(param.default, params.Depends) and param.default.dependency in (get_db, get_db_read)
+        }
+
+        @wraps(func)
+        async def wrapper(*args, **kwargs):
+            arguments = signature.bind_partial(*args, **kwargs).arguments
+            values = {name: arguments.get(name) for name in names}
+            user_id = None
+            if per_user:
+                user_id = _current_user_id(signature, arguments)
+                if user_id is None:
+                    return await func(*args, **kwargs)
+                values["user_id"] = user_id
+
+            async def load():
+                bound = signature.bind_partial(*args, **kwargs)
+                async with AsyncExitStack() as stack:
+                    for name, read in sessions.items():
+                        if name in bound.arguments:
+                            bound.arguments[name] = await stack.enter_async_context(session_scope(read=read))
+                    return jsonable_encoder(await func(*bound.args, **bound.kwargs))
+
+            return await cache_get_or_set(
+                make_cache_key(prefix, **values),
+                load,
+                ttl,
+                tags=tuple(tag.format(**{"user_id": user_id, **values}) for tag in tags),
+                stale_ttl=stale_ttl,
+            )
+
+        return wrapper
+
+    return decorator
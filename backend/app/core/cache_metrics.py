@@ -0,0 +1,82 @@
+"""
+Métriques d'efficacité du cache
+===============================
+
+Compteurs en mémoire par type de cache (le ``prefix`` de ``make_cache_key``) :
+hits, misses, latence d'un hit et durée du calcul d'une valeur absente
+(``cache_get_or_set``), c'est-à-dire le temps que coûterait la requête sans
+cache. Incrémentés sur la boucle d'événements, sans verrou.
+
+``CacheStatsService`` les vide périodiquement dans ``CacheStatistique``.
+"""
+
+import time
+from typing import Any, Dict
+
+
+class _TypeCounters:
+    __slots__ = ("hits", "misses", "hit_ms", "loads", "load_ms")
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.hit_ms = 0.0
+        self.loads = 0
+        self.load_ms = 0.0
+
+    def as_dict(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        avg_hit = self.hit_ms / self.hits if self.hits else None
+        avg_load = self.load_ms / self.loads if self.loads else None
+        saved = (
+            self.hits * max(avg_load - (avg_hit or 0.0), 0.0)
+            if avg_load is not None else None
+        )
+        return {
+            "requests": total,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / total, 4) if total else None,
+            "avg_hit_ms": round(avg_hit, 4) if avg_hit is not None else None,
+            "avg_load_ms": round(avg_load, 4) if avg_load is not None else None,
+            "time_saved_ms": round(saved, 3) if saved is not None else None,
+        }
+
+
+class CacheMetrics:
+    """Compteurs par type de cache depuis le dernier ``drain``."""
+
+    def __init__(self):
+        self._types: Dict[str, _TypeCounters] = {}
+        self.period_start = time.time()
+
+    def _counters(self, cache_type: str) -> _TypeCounters:
+        counters = self._types.get(cache_type)
+        if counters is None:
+            counters = self._types[cache_type] = _TypeCounters()
+        return counters
+
+    def record_hit(self, cache_type: str, duration_ms: float) -> None:
+        counters = self._counters(cache_type)
+        counters.hits += 1
+        counters.hit_ms += duration_ms
+
+    def record_miss(self, cache_type: str) -> None:
+        self._counters(cache_type).misses += 1
+
+    def record_load(self, cache_type: str, duration_ms: float) -> None:
+        counters = self._counters(cache_type)
+        counters.loads += 1
+        counters.load_ms += duration_ms
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        return {cache_type: c.as_dict() for cache_type, c in sorted(self._types.items())}
+
+    def drain(self) -> tuple:
+        """(début, fin, compteurs par type) de la période écoulée, puis remise à zéro."""
+        types, self._types = self._types, {}
+        start, self.period_start = self.period_start, time.time()
+        return start, self.period_start, types
+
+
+cache_metrics = CacheMetrics()
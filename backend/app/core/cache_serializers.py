@@ -0,0 +1,165 @@
+"""
+Sérialisation des valeurs du cache Redis
+========================================
+
+Chaque valeur stockée commence par un octet d'en-tête : le format
+(``0x01`` JSON, ``0x02`` msgpack) et le bit ``0x80`` si la charge utile est
+compressée (zlib). Ces octets ne peuvent pas commencer un document JSON : les
+valeurs écrites avant l'en-tête (JSON brut) restent lisibles.
+
+Les deux formats restituent les types perdus par ``json.dumps(default=str)`` :
+``Decimal``, ``datetime``, ``date``, ``time`` et ``UUID``.
+
+- ``json``    : toujours disponible ;
+- ``msgpack`` : binaire, plus compact et plus rapide (paquet ``msgpack``).
+
+``CACHE_SERIALIZER=auto`` choisit msgpack s'il est installé. Les valeurs sont
+relues quel que soit le format qui les a écrites.
+"""
+
+import json
+import logging
+import zlib
+from datetime import date, datetime, time
+from decimal import Decimal
+from typing import Any, Callable, Dict, Optional, Tuple
+from uuid import UUID
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+try:
+    import msgpack
+    _MSGPACK_AVAILABLE = True
+except ImportError:
+    msgpack = None
+    _MSGPACK_AVAILABLE = False
+
+COMPRESSED = 0x80
+
+# (type, tag, encode, decode) — l'ordre compte : datetime est une sous-classe de date
+_TYPES: Tuple[Tuple[type, str, Callable[[Any], str], Callable[[str], Any]], ...] = (
+    (Decimal, "dec", str, Decimal),
+    (datetime, "dt", datetime.isoformat, datetime.fromisoformat),
+    (date, "d", date.isoformat, date.fromisoformat),
+    (time, "t", time.isoformat, time.fromisoformat),
+    (UUID, "uuid", str, UUID),
+)
+_DECODERS = {tag: decode for _, tag, _, decode in _TYPES}
+_ENCODERS = {cls: (tag, encode) for cls, tag, encode, _ in _TYPES}
+
+
+def _tag(value: Any) -> Optional[Tuple[str, str]]:
+    # Correspondance exacte d'abord (cas courant), puis sous-classes
+    entry = _ENCODERS.get(type(value))
+    if entry is None:
+        entry = next((_ENCODERS[cls] for cls in _ENCODERS if isinstance(value, cls)), None)
+        if entry is None:
+            return None
+    return entry[0], entry[1](value)
+
+
+class JsonSerializer:
+    """JSON ; les types riches sont encodés ``{"$type": "dec", "v": "12.50"}``."""
+
+    name = "json"
+    format_id = 0x01
+
+    @staticmethod
+    def _default(value: Any) -> Any:
+        tagged = _tag(value)
+        if tagged is not None:
+            return {"$type": tagged[0], "v": tagged[1]}
+        if isinstance(value, (set, frozenset, tuple)):
+            return list(value)
+        return str(value)
+
+    @staticmethod
+    def _object_hook(obj: Dict[str, Any]) -> Any:
+        if "$type" in obj and len(obj) == 2:
+            decode = _DECODERS.get(obj["$type"])
+            if decode is not None:
+                return decode(obj["v"])
+        return obj
+
+    def dumps(self, value: Any) -> bytes:
+        return json.dumps(value, default=self._default, separators=(",", ":")).encode()
+
+    def loads(self, data: bytes) -> Any:
+        return json.loads(data, object_hook=self._object_hook)
+
+
+class MsgpackSerializer:
+    """msgpack ; un type d'extension par type riche."""
+
+    name = "msgpack"
+    format_id = 0x02
+    _EXT_CODES = {tag: code for code, (_, tag, _, _) in enumerate(_TYPES, start=1)}
+    _EXT_TAGS = {code: tag for tag, code in _EXT_CODES.items()}
+
+    def _default(self, value: Any) -> Any:
+        tagged = _tag(value)
+        if tagged is not None:
+            return msgpack.ExtType(self._EXT_CODES[tagged[0]], tagged[1].encode())
+        if isinstance(value, (set, frozenset)):
+            return list(value)
+        return str(value)
+
+    def _ext_hook(self, code: int, data: bytes) -> Any:
+        tag = self._EXT_TAGS.get(code)
+        if tag is None:
+            return msgpack.ExtType(code, data)
+        return _DECODERS[tag](data.decode())
+
+    def dumps(self, value: Any) -> bytes:
+        return msgpack.packb(value, default=self._default, use_bin_type=True, datetime=False)
+
+    def loads(self, data: bytes) -> Any:
+        return msgpack.unpackb(data, ext_hook=self._ext_hook, raw=False, strict_map_key=False)
+
+
+_SERIALIZERS: Dict[int, Any] = {JsonSerializer.format_id: JsonSerializer()}
+if _MSGPACK_AVAILABLE:
+    _SERIALIZERS[MsgpackSerializer.format_id] = MsgpackSerializer()
+
+
+def get_serializer(name: str = None):
+    """Sérialiseur ``json`` / ``msgpack`` / ``auto`` (défaut : ``CACHE_SERIALIZER``)."""
+    name = name or settings.CACHE_SERIALIZER
+    if name == "auto":
+        name = "msgpack" if _MSGPACK_AVAILABLE else "json"
+    if name == "msgpack" and not _MSGPACK_AVAILABLE:
+        logger.warning("CACHE_SERIALIZER=msgpack but msgpack is not installed, using json")
+        name = "json"
+    return next(s for s in _SERIALIZERS.values() if s.name == name)
+
+
+def encode(value: Any, serializer=None, compress_threshold: int = None) -> bytes:
+    """Valeur -> octets stockés (en-tête + charge utile, compressée au-delà du seuil)."""
+    serializer = serializer or get_serializer()
+    if compress_threshold is None:
+        compress_threshold = settings.CACHE_COMPRESSION_THRESHOLD
+    payload = serializer.dumps(value)
+    header = serializer.format_id
+    if compress_threshold and len(payload) >= compress_threshold:
+        compressed = zlib.compress(payload, settings.CACHE_COMPRESSION_LEVEL)
+        if len(compressed) < len(payload):
+            payload, header = compressed, header | COMPRESSED
+    return bytes((header,)) + payload
+
+
+def decode(data: bytes) -> Any:
+    """Octets stockés -> valeur ; accepte aussi le JSON brut des anciennes entrées."""
+    if isinstance(data, str):
+        return json.loads(data)
+    header = data[0] if data else 0
+    serializer = _SERIALIZERS.get(header & ~COMPRESSED)
+    if serializer is None:
+        if (header & ~COMPRESSED) == MsgpackSerializer.format_id:
+            raise ValueError("Cached value was written with msgpack, which is not installed")
+        return json.loads(data)
+    payload = data[1:]
+    if header & COMPRESSED:
+        payload = zlib.decompress(payload)
+    return serializer.loads(payload)
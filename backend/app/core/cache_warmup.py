@@ -0,0 +1,115 @@
+"""
+Préchauffage du cache au démarrage
+==================================
+
+Les lectures chaudes (véhicules vedettes, villes GPS, vue d'ensemble
+analytics...) s'enregistrent avec ``@cache_warmer("nom")`` ; le ``lifespan``
+lance ``start_cache_warmup()`` et ``GET /ready`` répond 503 tant que le
+préchauffage n'est pas terminé (``/health`` reste un simple test de vie).
+
+Les préchauffeurs listés dans ``CACHE_WARMUP_KEYS`` tournent en parallèle
+pendant au plus ``CACHE_WARMUP_BUDGET`` secondes : au-delà le worker est
+déclaré prêt quand même, et les calculs déjà lancés via
+``cache_get_or_set`` se terminent en arrière-plan.
+"""
+
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional, Sequence
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+_warmers: Dict[str, Callable[[], Awaitable[Any]]] = {}
+
+PENDING = "pending"
+READY = "ready"
+
+_state: Dict[str, Any] = {"status": PENDING, "duration_ms": None, "warmers": {}}
+
+
+def cache_warmer(name: str):
+    """Enregistre une coroutine sans argument qui remplit une entrée du cache."""
+    def decorator(func: Callable[[], Awaitable[Any]]):
+        _warmers[name] = func
+        return func
+    return decorator
+
+
+async def _run(name: str) -> None:
+    started = time.perf_counter()
+    try:
+        await _warmers[name]()
+        _state["warmers"][name] = {"status": "ok", "ms": round((time.perf_counter() - started) * 1000, 1)}
+    except asyncio.CancelledError:
+        _state["warmers"][name] = {"status": "timeout"}
+        raise
+    except Exception as e:
+        logger.warning(f"Cache warmer '{name}' failed: {e}")
+        _state["warmers"][name] = {"status": "error", "error": str(e)}
+
+
+async def warm_caches(names: Optional[Sequence[str]] = None, budget: float = None) -> Dict[str, Any]:
+    """Exécute les préchauffeurs ``names`` (défaut : ``CACHE_WARMUP_KEYS``) en parallèle."""
+    names = list(settings.CACHE_WARMUP_KEYS if names is None else names)
+    budget = settings.CACHE_WARMUP_BUDGET if budget is None else budget
+    started = time.perf_counter()
+
+    for name in names:
+        if name not in _warmers:
+            logger.warning(f"Unknown cache warmer '{name}' (registered: {sorted(_warmers)})")
+            _state["warmers"][name] = {"status": "unknown"}
+    tasks = [asyncio.create_task(_run(name)) for name in names if name in _warmers]
+
+    if tasks:
+        done, pending = await asyncio.wait(tasks, timeout=budget)
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+            logger.warning(f"Cache warm-up budget of {budget}s exceeded, {len(pending)} warmer(s) cancelled")
+
+    _state["duration_ms"] = round((time.perf_counter() - started) * 1000, 1)
+    _state["status"] = READY
+    logger.info(f"Cache warm-up finished in {_state['duration_ms']}ms")
+    return readiness()
+
+
+def mark_ready() -> None:
+    """Déclare le worker prêt sans préchauffage (``CACHE_WARMUP_ENABLED=false``)."""
+    _state["status"] = READY
+
+
+def is_ready() -> bool:
+    return _state["status"] == READY
+
+
+def readiness() -> Dict[str, Any]:
+    return {
+        "status": _state["status"],
+        "warmup_ms": _state["duration_ms"],
+        "warmers": dict(_state["warmers"]),
+    }
+
+
+_warmup_task: Optional[asyncio.Task] = None
+
+
+def start_cache_warmup() -> None:
+    """Lance le préchauffage en tâche de fond (démarrage de l'application)."""
+    global _warmup_task
+    if not settings.CACHE_WARMUP_ENABLED:
+        mark_ready()
+        return
+    _warmup_task = asyncio.create_task(warm_caches())
+
+
+async def stop_cache_warmup() -> None:
+    """Annule un préchauffage encore en cours (arrêt de l'application)."""
+    global _warmup_task
+    task, _warmup_task = _warmup_task, None
+    if task is not None and not task.done():
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
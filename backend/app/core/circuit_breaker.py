@@ -0,0 +1,119 @@
+"""
+Circuit breaker
+===============
+
+Protège l'application d'une dépendance en panne (Redis...) : après
+``failure_threshold`` échecs consécutifs le circuit s'ouvre et les appels sont
+refusés immédiatement (l'appelant dégrade, ex. cache miss) au lieu d'attendre
+un timeout à chaque requête.
+
+- ``closed``    : appels autorisés ;
+- ``open``      : appels refusés pendant un délai exponentiel (``base_delay``,
+                  doublé à chaque réouverture, plafonné à ``max_delay``, avec jitter) ;
+- ``half_open`` : le délai écoulé, un seul appel « sonde » est autorisé ; son
+                  succès referme le circuit, son échec le rouvre plus longtemps.
+"""
+
+import logging
+import random
+import threading
+import time
+from typing import Any, Dict
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+# Valeur numérique de l'état (jauge de monitoring)
+STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+
+class CircuitBreaker:
+    """Thread-safe circuit breaker with exponential backoff and half-open probing."""
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = 3,
+        base_delay: float = 1.0,
+        max_delay: float = 60.0,
+        probe_timeout: float = 10.0,
+    ):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        # Une sonde sans verdict au-delà de ce délai n'empêche plus d'en lancer une autre
+        self.probe_timeout = probe_timeout
+        self._lock = threading.Lock()
+        self.state = CLOSED
+        self.consecutive_failures = 0
+        self._reopen_count = 0
+        self._open_until = 0.0
+        self._probe_started_at = None
+        self.opened_total = 0
+        self.rejected_total = 0
+
+    def allow_request(self) -> bool:
+        """Vrai si l'appel peut être tenté ; compte les refus sinon."""
+        if self.state == CLOSED:
+            return True
+        with self._lock:
+            now = time.monotonic()
+            if self.state == OPEN and now >= self._open_until:
+                self._transition(HALF_OPEN)
+            if self.state == HALF_OPEN:
+                if self._probe_started_at is None or now - self._probe_started_at > self.probe_timeout:
+                    self._probe_started_at = now
+                    return True
+            elif self.state == CLOSED:
+                return True
+            self.rejected_total += 1
+            return False
+
+    def record_success(self) -> None:
+        if self.state == CLOSED and self.consecutive_failures == 0:
+            return
+        with self._lock:
+            self.consecutive_failures = 0
+            self._reopen_count = 0
+            self._probe_started_at = None
+            if self.state != CLOSED:
+                self._transition(CLOSED)
+
+    def record_failure(self, trip: bool = False) -> None:
+        """Enregistre un échec ; ``trip=True`` ouvre le circuit sans attendre le seuil."""
+        with self._lock:
+            self.consecutive_failures += 1
+            self._probe_started_at = None
+            if self.state == OPEN:
+                return
+            if trip or self.state == HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+                delay = min(self.max_delay, self.base_delay * (2 ** self._reopen_count))
+                delay *= random.uniform(0.8, 1.2)
+                self._reopen_count += 1
+                self._open_until = time.monotonic() + delay
+                self.opened_total += 1
+                self._transition(OPEN, f"retry in {delay:.1f}s")
+
+    def _transition(self, state: str, detail: str = "") -> None:
+        previous, self.state = self.state, state
+        if state == OPEN:
+            logger.warning(f"Circuit '{self.name}' {previous} -> open ({detail})")
+        elif state == CLOSED:
+            logger.info(f"Circuit '{self.name}' closed, service recovered")
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            retry_in = max(0.0, self._open_until - time.monotonic()) if self.state == OPEN else 0.0
+            return {
+                "name": self.name,
+                "state": self.state,
+                "state_value": STATE_VALUES[self.state],
+                "consecutive_failures": self.consecutive_failures,
+                "retry_in_seconds": round(retry_in, 2),
+                "opened_total": self.opened_total,
+                "rejected_total": self.rejected_total,
+            }
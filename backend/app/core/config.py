@@ -52,7 +52,51 @@ class Settings(BaseSettings):
     DB_POOL_TIMEOUT: int = 30
     DB_POOL_RECYCLE: int = 3600
     DB_ECHO: bool = False  # True pour debug SQL
-    
+    # Ping au checkout uniquement si la connexion est inactive depuis plus de N secondes (0 = toujours)
+    DB_POOL_PRE_PING_IDLE_SECONDS: int = 30
+
+    # Exécuteur dédié aux appels DB (mode sync) — défaut: DB_POOL_SIZE + DB_MAX_OVERFLOW
+    DB_EXECUTOR_MAX_WORKERS: Optional[int] = None
+    DB_EXECUTOR_WAIT_WARNING_MS: int = 500
+
+    # Mode du driver: "sync" (psycopg2 + threadpool) ou "async" (asyncpg natif,
+    # sans db.query() ni chargement paresseux : voir app/core/database.py)
+    DB_DRIVER_MODE: str = "sync"
+    DATABASE_ASYNC_URL: Optional[str] = None  # Dérivée de DATABASE_URL si absente
+
+    # Réplica de lecture (optionnel) — utilisé par la dépendance get_db_read
+    DATABASE_READ_URL: Optional[str] = None
+    DATABASE_READ_ASYNC_URL: Optional[str] = None  # Dérivée de DATABASE_READ_URL si absente
+    DB_READ_HEALTH_CHECK_INTERVAL: int = 10  # secondes entre deux sondes du réplica
+    DB_READ_MAX_LAG_SECONDS: Optional[float] = None  # None = retard non contrôlé
+
+    # Instrumentation SQL par requête (en-têtes X-DB-*, détection N+1)
+    DB_QUERY_STATS_ENABLED: bool = False
+    DB_QUERY_COUNT_WARNING: int = 30  # statements par requête HTTP
+    DB_DUPLICATE_QUERY_WARNING: int = 5  # répétitions d'une même empreinte SQL
+
+    # Profiler SQL (latences par empreinte, journal des requêtes lentes), opt-in
+    DB_QUERY_PROFILER_ENABLED: bool = False
+    DB_SLOW_QUERY_MS: int = 200
+    DB_QUERY_PROFILER_MAX_FINGERPRINTS: int = 500
+
+    @staticmethod
+    def _asyncpg_url(url: str) -> str:
+        for prefix in ("postgresql+psycopg2://", "postgresql://", "postgres://"):
+            if url.startswith(prefix):
+                return "postgresql+asyncpg://" + url[len(prefix):]
+        return url
+
+    @property
+    def database_async_url(self) -> str:
+        return self.DATABASE_ASYNC_URL or self._asyncpg_url(self.DATABASE_URL)
+
+    @property
+    def database_read_async_url(self) -> Optional[str]:
+        if self.DATABASE_READ_ASYNC_URL:
+            return self.DATABASE_READ_ASYNC_URL
+        return self._asyncpg_url(self.DATABASE_READ_URL) if self.DATABASE_READ_URL else None
+
     # ============================================================
     # JWT AUTHENTICATION
     # ============================================================
@@ -70,6 +114,38 @@ class Settings(BaseSettings):
     # ============================================================
     REDIS_URL: str = "redis://localhost:6379/0"
     REDIS_CACHE_EXPIRE: int = 3600  # 1 heure par défaut
+    REDIS_MAX_CONNECTIONS: int = 50  # pool partagé cache + blacklist
+    REDIS_SOCKET_TIMEOUT: float = 2.0
+    # Circuit breaker Redis: ouverture après N échecs, réessai avec backoff exponentiel
+    REDIS_BREAKER_FAILURE_THRESHOLD: int = 3
+    REDIS_BREAKER_BASE_DELAY: float = 1.0
+    REDIS_BREAKER_MAX_DELAY: float = 60.0
+
+    # Cache L1 en mémoire (par worker) devant Redis
+    CACHE_L1_ENABLED: bool = True
+    CACHE_L1_MAX_ENTRIES: int = 2048
+    CACHE_L1_TTL: int = 30  # secondes max en L1 (borne la dérive si un message pub/sub est perdu)
+    CACHE_NAMESPACE_VERSION_TTL: int = 10  # secondes de cache local des générations de namespace
+    CACHE_NAMESPACE_VERSION_MAX_ENTRIES: int = 10000  # générations gardées par worker (tags par utilisateur)
+    CACHE_LOCK_TIMEOUT: float = 10.0  # durée max du verrou de recalcul inter-workers (secondes)
+    CACHE_LOCK_POLL_INTERVAL: float = 0.05  # attente du résultat calculé par un autre worker
+    CACHE_WARMUP_ENABLED: bool = True
+    CACHE_WARMUP_KEYS: List[str] = ["featured_vehicles", "gps_cities", "analytics_overview", "search_index"]
+    CACHE_WARMUP_BUDGET: float = 15.0  # secondes max avant de déclarer le worker prêt
+    CACHE_STATS_FLUSH_INTERVAL: int = 300  # secondes entre deux écritures dans CacheStatistiques (0 = jamais)
+    CACHE_NEGATIVE_TTL: int = 60  # secondes de mémorisation d'un identifiant inexistant (404)
+    CACHE_SERIALIZER: str = "auto"  # auto (msgpack si installé), json ou msgpack
+    CACHE_COMPRESSION_THRESHOLD: int = 1024  # octets ; zlib au-delà (0 = jamais)
+    CACHE_COMPRESSION_LEVEL: int = 1  # zlib rapide : le gain vient surtout des listes répétitives
+
+    # Totaux des listes paginées (paramètre count=)
+    PAGINATION_COUNT_CACHE_TTL: int = 30  # secondes de cache d'un total count=cached
+    PAGINATION_ESTIMATE_MIN_ROWS: int = 1000  # sous ce seuil estimé, count=estimated compte exactement
+
+    # Index plein texte du catalogue (en mémoire, par worker)
+    SEARCH_INDEX_ENABLED: bool = True
+    SEARCH_INDEX_REBUILD_INTERVAL: int = 3600  # secondes entre deux reconstructions complètes (0 = jamais)
+    SEARCH_INDEX_MAX_CANDIDATES: int = 2000  # au-delà, la recherche repasse par ILIKE en base
     
     # ============================================================
     # STORAGE (Azure Blob / AWS S3)
@@ -197,6 +273,10 @@ class Settings(BaseSettings):
     
     def model_post_init(self, __context):
         """Validate critical settings after initialization."""
+        if self.DB_DRIVER_MODE not in ("sync", "async"):
+            raise ValueError(
+                f"DB_DRIVER_MODE must be 'sync' or 'async', got '{self.DB_DRIVER_MODE}'"
+            )
         if self.ENVIRONMENT == "production":
             if self.SECRET_KEY.startswith("dev-secret-key"):
                 raise ValueError(
@@ -3,52 +3,159 @@ Configuration de la base de données PostgreSQL
 ================================================
 
 Setup de SQLAlchemy avec support asynchrone pour PostgreSQL.
+
+Deux modes sont disponibles via ``DB_DRIVER_MODE`` :
+- ``sync`` (défaut) : driver psycopg2, chaque appel passe par un thread de l'exécuteur DB ;
+- ``async`` : driver asyncpg natif, aucun saut de thread par requête SQL.
+
+Le mode ``async`` n'accepte que l'API 2.0 attendue (``await db.execute(select(...))``) :
+
+- ``db.query(...)`` lève ``NotImplementedError`` ; ``DataIntegrityService``,
+  ``AnalyticsService``, ``PermissionService``, ``NotificationService``,
+  ``GeolocationService`` et les endpoints documents, incidents et images de
+  véhicules l'utilisent encore et ne fonctionnent qu'en mode ``sync`` ;
+- les relations doivent être chargées par la requête (``selectinload``) : un
+  chargement paresseux qui émettrait du SQL lève ``InvalidRequestError``
+  (``lazy='raise_on_sql'``) au lieu d'une erreur greenlet obscure.
+
+Si ``DATABASE_READ_URL`` est défini, la dépendance ``get_db_read`` route les
+lectures vers le réplica (repli automatique sur le primaire, voir ``db_replica``).
 """
 
 from sqlalchemy.orm import declarative_base
-from typing import AsyncGenerator
+from typing import AsyncGenerator, AsyncIterator
+from contextlib import asynccontextmanager
+import asyncio
 import logging
 
 from app.core.config import settings
 
 logger = logging.getLogger(__name__)
 
-# NOTE: We use a sync driver (psycopg2) and a small async wrapper that runs DB calls in a threadpool.
+# NOTE: We use a sync driver (psycopg2) and a small async wrapper that runs DB calls in a
+# dedicated, pool-sized executor (app.core.db_executor) instead of Starlette's shared threadpool.
 # This preserves the async interface used across services (await db.execute(...), await session.commit(), etc.)
 
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
-from starlette.concurrency import run_in_threadpool
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import Session, raiseload, sessionmaker
 
-# Create a synchronous engine using psycopg2
-engine = create_engine(
-    settings.DATABASE_URL,
-    echo=settings.DB_ECHO,
-    pool_size=settings.DB_POOL_SIZE,
-    max_overflow=settings.DB_MAX_OVERFLOW,
-    pool_timeout=settings.DB_POOL_TIMEOUT,
-    pool_recycle=settings.DB_POOL_RECYCLE,
-    pool_pre_ping=True,
+from app.core.db_executor import db_executor, run_in_db_executor
+from app.core.db_pool import (
+    InstrumentedQueuePool,
+    InstrumentedAsyncAdaptedQueuePool,
+    instrument_pool,
+    install_liveness_checks,
 )
+from app.core.db_replica import ReplicaMonitor, is_connection_error
+from app.core.db_instrumentation import install_query_instrumentation
+from app.core.query_profiler import query_profiler  # noqa: F401 — registers the statement observer
+
+
+def _pool_options() -> dict:
+    return dict(
+        echo=settings.DB_ECHO,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        # Liveness handled by install_liveness_checks (ping only idle connections)
+        pool_pre_ping=False,
+    )
+
+
+pool_metrics = {}
+
+
+def _instrument(sync_engine, name: str) -> None:
+    """Pool checkout/liveness metrics, plus statement listeners when stats or profiler are on."""
+    pool_metrics[name] = instrument_pool(sync_engine, name)
+    install_liveness_checks(
+        sync_engine, pool_metrics[name], settings.DB_POOL_PRE_PING_IDLE_SECONDS
+    )
+    if settings.DB_QUERY_STATS_ENABLED or settings.DB_QUERY_PROFILER_ENABLED:
+        install_query_instrumentation(sync_engine)
+
+
+# Create a synchronous engine using psycopg2
+engine = create_engine(settings.DATABASE_URL, poolclass=InstrumentedQueuePool, **_pool_options())
+_instrument(engine, "primary")
 
 # Sync session factory
 SessionLocal = sessionmaker(bind=engine, expire_on_commit=False, autoflush=False)
 
+# Read replica (optional): same pool sizing, its own instrumented pool
+read_engine = None
+ReadSessionLocal = None
+replica_monitor = None
+if settings.DATABASE_READ_URL:
+    read_engine = create_engine(
+        settings.DATABASE_READ_URL, poolclass=InstrumentedQueuePool, **_pool_options()
+    )
+    _instrument(read_engine, "replica")
+    ReadSessionLocal = sessionmaker(bind=read_engine, expire_on_commit=False, autoflush=False)
+    replica_monitor = ReplicaMonitor(
+        check_interval=settings.DB_READ_HEALTH_CHECK_INTERVAL,
+        max_lag_seconds=settings.DB_READ_MAX_LAG_SECONDS,
+    )
+
 # Base pour les modèles
 Base = declarative_base()
 
 
+class _PendingOperations:
+    """Writes and refreshes deferred by ``AsyncSessionSyncWrapper.batch()``."""
+
+    def __init__(self):
+        self.writes = []
+        self.refreshes = []
+
+    def apply(self, session, commit=False):
+        for method, args, kwargs in self.writes:
+            getattr(session, method)(*args, **kwargs)
+        self.writes.clear()
+        if commit:
+            session.commit()
+            for args, kwargs in self.refreshes:
+                session.refresh(*args, **kwargs)
+            self.refreshes.clear()
+
+    def flush(self, session):
+        self.apply(session)
+        session.flush()
+
+
 class AsyncSessionSyncWrapper:
     """Minimal wrapper that exposes async methods but delegates to a sync Session
-    executed in a threadpool. It supports the common methods used across the codebase
+    executed in the dedicated DB executor. It supports the common methods used across the codebase
     (execute, scalars, scalar, commit, rollback, close, add, flush, refresh).
+
+    Each awaited call is one executor round trip. Write paths that chain several
+    calls can instead use ``run_sync(fn)`` (whole unit of work in one hop) or
+    ``async with db.batch():`` (deferred writes applied in one hop on exit).
+
+    Built with ``factory=``, the sync Session is only created on first use: a
+    request answered from cache (or rejected before touching the DB) costs no
+    session, no pooled connection and no executor hop for ``rollback``/``close``.
     """
 
-    def __init__(self, session):
-        self._session = session
+    def __init__(self, session=None, factory=None):
+        self._sync_session = session
+        self._factory = factory
+        self._batch = None
+
+    @property
+    def _session(self):
+        if self._sync_session is None:
+            # Session() does no I/O: the connection is checked out on first statement
+            self._sync_session = self._factory()
+        return self._sync_session
+
+    def _is_idle(self) -> bool:
+        """No transaction open, so rollback/close cannot touch the connection pool."""
+        return not self._sync_session.in_transaction()
 
     async def execute(self, *args, **kwargs):
-        return await run_in_threadpool(self._session.execute, *args, **kwargs)
+        return await run_in_db_executor(self._session.execute, *args, **kwargs)
 
     async def scalars(self, *args, **kwargs):
         result = await self.execute(*args, **kwargs)
@@ -59,25 +166,83 @@ class AsyncSessionSyncWrapper:
         return result.scalar()
 
     async def add(self, *args, **kwargs):
-        return await run_in_threadpool(self._session.add, *args, **kwargs)
+        if self._batch is not None:
+            self._batch.writes.append(("add", args, kwargs))
+            return None
+        return await run_in_db_executor(self._session.add, *args, **kwargs)
 
     async def flush(self):
-        return await run_in_threadpool(self._session.flush)
+        if self._batch is not None:
+            return await run_in_db_executor(self._batch.flush, self._session)
+        return await run_in_db_executor(self._session.flush)
 
     async def refresh(self, *args, **kwargs):
-        return await run_in_threadpool(self._session.refresh, *args, **kwargs)
+        if self._batch is not None:
+            self._batch.refreshes.append((args, kwargs))
+            return None
+        return await run_in_db_executor(self._session.refresh, *args, **kwargs)
 
     async def commit(self):
-        return await run_in_threadpool(self._session.commit)
+        if self._batch is not None:
+            # Committed once, on batch exit
+            return None
+        if self._sync_session is None:
+            return None
+        return await run_in_db_executor(self._session.commit)
 
     async def rollback(self):
-        return await run_in_threadpool(self._session.rollback)
+        if self._batch is not None:
+            self._batch = _PendingOperations()
+        if self._sync_session is None:
+            return None
+        if self._is_idle():
+            return self._sync_session.rollback()
+        return await run_in_db_executor(self._session.rollback)
 
     async def delete(self, *args, **kwargs):
-        return await run_in_threadpool(self._session.delete, *args, **kwargs)
+        if self._batch is not None:
+            self._batch.writes.append(("delete", args, kwargs))
+            return None
+        return await run_in_db_executor(self._session.delete, *args, **kwargs)
 
     async def close(self):
-        return await run_in_threadpool(self._session.close)
+        if self._sync_session is None:
+            return None
+        if self._is_idle():
+            return self._sync_session.close()
+        return await run_in_db_executor(self._session.close)
+
+    async def run_sync(self, fn, *args, **kwargs):
+        """Run ``fn(session, *args, **kwargs)`` on one worker thread.
+
+        ``fn`` receives the sync ``Session`` and can chain lookups, inserts and
+        ``commit()`` without returning to the event loop between them. Same
+        signature as ``AsyncSession.run_sync`` so it works in both driver modes.
+        """
+        return await run_in_db_executor(fn, self._session, *args, **kwargs)
+
+    @asynccontextmanager
+    async def batch(self):
+        """Group ``add``/``delete``/``commit``/``refresh`` into a single hop.
+
+        Inside the block these calls are only recorded; on exit they are applied,
+        committed and the requested objects refreshed in one executor call.
+        Reads (``execute``, ``scalar``...) still run immediately, and ``flush()``
+        applies the pending writes so generated ids become available.
+        An exception rolls the whole batch back.
+        """
+        if self._batch is not None:
+            yield self
+            return
+        self._batch = _PendingOperations()
+        try:
+            yield self
+        except BaseException:
+            self._batch = None
+            await self.rollback()
+            raise
+        pending, self._batch = self._batch, None
+        await run_in_db_executor(pending.apply, self._session, True)
 
     def __getattr__(self, name):
         """Forward any unhandled attribute access to the underlying sync session.
@@ -101,29 +266,301 @@ class AsyncSessionSyncWrapper:
         await self.close()
 
 
-# Dependency pour obtenir une session de base de données (async interface compatible)
-async def get_db() -> AsyncGenerator[AsyncSessionSyncWrapper, None]:
-    """Fournit une wrapper session utilisable avec `async with` et `await` dans le code.
+class AsyncSessionNativeWrapper:
+    """Wrapper over a native ``AsyncSession`` (asyncpg) exposing the same surface
+    as ``AsyncSessionSyncWrapper``.
 
-    Exemple d'usage inchangé :
-        async def endpoint(db: AsyncSession = Depends(get_db)):
-            result = await db.execute(select(User))
-            return result.scalars().all()
+    ``AsyncSession.add`` is synchronous while the codebase does ``await db.add(...)``,
+    so the in-memory methods are re-exposed as coroutines. Like the sync wrapper,
+    the ``AsyncSession`` is only created on first use when built with ``factory=``.
+
+    Legacy ``db.query()`` and lazy relationship loads are not supported (see the
+    module docstring) and fail with an explicit error.
+    """
+
+    def __init__(self, session=None, factory=None):
+        self._async_session = session
+        self._factory = factory
+        self._batch_refreshes = None
+
+    @property
+    def _session(self):
+        if self._async_session is None:
+            self._async_session = self._factory()
+        return self._async_session
+
+    async def execute(self, *args, **kwargs):
+        return await self._session.execute(*args, **kwargs)
+
+    async def scalars(self, *args, **kwargs):
+        result = await self.execute(*args, **kwargs)
+        return result.scalars()
+
+    async def scalar(self, *args, **kwargs):
+        result = await self.execute(*args, **kwargs)
+        return result.scalar()
+
+    async def add(self, *args, **kwargs):
+        return self._session.add(*args, **kwargs)
+
+    async def flush(self):
+        return await self._session.flush()
+
+    async def refresh(self, *args, **kwargs):
+        if self._batch_refreshes is not None:
+            self._batch_refreshes.append((args, kwargs))
+            return None
+        return await self._session.refresh(*args, **kwargs)
+
+    async def commit(self):
+        if self._batch_refreshes is not None:
+            return None
+        if self._async_session is None:
+            return None
+        return await self._session.commit()
+
+    async def rollback(self):
+        if self._batch_refreshes is not None:
+            self._batch_refreshes.clear()
+        if self._async_session is None:
+            return None
+        return await self._session.rollback()
+
+    async def delete(self, *args, **kwargs):
+        return await self._session.delete(*args, **kwargs)
+
+    async def close(self):
+        if self._async_session is None:
+            return None
+        return await self._session.close()
+
+    async def run_sync(self, fn, *args, **kwargs):
+        return await self._session.run_sync(fn, *args, **kwargs)
+
+    def query(self, *args, **kwargs):
+        raise NotImplementedError(
+            "db.query() is not available with DB_DRIVER_MODE=async: "
+            "use await db.execute(select(...)) or DB_DRIVER_MODE=sync"
+        )
+
+    @asynccontextmanager
+    async def batch(self):
+        """Same contract as ``AsyncSessionSyncWrapper.batch()``: commit and
+        refreshes happen once, on exit."""
+        if self._batch_refreshes is not None:
+            yield self
+            return
+        self._batch_refreshes = []
+        try:
+            yield self
+        except BaseException:
+            self._batch_refreshes = None
+            await self.rollback()
+            raise
+        refreshes, self._batch_refreshes = self._batch_refreshes, None
+        await self._session.commit()
+        for args, kwargs in refreshes:
+            await self._session.refresh(*args, **kwargs)
+
+    def __getattr__(self, name):
+        return getattr(self._session, name)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        if exc:
+            await self.rollback()
+        else:
+            await self.commit()
+        await self.close()
+
+
+# Async engines (created lazily: asyncpg is only required when DB_DRIVER_MODE=async)
+_async_engines = {}
+_async_sessionmakers = {}
+
+
+class _NativeSyncSession(Session):
+    """Sync session behind ``AsyncSession``: lazy loads needing SQL raise explicitly."""
+
+
+@event.listens_for(_NativeSyncSession, "do_orm_execute")
+def _raise_on_lazy_sql(state):
+    if state.is_select and not state.is_relationship_load and not state.is_column_load:
+        state.statement = state.statement.options(raiseload("*", sql_only=True))
+
+
+def _get_async_engine(name: str, url: str):
+    if name not in _async_engines:
+        from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+
+        async_engine = create_async_engine(
+            url, poolclass=InstrumentedAsyncAdaptedQueuePool, **_pool_options()
+        )
+        _instrument(async_engine.sync_engine, name)
+        _async_sessionmakers[name] = async_sessionmaker(
+            bind=async_engine, expire_on_commit=False, autoflush=False,
+            sync_session_class=_NativeSyncSession,
+        )
+        _async_engines[name] = async_engine
+    return _async_engines[name]
+
+
+def get_async_engine():
+    """Return the native async engine, creating it on first call."""
+    return _get_async_engine("async", settings.database_async_url)
+
+
+def get_async_sessionmaker():
+    """Return the ``async_sessionmaker`` bound to the native async engine."""
+    get_async_engine()
+    return _async_sessionmakers["async"]
+
+
+def get_async_read_engine():
+    """Return the native async engine of the read replica (``None`` if not configured)."""
+    if not settings.DATABASE_READ_URL:
+        return None
+    return _get_async_engine("async_replica", settings.database_read_async_url)
+
+
+async def dispose_engines():
+    """Release pooled connections (called on application shutdown)."""
+    for async_engine in _async_engines.values():
+        await async_engine.dispose()
+    await run_in_db_executor(engine.dispose)
+    if read_engine is not None:
+        await run_in_db_executor(read_engine.dispose)
+    db_executor.shutdown()
+
+
+def get_database_stats() -> dict:
+    """Executor queue telemetry, per-pool checkout metrics and replica routing."""
+    pools = [pool_metrics["primary"].snapshot(engine.pool)]
+    if read_engine is not None:
+        pools.append(pool_metrics["replica"].snapshot(read_engine.pool))
+    for name, async_engine in _async_engines.items():
+        pools.append(pool_metrics[name].snapshot(async_engine.sync_engine.pool))
+    return {
+        "driver_mode": settings.DB_DRIVER_MODE,
+        "executor": db_executor.stats(),
+        "pools": pools,
+        "replica": replica_monitor.stats() if replica_monitor is not None else None,
+    }
+
+
+def _open_session():
+    """Lazy session wrapper matching the configured ``DB_DRIVER_MODE``."""
+    if settings.DB_DRIVER_MODE == "async":
+        return AsyncSessionNativeWrapper(factory=get_async_sessionmaker())
+    return AsyncSessionSyncWrapper(factory=SessionLocal)
+
+
+def _probe_replica_sync(sql):
+    with read_engine.connect() as conn:
+        return conn.execute(sql).scalar()
+
+
+async def _probe_replica(sql):
+    if settings.DB_DRIVER_MODE == "async":
+        async with get_async_read_engine().connect() as conn:
+            return (await conn.execute(sql)).scalar()
+    return await run_in_db_executor(_probe_replica_sync, sql)
+
+
+_replica_probe_lock = asyncio.Lock()
+
+
+async def _replica_available() -> bool:
+    """Verdict du moniteur, re-sondé au plus une fois par intervalle."""
+    if not replica_monitor.needs_check():
+        return replica_monitor.healthy
+    async with _replica_probe_lock:
+        # Une autre requête a pu sonder pendant l'attente du verrou
+        if not replica_monitor.needs_check():
+            return replica_monitor.healthy
+        try:
+            value = await asyncio.wait_for(
+                _probe_replica(replica_monitor.probe_sql), timeout=settings.DB_POOL_TIMEOUT
+            )
+        except Exception as e:
+            return replica_monitor.record_probe(error=e)
+        return replica_monitor.record_probe(value)
+
+
+async def _open_read_session():
+    """Open a session on the read replica, or on the primary when it is unavailable."""
+    if replica_monitor is None:
+        return _open_session(), False
+    if not await _replica_available():
+        replica_monitor.record_route(replica=False)
+        return _open_session(), False
+    replica_monitor.record_route(replica=True)
+    if settings.DB_DRIVER_MODE == "async":
+        get_async_read_engine()
+        return AsyncSessionNativeWrapper(factory=_async_sessionmakers["async_replica"]), True
+    return AsyncSessionSyncWrapper(factory=ReadSessionLocal), True
+
+
+@asynccontextmanager
+async def session_scope(read: bool = False) -> AsyncIterator[AsyncSessionSyncWrapper]:
+    """Session hors requête HTTP (tâches de fond, recalcul de cache).
+
+        async with session_scope(read=True) as db:
+            result = await db.execute(select(Vehicule))
+
+    ``read=True`` utilise le réplica de lecture comme ``get_db_read``.
+    Rollback en cas d'exception, fermeture dans tous les cas.
     """
-    # Create a sync session in a thread (so we don't block the event loop during creation)
-    sync_session = await run_in_threadpool(SessionLocal)
-    session = AsyncSessionSyncWrapper(sync_session)
+    if read:
+        session, on_replica = await _open_read_session()
+    else:
+        session, on_replica = _open_session(), False
 
     try:
         yield session
     except Exception as e:
         await session.rollback()
+        if on_replica and is_connection_error(e):
+            replica_monitor.mark_unhealthy(e)
         logger.error(f"Database session error: {e}")
         raise
     finally:
         await session.close()
 
 
+# Dependency pour obtenir une session de base de données (async interface compatible)
+async def get_db() -> AsyncGenerator[AsyncSessionSyncWrapper, None]:
+    """Fournit une wrapper session utilisable avec `async with` et `await` dans le code.
+
+    Exemple d'usage inchangé :
+        async def endpoint(db: AsyncSession = Depends(get_db)):
+            result = await db.execute(select(User))
+            return result.scalars().all()
+
+    Avec ``DB_DRIVER_MODE=async`` la session est un ``AsyncSessionNativeWrapper``
+    (asyncpg) exposant la même interface.
+
+    La session n'est créée qu'au premier appel : un endpoint qui répond depuis
+    le cache ou échoue avant toute requête ne consomme ni connexion ni thread.
+    """
+    async with session_scope() as session:
+        yield session
+
+
+# Dependency pour les routes en lecture seule (catalogue, recherche, analytics)
+async def get_db_read() -> AsyncGenerator[AsyncSessionSyncWrapper, None]:
+    """Comme ``get_db`` mais sur le réplica de lecture si ``DATABASE_READ_URL`` est défini.
+
+    Retombe sur le primaire quand le réplica est injoignable ou trop en retard
+    (``DB_READ_MAX_LAG_SECONDS``). Les données lues peuvent avoir quelques
+    secondes de retard : ne pas l'utiliser pour relire une écriture récente.
+    """
+    async with session_scope(read=True) as session:
+        yield session
+
+
 # Utility pour transactions (préserve l'API async)
 async def execute_with_transaction(session: AsyncSessionSyncWrapper, operation):
     try:
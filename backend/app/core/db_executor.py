@@ -0,0 +1,126 @@
+"""
+Exécuteur dédié à la base de données
+====================================
+
+Les appels SQL synchrones (psycopg2) ne passent plus par le threadpool anyio
+partagé de Starlette (fichiers, PIL...) mais par un ``ThreadPoolExecutor``
+borné, dimensionné sur le pool de connexions (``DB_POOL_SIZE + DB_MAX_OVERFLOW``) :
+un thread ne peut jamais attendre une connexion qui n'existera pas, et une
+saturation de la base ne bloque plus le reste de l'application.
+
+Expose la profondeur de file, le temps d'attente avant exécution et le temps
+d'exécution pour détecter la saturation avant les timeouts.
+"""
+
+import asyncio
+import contextvars
+import functools
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+from app.core.config import settings
+from app.core.metrics import LatencyWindow
+
+logger = logging.getLogger(__name__)
+
+
+class DatabaseExecutor:
+    """Bounded thread pool for blocking database calls, with queue telemetry."""
+
+    def __init__(self, max_workers: int, wait_warning_ms: int):
+        self.max_workers = max_workers
+        self.wait_warning_ms = wait_warning_ms
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._queued = 0
+        self._active = 0
+        self._submitted = 0
+        self._completed = 0
+        self._max_queue_depth = 0
+        self.wait_times = LatencyWindow()
+        self.run_times = LatencyWindow()
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.max_workers,
+                        thread_name_prefix="autoloco-db",
+                    )
+        return self._executor
+
+    async def run(self, fn: Callable, *args, **kwargs) -> Any:
+        """Run ``fn(*args, **kwargs)`` on a DB worker thread (context vars propagated)."""
+        loop = asyncio.get_running_loop()
+        call = functools.partial(contextvars.copy_context().run, fn, *args, **kwargs)
+        with self._lock:
+            self._queued += 1
+            self._submitted += 1
+            if self._queued > self._max_queue_depth:
+                self._max_queue_depth = self._queued
+        future = self._get_executor().submit(self._invoke, call, time.perf_counter())
+        # Tâche annulée (client parti, timeout) avant qu'un thread ne prenne
+        # l'appel : ``_invoke`` ne tournera jamais, il faut le retirer de la file
+        future.add_done_callback(self._forget_if_cancelled)
+        return await asyncio.wrap_future(future, loop=loop)
+
+    def _forget_if_cancelled(self, future) -> None:
+        if future.cancelled():
+            with self._lock:
+                self._queued -= 1
+
+    def _invoke(self, call: Callable, submitted_at: float) -> Any:
+        started = time.perf_counter()
+        wait_ms = (started - submitted_at) * 1000
+        with self._lock:
+            self._queued -= 1
+            self._active += 1
+            queued = self._queued
+        self.wait_times.add(wait_ms)
+        if wait_ms > self.wait_warning_ms:
+            logger.warning(
+                f"DB executor saturated: waited {wait_ms:.0f}ms for a worker "
+                f"({queued} queued, {self.max_workers} workers)"
+            )
+        try:
+            return call()
+        finally:
+            self.run_times.add((time.perf_counter() - started) * 1000)
+            with self._lock:
+                self._active -= 1
+                self._completed += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            counters = {
+                "max_workers": self.max_workers,
+                "active": self._active,
+                "queue_depth": self._queued,
+                "max_queue_depth": self._max_queue_depth,
+                "submitted": self._submitted,
+                "completed": self._completed,
+            }
+        counters["saturation"] = round(counters["active"] / self.max_workers, 3)
+        counters["wait_time"] = self.wait_times.snapshot()
+        counters["run_time"] = self.run_times.snapshot()
+        return counters
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+
+db_executor = DatabaseExecutor(
+    max_workers=settings.DB_EXECUTOR_MAX_WORKERS or (settings.DB_POOL_SIZE + settings.DB_MAX_OVERFLOW),
+    wait_warning_ms=settings.DB_EXECUTOR_WAIT_WARNING_MS,
+)
+
+
+async def run_in_db_executor(fn: Callable, *args, **kwargs) -> Any:
+    """Équivalent de ``run_in_threadpool`` pour les appels base de données."""
+    return await db_executor.run(fn, *args, **kwargs)
@@ -0,0 +1,179 @@
+"""
+Instrumentation des requêtes SQL
+================================
+
+Compte, par requête HTTP, les statements exécutés, le temps passé en base et les
+statements répétés (même empreinte SQL, paramètres ignorés) — signature typique
+d'un N+1 (relation lazy chargée dans une boucle).
+
+Activation : ``DB_QUERY_STATS_ENABLED=true`` installe les listeners sur les
+engines et ajoute les en-têtes ``X-DB-Query-Count``, ``X-DB-Query-Time-Ms`` et
+``X-DB-Duplicate-Queries`` aux réponses. Un avertissement est loggé au-delà de
+``DB_QUERY_COUNT_WARNING`` statements ou ``DB_DUPLICATE_QUERY_WARNING``
+répétitions d'une même empreinte.
+
+En test : ``with assert_max_queries(3): ...`` (fixture du même nom dans conftest).
+"""
+
+import logging
+import re
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from sqlalchemy import event
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_PARAM = re.compile(r"%\(\w+\)s|%s|(?<!:):\w+|\$\d+|\?")
+_NUMBER = re.compile(r"\b\d+(?:\.\d+)?\b")
+_IN_LIST = re.compile(r"\bIN\s*\(\s*\?(?:\s*,\s*\?)*\s*\)", re.IGNORECASE)
+_SPACE = re.compile(r"\s+")
+
+
+@lru_cache(maxsize=2048)
+def fingerprint_sql(statement: str) -> str:
+    """Normalise un statement : littéraux et paramètres remplacés par ``?``,
+    listes ``IN (...)`` repliées, espaces compactés."""
+    sql = _STRING.sub("?", statement)
+    sql = _PARAM.sub("?", sql)
+    sql = _NUMBER.sub("?", sql)
+    sql = _IN_LIST.sub("IN (...)", sql)
+    return _SPACE.sub(" ", sql).strip()
+
+
+class QueryStats:
+    """Statements exécutés pendant une requête (ou un bloc de test)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.count = 0
+        self.total_ms = 0.0
+        self.fingerprints: Counter = Counter()
+
+    def record(self, statement: str, duration_ms: float) -> None:
+        fingerprint = fingerprint_sql(statement)
+        with self._lock:
+            self.count += 1
+            self.total_ms += duration_ms
+            self.fingerprints[fingerprint] += 1
+
+    def duplicates(self, min_count: int = 2) -> List[Tuple[str, int]]:
+        """Empreintes exécutées au moins ``min_count`` fois, les plus fréquentes d'abord."""
+        with self._lock:
+            return [(fp, n) for fp, n in self.fingerprints.most_common() if n >= min_count]
+
+    def summary(self) -> Dict[str, Any]:
+        duplicates = self.duplicates()
+        return {
+            "count": self.count,
+            "total_ms": round(self.total_ms, 3),
+            "duplicated_statements": sum(n - 1 for _, n in duplicates),
+            "top_duplicate": duplicates[0] if duplicates else None,
+        }
+
+
+_current_stats: ContextVar[Optional[QueryStats]] = ContextVar("db_query_stats", default=None)
+
+
+def get_query_stats() -> Optional[QueryStats]:
+    """Statistiques de la requête en cours (``None`` hors ``track_queries``)."""
+    return _current_stats.get()
+
+
+@contextmanager
+def track_queries() -> Iterator[QueryStats]:
+    """Collecte les statements exécutés dans le bloc (threads de l'exécuteur DB compris)."""
+    stats = QueryStats()
+    token = _current_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _current_stats.reset(token)
+
+
+# Observateurs globaux appelés pour chaque statement : fn(statement, duration_ms)
+_statement_observers: List[Callable[[str, float], None]] = []
+
+
+def add_statement_observer(observer: Callable[[str, float], None]) -> None:
+    """Abonne ``observer`` à tous les statements des engines instrumentés."""
+    if observer not in _statement_observers:
+        _statement_observers.append(observer)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    context._query_started_at = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = getattr(context, "_query_started_at", None)
+    if started is None:
+        return
+    duration_ms = (time.perf_counter() - started) * 1000
+    stats = _current_stats.get()
+    if stats is not None:
+        stats.record(statement, duration_ms)
+    for observer in _statement_observers:
+        observer(statement, duration_ms)
+
+
+def install_query_instrumentation(engine) -> None:
+    """Attache les listeners de comptage à ``engine`` (idempotent).
+
+    Pour un ``AsyncEngine``, passer ``async_engine.sync_engine``.
+    """
+    if event.contains(engine, "after_cursor_execute", _after_cursor_execute):
+        return
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+async def query_stats_middleware(request, call_next):
+    """Middleware HTTP : en-têtes ``X-DB-*`` et avertissement N+1 par requête."""
+    with track_queries() as stats:
+        response = await call_next(request)
+
+    summary = stats.summary()
+    response.headers["X-DB-Query-Count"] = str(summary["count"])
+    response.headers["X-DB-Query-Time-Ms"] = f"{summary['total_ms']:.1f}"
+    response.headers["X-DB-Duplicate-Queries"] = str(summary["duplicated_statements"])
+
+    top = summary["top_duplicate"]
+    if summary["count"] > settings.DB_QUERY_COUNT_WARNING:
+        logger.warning(
+            f"{request.method} {request.url.path} ran {summary['count']} SQL statements "
+            f"({summary['total_ms']:.1f}ms)"
+        )
+    if top is not None and top[1] >= settings.DB_DUPLICATE_QUERY_WARNING:
+        logger.warning(
+            f"Possible N+1 on {request.method} {request.url.path}: "
+            f"statement repeated {top[1]}x: {top[0][:300]}"
+        )
+    return response
+
+
+@contextmanager
+def assert_max_queries(max_count: int, engine=None) -> Iterator[QueryStats]:
+    """Échoue si le bloc exécute plus de ``max_count`` statements.
+
+    ``engine`` (défaut : engine principal de l'application) est instrumenté
+    à la volée si besoin.
+    """
+    if engine is None:
+        from app.core.database import engine as engine
+    install_query_instrumentation(engine)
+    with track_queries() as stats:
+        yield stats
+    if stats.count > max_count:
+        details = "\n".join(f"  {n}x {fp}" for fp, n in stats.fingerprints.most_common(10))
+        raise AssertionError(
+            f"Expected at most {max_count} SQL statements, got {stats.count}:\n{details}"
+        )
@@ -0,0 +1,144 @@
+"""
+Pool de connexions instrumenté
+==============================
+
+Sous-classes de ``QueuePool`` mesurant la latence de checkout (attente d'un slot
+libre + ouverture éventuelle de la connexion) et les timeouts du pool.
+
+Vérification de vie des connexions : au lieu de ``pool_pre_ping`` (un
+``SELECT 1`` à chaque checkout), seules les connexions inutilisées depuis plus
+de ``DB_POOL_PRE_PING_IDLE_SECONDS`` sont sondées. Un échec invalide tout le
+pool (les autres connexions ouvertes avant la coupure sont recyclées sans
+ping) et le checkout est retenté sur une connexion neuve.
+"""
+
+import logging
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from sqlalchemy import event, exc
+from sqlalchemy.pool import QueuePool, AsyncAdaptedQueuePool
+
+from app.core.metrics import LatencyWindow
+
+logger = logging.getLogger(__name__)
+
+
+class PoolMetrics:
+    """Compteurs de checkout d'un pool (primaire, réplica...)."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.checkout_latency = LatencyWindow()
+        self._lock = threading.Lock()
+        self.checkout_timeouts = 0
+        self.liveness = {
+            "pings": 0,
+            "ping_failures": 0,
+            "disconnects": 0,
+            "connections_opened": 0,
+        }
+
+    def record_timeout(self) -> None:
+        with self._lock:
+            self.checkout_timeouts += 1
+
+    def incr(self, counter: str) -> None:
+        with self._lock:
+            self.liveness[counter] += 1
+
+    def snapshot(self, pool: Optional[QueuePool] = None) -> Dict[str, Any]:
+        data = {
+            "name": self.name,
+            "checkout_latency": self.checkout_latency.snapshot(),
+            "checkout_timeouts": self.checkout_timeouts,
+            "liveness": dict(self.liveness),
+        }
+        if pool is not None:
+            data.update({
+                "size": pool.size(),
+                "checked_out": pool.checkedout(),
+                "overflow": pool.overflow(),
+                "checked_in": pool.checkedin(),
+            })
+        return data
+
+
+class _CheckoutTimingMixin:
+    """Time ``Pool.connect()``; metrics survive ``recreate()`` (engine dispose)."""
+
+    metrics: Optional[PoolMetrics] = None
+
+    def connect(self):
+        metrics = self.metrics
+        if metrics is None:
+            return super().connect()
+        started = time.perf_counter()
+        try:
+            return super().connect()
+        except exc.TimeoutError:
+            metrics.record_timeout()
+            raise
+        finally:
+            metrics.checkout_latency.add((time.perf_counter() - started) * 1000)
+
+    def recreate(self):
+        new_pool = super().recreate()
+        new_pool.metrics = self.metrics
+        return new_pool
+
+
+class InstrumentedQueuePool(_CheckoutTimingMixin, QueuePool):
+    pass
+
+
+class InstrumentedAsyncAdaptedQueuePool(_CheckoutTimingMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+def instrument_pool(engine, name: str) -> PoolMetrics:
+    """Attach a ``PoolMetrics`` to the engine's (instrumented) pool."""
+    metrics = PoolMetrics(name)
+    engine.pool.metrics = metrics
+    return metrics
+
+
+def install_liveness_checks(engine, metrics: PoolMetrics, idle_seconds: float) -> None:
+    """Ping only connections idle for more than ``idle_seconds`` on checkout.
+
+    Replaces ``pool_pre_ping``. ``idle_seconds=0`` pings on every checkout
+    (previous behaviour). Disconnects seen while executing statements are
+    counted too; SQLAlchemy already invalidates the pool for those.
+    """
+    dialect = engine.dialect
+
+    @event.listens_for(engine, "connect")
+    def _on_connect(dbapi_connection, connection_record):
+        connection_record.info["last_used"] = time.monotonic()
+        metrics.incr("connections_opened")
+
+    @event.listens_for(engine, "checkin")
+    def _on_checkin(dbapi_connection, connection_record):
+        if connection_record is not None:
+            connection_record.info["last_used"] = time.monotonic()
+
+    @event.listens_for(engine, "checkout")
+    def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+        last_used = connection_record.info.get("last_used")
+        if last_used is not None and time.monotonic() - last_used < idle_seconds:
+            return
+        metrics.incr("pings")
+        try:
+            dialect.do_ping(dbapi_connection)
+        except Exception as e:
+            metrics.incr("ping_failures")
+            logger.warning(f"Pool '{metrics.name}': stale connection on checkout ({e}), invalidating pool")
+            # Recycle every connection opened before now, then retry on a fresh one
+            raise exc.InvalidatePoolError() from e
+        connection_record.info["last_used"] = time.monotonic()
+
+    @event.listens_for(engine, "handle_error")
+    def _on_error(context):
+        if context.is_disconnect:
+            metrics.incr("disconnects")
@@ -0,0 +1,105 @@
+"""
+Santé du réplica de lecture
+===========================
+
+Le réplica (``DATABASE_READ_URL``) est sondé au plus une fois toutes les
+``DB_READ_HEALTH_CHECK_INTERVAL`` secondes ; entre deux sondes le dernier
+verdict est réutilisé. Le réplica est écarté (repli sur le primaire) lorsque :
+
+- la sonde échoue (connexion refusée, timeout...) ;
+- une requête applicative sur le réplica perd sa connexion ;
+- le retard de réplication dépasse ``DB_READ_MAX_LAG_SECONDS`` (si défini).
+"""
+
+import logging
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError, OperationalError
+
+logger = logging.getLogger(__name__)
+
+# Retard de rejeu en secondes. Quand tout le WAL reçu est rejoué, le réplica est
+# à jour même si le primaire n'a rien écrit récemment (timestamp ancien).
+REPLICA_LAG_SQL = text(
+    "SELECT CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+    "ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) END"
+)
+PING_SQL = text("SELECT 1")
+
+
+class ReplicaMonitor:
+    """Dernier état connu du réplica et compteurs de routage."""
+
+    def __init__(self, check_interval: float, max_lag_seconds: Optional[float] = None):
+        self.check_interval = check_interval
+        self.max_lag_seconds = max_lag_seconds
+        self._lock = threading.Lock()
+        self.healthy = True
+        self.lag_seconds: Optional[float] = None
+        self.last_error: Optional[str] = None
+        self.checked_at = 0.0
+        self.checks = 0
+        self.replica_sessions = 0
+        self.primary_fallbacks = 0
+
+    @property
+    def probe_sql(self):
+        return REPLICA_LAG_SQL if self.max_lag_seconds is not None else PING_SQL
+
+    def needs_check(self) -> bool:
+        return time.monotonic() - self.checked_at >= self.check_interval
+
+    def record_probe(self, value: Any = None, error: Optional[BaseException] = None) -> bool:
+        """Enregistre le résultat d'une sonde et retourne le nouveau verdict."""
+        with self._lock:
+            self.checks += 1
+            self.checked_at = time.monotonic()
+            if error is not None:
+                healthy, reason = False, f"{type(error).__name__}: {error}"
+                self.lag_seconds = None
+            elif self.max_lag_seconds is not None:
+                self.lag_seconds = float(value or 0)
+                healthy = self.lag_seconds <= self.max_lag_seconds
+                reason = None if healthy else f"replication lag {self.lag_seconds:.1f}s"
+            else:
+                healthy, reason = True, None
+            if healthy != self.healthy:
+                if healthy:
+                    logger.info("Read replica back in rotation")
+                else:
+                    logger.warning(f"Read replica removed from rotation: {reason}")
+            self.healthy, self.last_error = healthy, reason
+        return healthy
+
+    def mark_unhealthy(self, error: BaseException) -> None:
+        """Écarte le réplica jusqu'à la prochaine sonde (erreur de connexion en cours de requête)."""
+        self.record_probe(error=error)
+
+    def record_route(self, replica: bool) -> None:
+        with self._lock:
+            if replica:
+                self.replica_sessions += 1
+            else:
+                self.primary_fallbacks += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "healthy": self.healthy,
+                "lag_seconds": self.lag_seconds,
+                "max_lag_seconds": self.max_lag_seconds,
+                "last_error": self.last_error,
+                "checks": self.checks,
+                "replica_sessions": self.replica_sessions,
+                "primary_fallbacks": self.primary_fallbacks,
+            }
+
+
+def is_connection_error(error: BaseException) -> bool:
+    """Vrai si l'erreur indique un serveur injoignable plutôt qu'une requête invalide."""
+    if isinstance(error, OperationalError):
+        return True
+    return isinstance(error, DBAPIError) and bool(error.connection_invalidated)
@@ -0,0 +1,60 @@
+"""
+Métriques en mémoire
+====================
+
+Petits collecteurs thread-safe utilisés par la couche base de données
+et le cache (latences, percentiles).
+"""
+
+import threading
+from collections import deque
+from typing import Dict, List
+
+
+def _pick(sorted_samples: List[float], pct: float) -> float:
+    if not sorted_samples:
+        return 0.0
+    index = min(len(sorted_samples) - 1, max(0, int(round(pct / 100 * len(sorted_samples))) - 1))
+    return sorted_samples[index]
+
+
+class LatencyWindow:
+    """Sliding window of latency samples (milliseconds) with percentiles.
+
+    ``count``/``total``/``max`` cover every sample since creation; percentiles are
+    computed over the last ``size`` samples only, so memory stays bounded.
+    """
+
+    def __init__(self, size: int = 1024):
+        self._samples = deque(maxlen=size)
+        self._lock = threading.Lock()
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def add(self, value_ms: float) -> None:
+        with self._lock:
+            self._samples.append(value_ms)
+            self.count += 1
+            self.total_ms += value_ms
+            if value_ms > self.max_ms:
+                self.max_ms = value_ms
+
+    def percentile(self, pct: float) -> float:
+        with self._lock:
+            samples = sorted(self._samples)
+        return _pick(samples, pct)
+
+    def snapshot(self) -> Dict[str, float]:
+        with self._lock:
+            samples = sorted(self._samples)
+            count, total, peak = self.count, self.total_ms, self.max_ms
+
+        return {
+            "count": count,
+            "avg_ms": round(total / count, 3) if count else 0.0,
+            "max_ms": round(peak, 3),
+            "p50_ms": round(_pick(samples, 50), 3),
+            "p95_ms": round(_pick(samples, 95), 3),
+            "p99_ms": round(_pick(samples, 99), 3),
+        }
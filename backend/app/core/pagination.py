@@ -0,0 +1,280 @@
+"""
+Pagination par curseur (keyset)
+===============================
+
+``OFFSET (page-1)*page_size`` oblige la base à lire puis jeter toutes les
+lignes des pages précédentes : la page 500 coûte 500 fois la page 1. Un
+curseur reprend après la dernière ligne vue, sur les clés de tri :
+
+    WHERE (NotesVehicule, IdentifiantVehicule) < (:note, :id)
+    ORDER BY NotesVehicule DESC, IdentifiantVehicule DESC LIMIT :n + 1
+
+Le coût d'une page ne dépend plus de sa profondeur. Le curseur est opaque
+pour le client (valeurs des clés de la dernière ligne, JSON typé puis
+base64url) ; la ligne supplémentaire indique s'il existe une page suivante.
+
+Les endpoints acceptent ``cursor`` à côté de ``page`` ; le curseur suivant
+est renvoyé dans ``next_cursor`` et dans l'en-tête ``X-Next-Cursor``.
+
+Totaux
+------
+
+``SELECT count(*)`` sur la requête filtrée coûte souvent autant que la page
+elle-même. Le paramètre ``count`` choisit la stratégie (``CountStrategy``) :
+
+- ``exact``     : ``count(*)`` à chaque requête (défaut, comportement historique) ;
+- ``cached``    : ``count(*)`` mis en cache ``PAGINATION_COUNT_CACHE_TTL``
+  secondes par requête SQL et valeurs de filtres, partagé entre les pages ;
+- ``estimated`` : estimation du planificateur (``EXPLAIN``), exacte sous
+  ``PAGINATION_ESTIMATE_MIN_ROWS`` lignes où le vrai compte est bon marché ;
+- ``none``      : pas de total ; ``has_more`` (une ligne lue en plus) suffit
+  aux listes infinies.
+"""
+
+import base64
+import binascii
+import json
+import logging
+from dataclasses import dataclass
+from datetime import datetime
+from enum import Enum
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Tuple
+
+from fastapi import HTTPException, Response, status
+from sqlalchemy import and_, bindparam, func, literal, or_, select, text, tuple_
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import QueryableAttribute
+
+from app.core.cache import cache_get_or_set, make_cache_key
+from app.core.cache_serializers import get_serializer
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+# Remplaçant des dates NULL : après toutes les dates réelles en tri décroissant
+NULL_DATETIME = datetime(1970, 1, 1)
+
+_serializer = get_serializer("json")
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """Valeurs des clés de tri -> curseur opaque (types Decimal/datetime conservés)."""
+    return base64.urlsafe_b64encode(_serializer.dumps(list(values))).rstrip(b"=").decode()
+
+
+def decode_cursor(cursor: str, size: Optional[int] = None) -> List[Any]:
+    """Curseur -> ``size`` valeurs (longueur libre si ``None``) ; 400 si le curseur est illisible."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = _serializer.loads(raw)
+    except (binascii.Error, ValueError, ArithmeticError, TypeError):
+        values = None
+    if not isinstance(values, list) or (size is not None and len(values) != size):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Curseur de pagination invalide")
+    return values
+
+
+@dataclass(frozen=True)
+class SortKey:
+    """Clé de tri : colonne mappée, sens, et remplaçant des NULL (``COALESCE``).
+
+    ``null_as`` est une constante ou une autre colonne mappée de la ligne.
+    Obligatoire pour une colonne nullable : ``(NULL, id) < (...)`` vaut NULL
+    et la reprise après une ligne NULL renverrait une page vide.
+    """
+
+    column: Any
+    descending: bool = True
+    null_as: Any = None
+
+    @property
+    def expression(self):
+        if self.null_as is None:
+            return self.column
+        return func.coalesce(self.column, self.null_as)
+
+    def value(self, row) -> Any:
+        value = getattr(row, self.column.key)
+        if value is not None:
+            return value
+        if isinstance(self.null_as, QueryableAttribute):
+            return getattr(row, self.null_as.key)
+        return self.null_as
+
+
+class Keyset:
+    """Ordre total (la dernière clé doit être unique, en général l'identifiant)."""
+
+    def __init__(self, *keys: SortKey):
+        self.keys = keys
+
+    def order_by(self) -> list:
+        return [k.expression.desc() if k.descending else k.expression.asc() for k in self.keys]
+
+    def after(self, values: Sequence[Any]):
+        """Condition « strictement après ``values`` » (valeurs ou ``bindparam``)."""
+        directions = {k.descending for k in self.keys}
+        if len(directions) == 1:
+            # Comparaison de lignes : une seule condition, utilisable par un index composite
+            left = tuple_(*(k.expression for k in self.keys))
+            right = tuple_(*values)
+            return left < right if self.keys[0].descending else left > right
+
+        clauses = []
+        for i, key in enumerate(self.keys):
+            equal = [self.keys[j].expression == values[j] for j in range(i)]
+            beyond = key.expression < values[i] if key.descending else key.expression > values[i]
+            clauses.append(and_(*equal, beyond))
+        return or_(*clauses)
+
+    def bindparams(self, prefix: str = "cursor") -> list:
+        """Paramètres typés ``prefix_0..n`` pour un statement réutilisable (voir ``bind_values``)."""
+        return [bindparam(f"{prefix}_{i}", type_=k.column.type) for i, k in enumerate(self.keys)]
+
+    def bind_values(self, cursor: str, prefix: str = "cursor") -> dict:
+        return self.bind(self.decode(cursor), prefix)
+
+    def bind(self, values: Sequence[Any], prefix: str = "cursor") -> dict:
+        return {f"{prefix}_{i}": value for i, value in enumerate(values)}
+
+    def apply(self, query, cursor: Optional[str], limit: int):
+        """Ajoute reprise, tri et ``LIMIT limit + 1`` à ``query``."""
+        if cursor:
+            values = self.decode(cursor)
+            query = query.where(self.after([
+                literal(value, type_=key.column.type) for key, value in zip(self.keys, values)
+            ]))
+        return query.order_by(*self.order_by()).limit(limit + 1)
+
+    def decode(self, cursor: str) -> List[Any]:
+        return decode_cursor(cursor, len(self.keys))
+
+    def values(self, row) -> List[Any]:
+        return [k.value(row) for k in self.keys]
+
+    def cursor_for(self, row) -> str:
+        return encode_cursor(self.values(row))
+
+    def page(self, rows: Sequence[Any], limit: int) -> Tuple[List[Any], Optional[str]]:
+        """(lignes de la page, curseur suivant ou ``None``) depuis ``limit + 1`` lignes."""
+        rows = list(rows)
+        if len(rows) <= limit:
+            return rows, None
+        rows = rows[:limit]
+        return rows, self.cursor_for(rows[-1])
+
+
+async def fetch_page(db, query, keyset: Keyset, *, page: int, page_size: int, cursor: Optional[str] = None):
+    """(objets de la page, curseur suivant) — reprise par curseur, sinon ``OFFSET``.
+
+    Dans les deux modes une ligne de plus est lue : le curseur suivant n'est
+    renvoyé que s'il reste des lignes, et un client peut passer au curseur
+    après une page numérotée.
+    """
+    if cursor is not None:
+        query = keyset.apply(query, cursor, page_size)
+    else:
+        query = query.order_by(*keyset.order_by()).offset((page - 1) * page_size).limit(page_size + 1)
+    result = await db.execute(query)
+    return keyset.page(result.scalars().all(), page_size)
+
+
+async def fetch_offset_page(db, query, *, page: int, page_size: int) -> Tuple[List[Any], bool]:
+    """(objets de la page, ``has_more``) par ``OFFSET``, une ligne lue en plus."""
+    result = await db.execute(query.offset((page - 1) * page_size).limit(page_size + 1))
+    rows = list(result.scalars().all())
+    return rows[:page_size], len(rows) > page_size
+
+
+# ============================================================
+# TOTAUX
+# ============================================================
+
+class CountStrategy(str, Enum):
+    EXACT = "exact"
+    CACHED = "cached"
+    ESTIMATED = "estimated"
+    NONE = "none"
+
+
+_PG_DIALECT = postgresql.dialect()
+# Paramètres ``:nom`` : ceux que ``text()`` reconnaît pour EXPLAIN
+_EXPLAIN_DIALECT = postgresql.dialect(paramstyle="named")
+
+
+def count_statement(query):
+    return select(func.count()).select_from(query.order_by(None).subquery())
+
+
+async def estimate_rows(db, query, params: Optional[Dict[str, Any]] = None) -> Optional[int]:
+    """Nombre de lignes estimé par le planificateur ; ``None`` si indisponible."""
+    if params:
+        query = query.params(**params)
+    try:
+        # Valeurs liées, jamais rendues dans le SQL ; listes ``IN`` dépliées
+        compiled = query.order_by(None).compile(
+            dialect=_EXPLAIN_DIALECT, compile_kwargs={"render_postcompile": True}
+        )
+        binds = [
+            bindparam(name, value, type_=compiled.binds[name].type) if name in compiled.binds
+            else bindparam(name, value)
+            for name, value in compiled.params.items()
+        ]
+        explain = text("EXPLAIN (FORMAT JSON) " + str(compiled)).bindparams(*binds)
+
+        def run_explain(session):
+            # Savepoint : un échec n'interrompt pas la transaction (PostgreSQL
+            # refuserait ensuite le count(*) de repli et toute la requête)
+            with session.begin_nested():
+                return session.scalar(explain)
+
+        plan = await db.run_sync(run_explain)
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]["Plan"]["Plan Rows"])
+    except Exception as e:
+        logger.debug(f"Row estimate unavailable, using exact count: {e}")
+        return None
+
+
+async def count_rows(
+    db,
+    query,
+    strategy: CountStrategy = CountStrategy.EXACT,
+    *,
+    params: Optional[Dict[str, Any]] = None,
+    tags: Sequence[str] = (),
+    exact: Optional[Callable[[], Awaitable[int]]] = None,
+) -> Optional[int]:
+    """Total de ``query`` (requête de la page, sans pagination) selon ``strategy``.
+
+    ``exact`` remplace le ``count(*)`` par défaut (statement déjà préparé) ;
+    ``tags`` invalident les totaux mis en cache avec les données listées.
+    """
+    if strategy == CountStrategy.NONE:
+        return None
+
+    async def exact_count() -> int:
+        if exact is not None:
+            return await exact()
+        return await db.scalar(count_statement(query), params) or 0
+
+    if strategy == CountStrategy.ESTIMATED:
+        estimate = await estimate_rows(db, query, params)
+        if estimate is not None and estimate >= settings.PAGINATION_ESTIMATE_MIN_ROWS:
+            return estimate
+        return await exact_count()
+
+    if strategy == CountStrategy.CACHED:
+        compiled = query.compile(dialect=_PG_DIALECT)
+        key = make_cache_key("pagination_count", sql=str(compiled), bound=compiled.params, params=params)
+        return await cache_get_or_set(key, exact_count, settings.PAGINATION_COUNT_CACHE_TTL, tags=tags)
+
+    return await exact_count()
+
+
+def set_next_cursor(response: Response, next_cursor: Optional[str]) -> None:
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
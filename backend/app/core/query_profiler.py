@@ -0,0 +1,147 @@
+"""
+Profiler SQL
+============
+
+Agrège la latence de chaque statement par empreinte SQL (littéraux et
+paramètres retirés) : nombre d'exécutions, temps total, p50/p95/p99. Les
+statements plus lents que ``DB_SLOW_QUERY_MS`` sont loggés avec la route
+HTTP qui les a déclenchés et conservés dans un petit historique.
+
+Activation : ``DB_QUERY_PROFILER_ENABLED=true`` (désactivé par défaut : une
+empreinte par statement et un middleware par requête HTTP). Alimenté par les
+listeners de ``db_instrumentation`` ; consultable via
+``GET /api/v1/admin/performance/queries``.
+"""
+
+import logging
+import threading
+import time
+from collections import deque
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional
+
+from app.core.config import settings
+from app.core.db_instrumentation import add_statement_observer, fingerprint_sql
+from app.core.metrics import LatencyWindow
+
+logger = logging.getLogger(__name__)
+
+OTHER_FINGERPRINT = "(other statements)"
+
+_current_scope: ContextVar[Optional[dict]] = ContextVar("db_profiler_scope", default=None)
+
+
+def current_route() -> Optional[str]:
+    """Route de la requête HTTP en cours (gabarit ``/vehicles/{vehicle_id}`` si résolu)."""
+    scope = _current_scope.get()
+    if scope is None:
+        return None
+    route = scope.get("route")
+    path = getattr(route, "path", None) or scope.get("path", "")
+    return f"{scope.get('method', '')} {path}".strip()
+
+
+class RouteContextMiddleware:
+    """Middleware ASGI minimal exposant la requête courante au profiler.
+
+    Le scope est partagé avec le routeur : la route résolue y est visible
+    au moment où les statements s'exécutent.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        token = _current_scope.set(scope)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            _current_scope.reset(token)
+
+
+class _FingerprintStats:
+    __slots__ = ("latency", "routes")
+
+    def __init__(self):
+        self.latency = LatencyWindow(size=256)
+        self.routes: Dict[str, int] = {}
+
+
+class QueryProfiler:
+    """Latences par empreinte SQL, nombre d'empreintes borné."""
+
+    def __init__(self, slow_query_ms: float, max_fingerprints: int, slow_log_size: int = 100):
+        self.slow_query_ms = slow_query_ms
+        self.max_fingerprints = max_fingerprints
+        self._lock = threading.Lock()
+        self._stats: Dict[str, _FingerprintStats] = {}
+        self.slow_queries = deque(maxlen=slow_log_size)
+        self.started_at = time.time()
+
+    def _entry(self, fingerprint: str) -> _FingerprintStats:
+        entry = self._stats.get(fingerprint)
+        if entry is None:
+            with self._lock:
+                entry = self._stats.get(fingerprint)
+                if entry is None:
+                    if len(self._stats) >= self.max_fingerprints:
+                        fingerprint = OTHER_FINGERPRINT
+                    entry = self._stats.setdefault(fingerprint, _FingerprintStats())
+        return entry
+
+    def observe(self, statement: str, duration_ms: float) -> None:
+        fingerprint = fingerprint_sql(statement)
+        entry = self._entry(fingerprint)
+        entry.latency.add(duration_ms)
+        route = current_route()
+        if route is not None:
+            with self._lock:
+                if route in entry.routes or len(entry.routes) < 10:
+                    entry.routes[route] = entry.routes.get(route, 0) + 1
+
+        if duration_ms >= self.slow_query_ms:
+            self.slow_queries.append({
+                "at": time.time(),
+                "duration_ms": round(duration_ms, 3),
+                "route": route,
+                "fingerprint": fingerprint,
+            })
+            logger.warning(
+                f"Slow query ({duration_ms:.0f}ms) on {route or 'background task'}: "
+                f"{fingerprint[:500]}"
+            )
+
+    def snapshot(self, sort: str = "total", limit: int = 50) -> List[Dict[str, Any]]:
+        """Empreintes triées par ``total`` (temps cumulé), ``p95``, ``count`` ou ``max``."""
+        with self._lock:
+            items = list(self._stats.items())
+            routes = {fp: dict(entry.routes) for fp, entry in items}
+
+        rows = []
+        for fingerprint, entry in items:
+            row = {"fingerprint": fingerprint}
+            row.update(entry.latency.snapshot())
+            row["total_ms"] = round(entry.latency.total_ms, 3)
+            row["routes"] = sorted(routes[fingerprint], key=routes[fingerprint].get, reverse=True)
+            rows.append(row)
+
+        sort_key = {"total": "total_ms", "p95": "p95_ms", "count": "count", "max": "max_ms"}[sort]
+        rows.sort(key=lambda row: row[sort_key], reverse=True)
+        return rows[:limit]
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stats.clear()
+            self.slow_queries.clear()
+            self.started_at = time.time()
+
+
+query_profiler = QueryProfiler(
+    slow_query_ms=settings.DB_SLOW_QUERY_MS,
+    max_fingerprints=settings.DB_QUERY_PROFILER_MAX_FINGERPRINTS,
+)
+
+if settings.DB_QUERY_PROFILER_ENABLED:
+    add_statement_observer(query_profiler.observe)
@@ -13,33 +13,21 @@ import uuid
 from datetime import datetime, timedelta
 from typing import Optional, Dict, Any
 from fastapi import HTTPException, status
-from redis import Redis
 
 from app.core.config import settings
+from app.core.cache import get_redis, redis_breaker, report_redis_error
 
 
 # ============================================================
 # REDIS CLIENT (lazy init — avoids crash if Redis is down at startup)
 # ============================================================
 
-_redis_client: Optional[Redis] = None
+async def _get_redis():
+    """Return the pooled asyncio Redis client shared with the cache layer.
 
-
-def _get_redis() -> Optional[Redis]:
-    """Return a Redis client, creating it lazily on first call."""
-    global _redis_client
-    if _redis_client is None:
-        try:
-            _redis_client = Redis.from_url(
-                settings.REDIS_URL,
-                decode_responses=True,
-                socket_connect_timeout=5,
-            )
-            _redis_client.ping()
-        except Exception as e:
-            print(f"[WARNING] Redis connection failed: {e}")
-            _redis_client = None
-    return _redis_client
+    None while Redis is down (circuit breaker open): callers fall back immediately.
+    """
+    return await get_redis()
 
 
 # ============================================================
@@ -177,7 +165,7 @@ def decode_token(token: str) -> Dict[str, Any]:
 # TOKEN BLACKLIST
 # ============================================================
 
-def add_token_to_blacklist(
+async def add_token_to_blacklist(
     jti: str,
     user_id: int,
     token_type: str,
@@ -220,24 +208,26 @@ def add_token_to_blacklist(
         }
         
         # Stocker dans Redis avec TTL
-        client = _get_redis()
+        client = await _get_redis()
         if client is None:
             return False
-        client.setex(
+        await client.setex(
             key,
             ttl_seconds,
             str(value)
         )
+        redis_breaker.record_success()
         
         return True
         
     except Exception as e:
+        report_redis_error(e)
         print(f"[ERROR] Blacklist Redis failed: {e}")
         # En cas d'échec Redis, on continue (fallback sur DB)
         return False
 
 
-def is_token_blacklisted(jti: str) -> bool:
+async def is_token_blacklisted(jti: str) -> bool:
     """
     Vérifie si un token est dans la blacklist.
     
@@ -248,19 +238,22 @@ def is_token_blacklisted(jti: str) -> bool:
         True si le token est blacklisté
     """
     try:
-        client = _get_redis()
+        client = await _get_redis()
         if client is None:
             return False
         key = f"blacklist:{jti}"
-        return client.exists(key) > 0
+        blacklisted = await client.exists(key) > 0
+        redis_breaker.record_success()
+        return blacklisted
     except Exception as e:
+        report_redis_error(e)
         print(f"[ERROR] Blacklist check failed: {e}")
         # En cas d'échec Redis, on suppose que le token est valide
         # (le middleware vérifiera la DB en fallback)
         return False
 
 
-def remove_token_from_blacklist(jti: str) -> bool:
+async def remove_token_from_blacklist(jti: str) -> bool:
     """
     Retire un token de la blacklist (usage rare, surtout pour tests).
     
@@ -271,13 +264,15 @@ def remove_token_from_blacklist(jti: str) -> bool:
         True si succès
     """
     try:
-        client = _get_redis()
+        client = await _get_redis()
         if client is None:
             return False
         key = f"blacklist:{jti}"
-        client.delete(key)
+        await client.delete(key)
+        redis_breaker.record_success()
         return True
-    except Exception:
+    except Exception as e:
+        report_redis_error(e)
         return False
 
 
@@ -285,7 +280,7 @@ def remove_token_from_blacklist(jti: str) -> bool:
 # TOKEN VALIDATION MIDDLEWARE
 # ============================================================
 
-def validate_token_not_blacklisted(token: str) -> Dict[str, Any]:
+async def validate_token_not_blacklisted(token: str) -> Dict[str, Any]:
     """
     Valide un token et vérifie qu'il n'est pas blacklisté.
     
@@ -309,7 +304,7 @@ def validate_token_not_blacklisted(token: str) -> Dict[str, Any]:
             detail="Token invalide (pas de JTI)"
         )
     
-    if is_token_blacklisted(jti):
+    if await is_token_blacklisted(jti):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Token révoqué (déconnexion effectuée)"
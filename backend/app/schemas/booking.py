@@ -150,9 +150,11 @@ class BookingDetailResponse(BookingResponse):
 
 class BookingListResponse(BaseModel):
     bookings: List[BookingResponse]
-    total: int
+    total: Optional[int] = None  # absent avec count=none
     page: int
     page_size: int
+    has_more: bool = False
+    next_cursor: Optional[str] = None
 
 
 class BookingExtensionRequest(BaseModel):
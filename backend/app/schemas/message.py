@@ -61,6 +61,8 @@ class ConversationResponse(BaseModel):
 
 class ConversationListResponse(BaseModel):
     conversations: List[ConversationResponse]
-    total: int
+    total: Optional[int] = None  # absent avec count=none
     page: int
     page_size: int
+    has_more: bool = False
+    next_cursor: Optional[str] = None
@@ -51,10 +51,11 @@ class NotificationListResponse(BaseModel):
     """Réponse pour une liste de notifications"""
     
     notifications: List[NotificationResponse]
-    total: int
+    total: Optional[int] = None  # absent avec count=none
     unread_count: int
     page: int
     page_size: int
+    has_more: bool = False
 
 
 class NotificationPreferenceUpdate(BaseModel):
@@ -42,9 +42,10 @@ class PaymentResponse(BaseModel):
 
 class PaymentListResponse(BaseModel):
     payments: List[PaymentResponse]
-    total: int
+    total: Optional[int] = None  # absent avec count=none
     page: int
     page_size: int
+    has_more: bool = False
 
 
 class PaymentMethodResponse(BaseModel):
@@ -41,6 +41,7 @@ class ReviewResponse(BaseModel):
 
 class ReviewListResponse(BaseModel):
     reviews: List[ReviewResponse]
-    total: int
+    total: Optional[int] = None  # absent avec count=none
     page: int
     page_size: int
+    has_more: bool = False
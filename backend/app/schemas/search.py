@@ -9,7 +9,7 @@ from typing import Optional, List
 
 class SearchSuggestion(BaseModel):
     text: str
-    type: str  # brand, model, city
+    type: str  # brand, model, category, city, title
     count: int = 0
 
 
@@ -70,9 +70,10 @@ class UserResponse(BaseModel):
 
 class UserListResponse(BaseModel):
     users: List[UserResponse]
-    total: int
+    total: Optional[int] = None  # absent avec count=none
     page: int
     page_size: int
+    has_more: bool = False
 
 
 class UserStatsResponse(BaseModel):
@@ -201,9 +201,11 @@ class VehicleDetailResponse(VehicleResponse):
 
 class VehicleListResponse(BaseModel):
     vehicles: List[VehicleResponse]
-    total: int
+    total: Optional[int] = None  # absent avec count=none
     page: int
     page_size: int
+    has_more: bool = False
+    next_cursor: Optional[str] = None
 
 
 class VehicleSearchFilters(BaseModel):
@@ -0,0 +1,146 @@
+"""
+Service de statistiques du cache
+================================
+
+Persiste les compteurs de ``cache_metrics`` dans ``CacheStatistique`` (une
+ligne par type de cache, par worker et par période de
+``CACHE_STATS_FLUSH_INTERVAL`` secondes) et agrège ces lignes pour
+``GET /api/v1/admin/performance/cache/effectiveness``.
+"""
+
+import asyncio
+import logging
+from datetime import datetime, timedelta
+from decimal import Decimal
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import func, select
+
+from app.core.cache_metrics import cache_metrics
+from app.core.config import settings
+from app.core.database import session_scope
+from app.models.search import CacheStatistique
+
+logger = logging.getLogger(__name__)
+
+
+def _decimal(value: Optional[float]) -> Optional[Decimal]:
+    return Decimal(str(round(value, 4))) if value is not None else None
+
+
+class CacheStatsService:
+    """Écriture et agrégation des statistiques de cache."""
+
+    def __init__(self, db):
+        self.db = db
+
+    async def flush(self) -> int:
+        """Écrit la période écoulée (types ayant reçu des requêtes) ; retourne le nombre de lignes."""
+        start, end, types = cache_metrics.drain()
+        period = f"{settings.CACHE_STATS_FLUSH_INTERVAL}s"
+        rows = 0
+        for cache_type, counters in types.items():
+            stats = counters.as_dict()
+            if not stats["requests"]:
+                continue
+            await self.db.add(CacheStatistique(
+                TypeCache=cache_type[:50],
+                Periode=period,
+                RequetesTotal=stats["requests"],
+                RequetesCache=stats["hits"],
+                RequetesMiss=stats["misses"],
+                TauxReussite=round(stats["hit_ratio"] * 100, 2),
+                TempsMoyenSansCache=_decimal(stats["avg_load_ms"]),
+                TempsMoyenAvecCache=_decimal(stats["avg_hit_ms"]),
+                GainPerformance=_decimal(stats["time_saved_ms"]),
+                DateDebut=datetime.utcfromtimestamp(start),
+                DateFin=datetime.utcfromtimestamp(end),
+            ))
+            rows += 1
+        if rows:
+            await self.db.commit()
+        return rows
+
+    async def effectiveness(self, hours: int = 24) -> List[Dict[str, Any]]:
+        """Taux de hit et temps gagné par type de cache sur les ``hours`` dernières heures."""
+        since = datetime.utcnow() - timedelta(hours=hours)
+        result = await self.db.execute(
+            select(
+                CacheStatistique.TypeCache,
+                func.sum(CacheStatistique.RequetesTotal),
+                func.sum(CacheStatistique.RequetesCache),
+                func.sum(CacheStatistique.RequetesMiss),
+                # moyennes pondérées par le nombre de hits / misses de chaque période
+                func.sum(CacheStatistique.TempsMoyenAvecCache * CacheStatistique.RequetesCache),
+                func.sum(CacheStatistique.TempsMoyenSansCache * CacheStatistique.RequetesMiss),
+                func.sum(CacheStatistique.RequetesMiss).filter(
+                    CacheStatistique.TempsMoyenSansCache.isnot(None)
+                ),
+                func.sum(CacheStatistique.GainPerformance),
+            )
+            .where(CacheStatistique.DateFin >= since)
+            .group_by(CacheStatistique.TypeCache)
+        )
+
+        rows = []
+        for cache_type, total, hits, misses, hit_ms, load_ms, timed_misses, saved in result.all():
+            total, hits, misses = int(total or 0), int(hits or 0), int(misses or 0)
+            rows.append({
+                "type": cache_type,
+                "requests": total,
+                "hits": hits,
+                "misses": misses,
+                "hit_ratio": round(hits / total, 4) if total else None,
+                "avg_hit_ms": round(float(hit_ms) / hits, 4) if hit_ms is not None and hits else None,
+                "avg_load_ms": (
+                    round(float(load_ms) / int(timed_misses), 4)
+                    if load_ms is not None and timed_misses else None
+                ),
+                "time_saved_ms": round(float(saved), 3) if saved is not None else None,
+            })
+        rows.sort(key=lambda row: row["time_saved_ms"] or 0, reverse=True)
+        return rows
+
+
+# ============================================================
+# FLUSH PÉRIODIQUE
+# ============================================================
+
+_flush_task: Optional[asyncio.Task] = None
+
+
+async def _flush_periodically() -> None:
+    while True:
+        await asyncio.sleep(settings.CACHE_STATS_FLUSH_INTERVAL)
+        try:
+            async with session_scope() as db:
+                await CacheStatsService(db).flush()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning(f"Cache statistics flush failed: {e}")
+
+
+def start_cache_stats_flusher() -> None:
+    """Lance l'écriture périodique des statistiques (démarrage de l'application)."""
+    global _flush_task
+    if settings.CACHE_STATS_FLUSH_INTERVAL > 0 and (_flush_task is None or _flush_task.done()):
+        _flush_task = asyncio.create_task(_flush_periodically())
+
+
+async def stop_cache_stats_flusher() -> None:
+    """Arrête la tâche et écrit la période en cours (arrêt de l'application)."""
+    global _flush_task
+    task, _flush_task = _flush_task, None
+    if task is None:
+        return
+    task.cancel()
+    try:
+        await task
+    except asyncio.CancelledError:
+        pass
+    try:
+        async with session_scope() as db:
+            await CacheStatsService(db).flush()
+    except Exception as e:
+        logger.warning(f"Final cache statistics flush failed: {e}")
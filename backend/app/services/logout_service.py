@@ -55,7 +55,7 @@ class LogoutService:
         refresh_exp = datetime.fromtimestamp(refresh_payload.get("exp"))
         
         # 2. Ajouter les tokens à la blacklist Redis
-        add_token_to_blacklist(
+        await add_token_to_blacklist(
             jti=access_jti,
             user_id=user_id,
             token_type="access",
@@ -64,7 +64,7 @@ class LogoutService:
             ip_address=ip_address
         )
         
-        add_token_to_blacklist(
+        await add_token_to_blacklist(
             jti=refresh_jti,
             user_id=user_id,
             token_type="refresh",
@@ -163,7 +163,7 @@ class LogoutService:
         # 2. Pour chaque session, blacklist les tokens
         for session in sessions:
             # Access token
-            add_token_to_blacklist(
+            await add_token_to_blacklist(
                 jti=session.AccessTokenJTI,
                 user_id=user_id,
                 token_type="access",
@@ -183,7 +183,7 @@ class LogoutService:
             )
             
             # Refresh token
-            add_token_to_blacklist(
+            await add_token_to_blacklist(
                 jti=session.RefreshTokenJTI,
                 user_id=user_id,
                 token_type="refresh",
@@ -275,7 +275,7 @@ class LogoutService:
             )
         
         # 2. Blacklist les tokens
-        add_token_to_blacklist(
+        await add_token_to_blacklist(
             jti=session.AccessTokenJTI,
             user_id=user_id,
             token_type="access",
@@ -284,7 +284,7 @@ class LogoutService:
             ip_address=ip_address
         )
         
-        add_token_to_blacklist(
+        await add_token_to_blacklist(
             jti=session.RefreshTokenJTI,
             user_id=user_id,
             token_type="refresh",
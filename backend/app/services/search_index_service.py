@@ -0,0 +1,473 @@
+"""
+Index de recherche plein texte du catalogue
+===========================================
+
+``ILIKE '%q%'`` ne peut utiliser aucun index : chaque recherche parcourait
+toute la table ``Vehicules``. Ce module maintient en mémoire un index inversé
+sur ``TitreAnnonce``, la marque et le modèle, ``LocalisationVille`` et
+``DescriptionVehicule`` :
+
+- normalisation : minuscules, accents retirés (``Yaoundé`` -> ``yaounde``),
+  ligatures dépliées, mots vides français ignorés, pluriel simple retiré ;
+- pertinence BM25 avec un poids par champ (titre > ville > description) ;
+- tous les mots de la requête doivent correspondre, le dernier en préfixe
+  (saisie en cours : ``toyo`` trouve ``toyota``).
+
+Il porte aussi l'index d'autocomplétion (``SuggestionIndex``) : marques,
+modèles, catégories, villes et titres, chacun avec son nombre de véhicules
+actifs, dans un tableau trié interrogé par ``bisect``. ``GET
+/search/suggestions`` répond ainsi sans toucher la base. Les préfixes d'une
+ou deux lettres couvrent une grande partie du tableau : leur classement est
+calculé une fois puis gardé jusqu'au prochain changement de comptes.
+
+L'index est construit au démarrage (préchauffeur ``search_index``), mis à
+jour véhicule par véhicule après chaque écriture (``VehicleCatalogService.
+invalidate_caches``), propagé aux autres workers par le canal pub/sub du
+cache et reconstruit toutes les ``SEARCH_INDEX_REBUILD_INTERVAL`` secondes.
+Tant qu'il n'est pas prêt, le catalogue retombe sur ``ILIKE``.
+"""
+
+import asyncio
+import bisect
+import logging
+import math
+import re
+import time
+import unicodedata
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from sqlalchemy import select
+
+from app.core.cache import on_invalidation, publish_invalidation
+from app.core.cache_warmup import cache_warmer
+from app.core.config import settings
+from app.core.database import session_scope
+from app.models.vehicle import Vehicule
+from app.models.vehicle_category import CategorieVehicule, MarqueVehicule, ModeleVehicule
+
+logger = logging.getLogger(__name__)
+
+FIELD_WEIGHTS = {"title": 3.0, "brand": 3.0, "model": 3.0, "city": 2.0, "description": 1.0}
+
+FRENCH_STOPWORDS = frozenset("""
+    a au aux avec c ce ces cet cette d dans de des du elle en est et il ils j je
+    l la le les leur lui m ma mais me mes mon n ne nos notre nous on ou par pas
+    pour qu que qui s sa se ses son sur t ta te tes ton tres tu un une vos votre
+    vous y plus sans sous chez tout tous toute toutes
+""".split())
+
+_WORD = re.compile(r"[a-z0-9]+")
+_LIGATURES = str.maketrans({"œ": "oe", "æ": "ae", "ß": "ss"})
+
+# Paramètres BM25 (saturation de la fréquence) ; pas de normalisation de longueur
+_K1 = 1.2
+_MAX_PREFIX_EXPANSIONS = 50
+# Préfixes courts dont le classement est mémorisé, et taille de ce classement
+# (limite maximale de ``GET /search/suggestions``)
+_SHORT_PREFIX = 2
+_SHORT_PREFIX_TOP = 20
+
+# Ordre d'affichage des suggestions à nombre de véhicules égal
+SUGGESTION_TYPES = ("brand", "model", "category", "city", "title")
+
+SEARCH_INDEX_OP = "search_index"
+
+
+def fold(text: str) -> str:
+    """Minuscules sans accents ni ligatures."""
+    text = text.lower().translate(_LIGATURES)
+    return "".join(c for c in unicodedata.normalize("NFKD", text) if not unicodedata.combining(c))
+
+
+def _stem(token: str) -> str:
+    # Pluriel régulier seulement : voitures -> voiture, chevaux reste tel quel
+    if len(token) > 3 and token.endswith("s") and not token.endswith("ss"):
+        return token[:-1]
+    return token
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    """Termes indexables de ``text`` (mots vides et lettres isolées retirés)."""
+    if not text:
+        return []
+    return [
+        _stem(token) for token in _WORD.findall(fold(text))
+        if token not in FRENCH_STOPWORDS and (len(token) > 1 or token.isdigit())
+    ]
+
+
+class VehicleDocument(NamedTuple):
+    """Champs d'un véhicule utiles à la recherche et aux suggestions."""
+
+    id: int
+    title: Optional[str] = None
+    description: Optional[str] = None
+    city: Optional[str] = None
+    brand: Optional[str] = None
+    model: Optional[str] = None
+    category: Optional[str] = None
+    active: Optional[bool] = True
+
+
+def _postings_for(doc: VehicleDocument) -> Dict[str, float]:
+    """Fréquence pondérée de chaque terme d'un document."""
+    weights: Dict[str, float] = {}
+    for field, weight in FIELD_WEIGHTS.items():
+        for token in tokenize(getattr(doc, field)):
+            weights[token] = weights.get(token, 0.0) + weight
+    return weights
+
+
+def _clean(text: Optional[str]) -> Optional[str]:
+    text = " ".join(text.split()) if text else None
+    return text or None
+
+
+def _suggestion_entries(doc: VehicleDocument) -> Tuple[Tuple[str, str], ...]:
+    """(type, texte) comptés pour ce véhicule ; aucun s'il est désactivé."""
+    if not doc.active:
+        return ()
+    brand, model = _clean(doc.brand), _clean(doc.model)
+    entries = [
+        ("brand", brand),
+        ("model", f"{brand} {model}" if brand and model else model),
+        ("category", _clean(doc.category)),
+        ("city", _clean(doc.city)),
+        ("title", _clean(doc.title)),
+    ]
+    return tuple(dict.fromkeys(entry for entry in entries if entry[1]))
+
+
+def _suggestion_keys(text: str) -> List[str]:
+    """Texte plié à partir de chaque début de mot (``corolla`` trouve ``Toyota Corolla``)."""
+    words = _WORD.findall(fold(text))
+    return [" ".join(words[i:]) for i in range(len(words))]
+
+
+class SuggestionIndex:
+    """Entrées d'autocomplétion et nombre de véhicules actifs de chacune."""
+
+    def __init__(self):
+        self._counts: Dict[Tuple[str, str], int] = {}
+        self._vehicles: Dict[int, Tuple[Tuple[str, str], ...]] = {}
+        # (clé pliée, type, texte) triés ; les entrées retombées à 0 restent
+        # jusqu'à la prochaine reconstruction et sont ignorées à la lecture
+        self._keys: List[Tuple[str, str, str]] = []
+        # Classements des préfixes courts, vidés à chaque changement de comptes
+        self._top: Dict[str, List[Dict[str, Any]]] = {}
+
+    def __len__(self) -> int:
+        return sum(1 for count in self._counts.values() if count > 0)
+
+    def set_vehicle(self, vehicle_id: int, entries: Tuple[Tuple[str, str], ...]) -> None:
+        self._top = {}
+        for entry in self._vehicles.pop(vehicle_id, ()):
+            self._counts[entry] -= 1
+        for entry in entries:
+            if entry not in self._counts:
+                self._counts[entry] = 0
+                for key in _suggestion_keys(entry[1]):
+                    bisect.insort(self._keys, (key, *entry))
+            self._counts[entry] += 1
+        if entries:
+            self._vehicles[vehicle_id] = entries
+
+    def replace_all(self, docs: Iterable[VehicleDocument]) -> None:
+        counts: Dict[Tuple[str, str], int] = {}
+        vehicles = {}
+        for doc in docs:
+            entries = _suggestion_entries(doc)
+            if entries:
+                vehicles[doc.id] = entries
+                for entry in entries:
+                    counts[entry] = counts.get(entry, 0) + 1
+        self._counts, self._vehicles, self._top = counts, vehicles, {}
+        self._keys = sorted((key, *entry) for entry in counts for key in _suggestion_keys(entry[1]))
+
+    def suggest(self, prefix: str, limit: int = 10) -> List[Dict[str, Any]]:
+        """``[{"text", "type", "count"}]`` commençant par ``prefix`` (début de mot), les plus fréquents d'abord."""
+        prefix = " ".join(_WORD.findall(fold(prefix)))
+        if not prefix:
+            return []
+        if len(prefix) > _SHORT_PREFIX or limit > _SHORT_PREFIX_TOP:
+            return self._rank(prefix, limit)
+        top = self._top.get(prefix)
+        if top is None:
+            top = self._top[prefix] = self._rank(prefix, _SHORT_PREFIX_TOP)
+        return [dict(suggestion) for suggestion in top[:limit]]
+
+    def _rank(self, prefix: str, limit: int) -> List[Dict[str, Any]]:
+        """Parcourt toutes les clés de ``prefix`` et garde les ``limit`` plus fréquentes."""
+        # Clés pliées en [a-z0-9 ] : « { » suit tout ce qui commence par ``prefix``
+        start = bisect.bisect_left(self._keys, (prefix,))
+        end = bisect.bisect_left(self._keys, (prefix + "{",), start)
+        found: Dict[Tuple[str, str], int] = {}
+        for key, kind, text in self._keys[start:end]:
+            count = self._counts.get((kind, text), 0)
+            if count > 0:
+                found[(kind, text)] = count
+        ranked = sorted(
+            found.items(),
+            key=lambda item: (-item[1], SUGGESTION_TYPES.index(item[0][0]), item[0][1]),
+        )
+        return [{"text": text, "type": kind, "count": count} for (kind, text), count in ranked[:limit]]
+
+
+class SearchIndex:
+    """Index inversé terme -> {véhicule: fréquence pondérée}."""
+
+    def __init__(self):
+        self._postings: Dict[str, Dict[int, float]] = {}
+        self._documents: Dict[int, Dict[str, float]] = {}
+        self._vocabulary: List[str] = []
+        self._vocabulary_dirty = False
+        self.suggestions = SuggestionIndex()
+        self.ready = False
+        self.built_at: Optional[float] = None
+        self.build_ms: Optional[float] = None
+        # Écritures reçues pendant une reconstruction : rejouées après l'échange
+        self._building = False
+        self._pending: Dict[int, Optional[VehicleDocument]] = {}
+
+    # ---------------------------------------------------------- mise à jour
+
+    def upsert(self, vehicle_id: int, *fields, **named) -> None:
+        """Indexe un véhicule (champs de ``VehicleDocument`` après l'identifiant)."""
+        doc = VehicleDocument(vehicle_id, *fields, **named)
+        if self._building:
+            self._pending[vehicle_id] = doc
+        self._apply(vehicle_id, doc)
+
+    def remove(self, vehicle_id: int) -> None:
+        if self._building:
+            self._pending[vehicle_id] = None
+        self._apply(vehicle_id, None)
+
+    def _apply(self, vehicle_id: int, doc: Optional[VehicleDocument]) -> None:
+        self.suggestions.set_vehicle(vehicle_id, _suggestion_entries(doc) if doc else ())
+        weights = _postings_for(doc) if doc else None
+        for token in self._documents.pop(vehicle_id, {}):
+            posting = self._postings.get(token)
+            if posting is not None:
+                posting.pop(vehicle_id, None)
+                if not posting:
+                    del self._postings[token]
+                    self._vocabulary_dirty = True
+        if weights:
+            self._documents[vehicle_id] = weights
+            for token, weight in weights.items():
+                posting = self._postings.get(token)
+                if posting is None:
+                    posting = self._postings[token] = {}
+                    self._vocabulary_dirty = True
+                posting[vehicle_id] = weight
+
+    def replace_all(self, rows: Iterable[tuple]) -> None:
+        """Reconstruit l'index depuis des tuples ``VehicleDocument`` (sans I/O)."""
+        docs = [VehicleDocument(*row) for row in rows]
+        postings: Dict[str, Dict[int, float]] = {}
+        documents: Dict[int, Dict[str, float]] = {}
+        for doc in docs:
+            weights = _postings_for(doc)
+            if not weights:
+                continue
+            documents[doc.id] = weights
+            for token, weight in weights.items():
+                postings.setdefault(token, {})[doc.id] = weight
+        self._postings, self._documents = postings, documents
+        self.suggestions.replace_all(docs)
+        self._vocabulary = sorted(postings)
+        self._vocabulary_dirty = False
+
+    # ---------------------------------------------------------- recherche
+
+    def _vocab(self) -> List[str]:
+        if self._vocabulary_dirty:
+            self._vocabulary = sorted(self._postings)
+            self._vocabulary_dirty = False
+        return self._vocabulary
+
+    def _expand_prefix(self, prefix: str) -> List[str]:
+        vocabulary = self._vocab()
+        start = bisect.bisect_left(vocabulary, prefix)
+        matches = []
+        for token in vocabulary[start:start + _MAX_PREFIX_EXPANSIONS]:
+            if not token.startswith(prefix):
+                break
+            matches.append(token)
+        return matches
+
+    def _idf(self, token: str) -> float:
+        df = len(self._postings.get(token, ()))
+        n = len(self._documents)
+        return math.log(1 + (n - df + 0.5) / (df + 0.5))
+
+    def search(self, query: str, limit: int = None) -> List[Tuple[int, float]]:
+        """``[(id véhicule, score)]`` par pertinence décroissante.
+
+        Chaque terme doit correspondre ; le dernier peut n'être qu'un préfixe
+        (sauf si la requête se termine par une espace).
+        """
+        tokens = tokenize(query)
+        if not tokens:
+            return []
+        prefix_last = not query[-1:].isspace()
+
+        scores: Optional[Dict[int, float]] = None
+        for position, token in enumerate(tokens):
+            variants = [token]
+            if prefix_last and position == len(tokens) - 1:
+                variants = self._expand_prefix(token) or [token]
+            term_scores: Dict[int, float] = {}
+            for variant in variants:
+                posting = self._postings.get(variant)
+                if not posting:
+                    continue
+                idf = self._idf(variant)
+                for vehicle_id, tf in posting.items():
+                    score = idf * tf * (_K1 + 1) / (tf + _K1)
+                    if score > term_scores.get(vehicle_id, 0.0):
+                        term_scores[vehicle_id] = score
+            if scores is None:
+                scores = term_scores
+            else:
+                scores = {vid: s + term_scores[vid] for vid, s in scores.items() if vid in term_scores}
+            if not scores:
+                return []
+
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+        return ranked[:limit] if limit else ranked
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "ready": self.ready,
+            "documents": len(self._documents),
+            "terms": len(self._postings),
+            "suggestions": len(self.suggestions),
+            "built_at": self.built_at,
+            "build_ms": self.build_ms,
+        }
+
+    # ---------------------------------------------------------- chargement
+
+    async def rebuild(self) -> None:
+        """Recharge tout le catalogue depuis la base (réplica de lecture)."""
+        started = time.perf_counter()
+        self._building = True
+        self._pending = {}
+        try:
+            async with session_scope(read=True) as db:
+                result = await db.execute(_documents_query())
+                rows = [tuple(row) for row in result.all()]
+            fresh = SearchIndex()
+            # Tokenisation hors de la boucle d'événements
+            await asyncio.to_thread(fresh.replace_all, rows)
+            self._postings, self._documents = fresh._postings, fresh._documents
+            self._vocabulary, self._vocabulary_dirty = fresh._vocabulary, False
+            self.suggestions = fresh.suggestions
+        finally:
+            self._building = False
+            pending, self._pending = self._pending, {}
+        for vehicle_id, doc in pending.items():
+            self._apply(vehicle_id, doc)
+        self.ready = True
+        self.built_at = time.time()
+        self.build_ms = round((time.perf_counter() - started) * 1000, 1)
+        logger.info(f"Search index built: {len(self._documents)} vehicles in {self.build_ms}ms")
+
+    async def refresh_vehicle(self, vehicle_id: int) -> None:
+        """Relit un véhicule depuis le primaire et met son entrée à jour."""
+        async with session_scope() as db:
+            result = await db.execute(
+                _documents_query().where(Vehicule.IdentifiantVehicule == vehicle_id)
+            )
+            row = result.first()
+        if row is None:
+            self.remove(vehicle_id)
+        else:
+            self.upsert(*row)
+
+
+def _documents_query():
+    """Colonnes de ``VehicleDocument``, dans l'ordre."""
+    return (
+        select(
+            Vehicule.IdentifiantVehicule,
+            Vehicule.TitreAnnonce,
+            Vehicule.DescriptionVehicule,
+            Vehicule.LocalisationVille,
+            MarqueVehicule.NomMarque,
+            ModeleVehicule.NomModele,
+            CategorieVehicule.NomCategorie,
+            Vehicule.StatutVehicule != 'Desactive',
+        )
+        .outerjoin(ModeleVehicule, Vehicule.IdentifiantModele == ModeleVehicule.IdentifiantModele)
+        .outerjoin(MarqueVehicule, ModeleVehicule.IdentifiantMarque == MarqueVehicule.IdentifiantMarque)
+        .outerjoin(CategorieVehicule, Vehicule.IdentifiantCategorie == CategorieVehicule.IdentifiantCategorie)
+    )
+
+
+search_index = SearchIndex()
+
+
+async def update_search_index(vehicle_id: int) -> None:
+    """Après l'écriture d'un véhicule : met à jour cet index et celui des autres workers."""
+    if not settings.SEARCH_INDEX_ENABLED:
+        return
+    try:
+        await search_index.refresh_vehicle(vehicle_id)
+    except Exception as e:
+        logger.warning(f"Search index update failed for vehicle {vehicle_id}: {e}")
+    await publish_invalidation(SEARCH_INDEX_OP, vehicle_id)
+
+
+@on_invalidation
+async def _on_remote_vehicle_change(message: Dict[str, Any]) -> None:
+    if message.get("op") == SEARCH_INDEX_OP and settings.SEARCH_INDEX_ENABLED and search_index.ready:
+        await search_index.refresh_vehicle(int(message["value"]))
+
+
+# ============================================================
+# CONSTRUCTION ET RECONSTRUCTION PÉRIODIQUE
+# ============================================================
+
+_rebuild_task: Optional[asyncio.Task] = None
+
+
+async def _rebuild_periodically() -> None:
+    while True:
+        try:
+            await search_index.rebuild()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning(f"Search index build failed, ILIKE fallback in use: {e}")
+        if settings.SEARCH_INDEX_REBUILD_INTERVAL <= 0 and search_index.ready:
+            return
+        await asyncio.sleep(settings.SEARCH_INDEX_REBUILD_INTERVAL if search_index.ready else 30)
+
+
+def start_search_index() -> asyncio.Task:
+    """Lance la construction (puis les reconstructions) en tâche de fond."""
+    global _rebuild_task
+    if _rebuild_task is None or _rebuild_task.done():
+        _rebuild_task = asyncio.create_task(_rebuild_periodically())
+    return _rebuild_task
+
+
+async def stop_search_index() -> None:
+    global _rebuild_task
+    task, _rebuild_task = _rebuild_task, None
+    if task is not None and not task.done():
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+
+@cache_warmer("search_index")
+async def _warm_search_index() -> None:
+    """Attend la première construction (la tâche survit au budget de préchauffage)."""
+    if not settings.SEARCH_INDEX_ENABLED:
+        return
+    start_search_index()
+    while not search_index.ready:
+        await asyncio.sleep(0.05)
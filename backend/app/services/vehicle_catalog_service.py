@@ -0,0 +1,458 @@
+"""
+Service de catalogue véhicules
+==============================
+
+Requêtes de liste/recherche de véhicules (``GET /vehicles``, ``GET /search/vehicles``).
+
+Les filtres étant optionnels, une requête est construite pour chaque
+combinaison de filtres présents (« forme »), pas pour chaque valeur : la forme
+sert de clé à un cache de statements dont les valeurs passent par des
+``bindparam``. Le même objet statement est réutilisé d'une requête à l'autre,
+et SQLAlchemy retrouve sa compilation dans le cache de l'engine au lieu de
+reconstruire et recompiler ``select`` + sous-requête de comptage + options.
+
+Les pages sérialisées sont mises en cache (``list_vehicle_page``) sous le tag
+``vehicles`` : toute écriture visible dans le catalogue (véhicule, photos,
+modération) appelle ``invalidate_caches`` qui les invalide en O(1).
+
+Le filtre ``search`` passe par l'index plein texte (``search_index_service``)
+dès qu'il est construit : l'index renvoie les identifiants classés par
+pertinence, la base n'applique plus que les autres filtres sur ces
+identifiants. ``ILIKE`` sert de repli avant la première construction, pour
+une requête sans terme indexable (mots vides, lettre isolée) et quand l'index
+trouve plus de ``SEARCH_INDEX_MAX_CANDIDATES`` véhicules (liste et total
+resteraient tronqués).
+
+``cursor`` remplace ``page`` pour le défilement infini : reprise après
+``(EstVedette, NotesVehicule, IdentifiantVehicule)`` de la dernière ligne vue
+au lieu d'un ``OFFSET`` (en mode pertinence, après ``(score, id)``). Le
+curseur porte son mode : si l'index devient prêt ou repasse en repli pendant
+le défilement, un curseur de l'autre mode reprend à la première page au lieu
+d'échouer.
+
+``facets`` calcule en une requête (``GROUPING SETS``) le nombre de véhicules
+par ville, carburant, boîte, catégorie et tranche de prix pour les filtres
+courants, mis en cache par filtres sous le même tag.
+"""
+
+from dataclasses import asdict, dataclass, fields
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import bindparam, case, func, or_, select, tuple_
+from sqlalchemy.orm import selectinload
+
+from app.core.cache import CACHE_TTL_MEDIUM, cache_get_or_set, cache_invalidate_tags, make_cache_key
+from app.core.config import settings
+from app.core.pagination import CountStrategy, Keyset, SortKey, count_rows, decode_cursor, encode_cursor
+from app.models.vehicle import Vehicule
+from app.models.vehicle_category import CategorieVehicule
+from app.schemas.vehicle import VehicleResponse
+from app.services.search_index_service import search_index, tokenize, update_search_index
+
+# Tag de cache des lectures du catalogue (pages, vedettes, recherche, GPS)
+VEHICLES_CACHE_TAG = "vehicles"
+
+# Ordre du catalogue ; l'identifiant rend l'ordre total (pages stables)
+CATALOG_KEYSET = Keyset(
+    SortKey(Vehicule.EstVedette, null_as=False),
+    SortKey(Vehicule.NotesVehicule, null_as=0),
+    SortKey(Vehicule.IdentifiantVehicule),
+)
+
+# Modes de curseur : ordre du catalogue (keyset) ou pertinence de l'index
+_KEYSET_CURSOR, _RANKED_CURSOR = "k", "r"
+
+# Facettes du catalogue et bornes des tranches de prix journalier (FCFA)
+FACETS = ("city", "fuel", "transmission", "category", "price")
+PRICE_BUCKETS = (10000, 20000, 30000, 50000, 100000)
+
+# Filtres comparés par ILIKE : la casse ne change pas le résultat
+_CASE_INSENSITIVE = ("search", "category", "fuel", "transmission")
+
+
+def _choice(value: Optional[str]) -> Optional[str]:
+    """Valeur de filtre texte ; ``"all"`` et chaîne vide = pas de filtre."""
+    return value if value and value != "all" else None
+
+
+@dataclass(frozen=True)
+class VehicleFilters:
+    """Filtres du catalogue, normalisés (``None`` = filtre absent)."""
+
+    search: Optional[str] = None
+    city: Optional[str] = None
+    category: Optional[str] = None
+    fuel: Optional[str] = None
+    transmission: Optional[str] = None
+    min_price: Optional[int] = None
+    max_price: Optional[int] = None
+    seats: Optional[int] = None
+    available_only: bool = False
+    featured_only: bool = False
+
+    @classmethod
+    def from_query(
+        cls,
+        search: Optional[str] = None,
+        city: Optional[str] = None,
+        type: Optional[str] = None,
+        fuel: Optional[str] = None,
+        transmission: Optional[str] = None,
+        min_price: Optional[int] = None,
+        max_price: Optional[int] = None,
+        seats: Optional[int] = None,
+        available: Optional[bool] = None,
+        featured: Optional[bool] = None,
+    ) -> "VehicleFilters":
+        """Construit les filtres depuis les paramètres de query des endpoints."""
+        return cls(
+            search=search or None,
+            city=_choice(city),
+            category=_choice(type),
+            fuel=_choice(fuel),
+            transmission=_choice(transmission),
+            min_price=min_price or None,
+            max_price=max_price or None,
+            seats=seats or None,
+            available_only=available is True,
+            featured_only=featured is True,
+        )
+
+    @property
+    def shape(self) -> Tuple[str, ...]:
+        """Noms des filtres actifs — clé du cache de statements."""
+        return tuple(f.name for f in fields(self) if getattr(self, f.name) not in (None, False))
+
+    def bind_values(self) -> Dict[str, Any]:
+        values = {
+            name: getattr(self, name)
+            for name in self.shape
+            if name not in ("available_only", "featured_only")
+        }
+        if "search" in values:
+            values["search"] = f"%{values['search']}%"
+        return values
+
+    def cache_key_values(self) -> Dict[str, Any]:
+        """Filtres normalisés pour la clé de cache (mêmes résultats = même clé)."""
+        values = asdict(self)
+        # Casse seulement : les espaces passent tels quels dans ``ILIKE`` et
+        # une espace finale désactive le préfixe de l'index
+        for name in _CASE_INSENSITIVE:
+            if values[name] is not None:
+                values[name] = values[name].lower()
+        return values
+
+
+def _use_search_index(filters: VehicleFilters) -> bool:
+    return (
+        bool(filters.search) and settings.SEARCH_INDEX_ENABLED and search_index.ready
+        and bool(tokenize(filters.search))
+    )
+
+
+def _encode_cursor(mode: str, values: List[Any]) -> str:
+    return encode_cursor([mode, *values])
+
+
+def _decode_cursor(cursor: str, mode: str, size: int) -> Optional[List[Any]]:
+    """Valeurs d'un curseur de ``mode`` ; ``None`` s'il vient de l'autre mode."""
+    if decode_cursor(cursor)[:1] != [mode]:
+        return None
+    return decode_cursor(cursor, size + 1)[1:]
+
+
+def _ranked_candidates(filters: VehicleFilters) -> Optional[List[Tuple[int, float]]]:
+    """``[(id, score)]`` de l'index, ou ``None`` quand la base doit répondre (``ILIKE``)."""
+    if not _use_search_index(filters):
+        return None
+    limit = settings.SEARCH_INDEX_MAX_CANDIDATES
+    ranked = search_index.search(filters.search, limit=limit + 1)
+    return ranked if len(ranked) <= limit else None
+
+
+@lru_cache(maxsize=256)
+def _filtered_query(shape: Tuple[str, ...]):
+    active = set(shape)
+    query = select(Vehicule).where(Vehicule.StatutVehicule != 'Desactive')
+
+    if "search_ids" in active:
+        query = query.where(Vehicule.IdentifiantVehicule.in_(bindparam("search_ids", expanding=True)))
+    if "search" in active:
+        pattern = bindparam("search")
+        query = query.where(
+            or_(
+                Vehicule.TitreAnnonce.ilike(pattern),
+                Vehicule.DescriptionVehicule.ilike(pattern),
+                Vehicule.LocalisationVille.ilike(pattern)
+            )
+        )
+    if "city" in active:
+        query = query.where(Vehicule.LocalisationVille == bindparam("city"))
+    if "category" in active:
+        query = query.join(Vehicule.categorie).where(
+            CategorieVehicule.NomCategorie.ilike(bindparam("category"))
+        )
+    if "fuel" in active:
+        query = query.where(Vehicule.TypeCarburant.ilike(bindparam("fuel")))
+    if "transmission" in active:
+        query = query.where(Vehicule.TypeTransmission.ilike(bindparam("transmission")))
+    if "min_price" in active:
+        query = query.where(Vehicule.PrixJournalier >= bindparam("min_price"))
+    if "max_price" in active:
+        query = query.where(Vehicule.PrixJournalier <= bindparam("max_price"))
+    if "seats" in active:
+        query = query.where(Vehicule.NombrePlaces >= bindparam("seats"))
+    if "available_only" in active:
+        query = query.where(Vehicule.StatutVehicule == 'Actif')
+    if "featured_only" in active:
+        query = query.where(Vehicule.EstVedette == True)
+    return query
+
+
+@lru_cache(maxsize=256)
+def _catalog_statements(shape: Tuple[str, ...], keyset: bool = False):
+    """(statement de comptage, statement paginé) pour une forme de filtres.
+
+    ``keyset`` : page reprise après ``cursor_0..2`` au lieu de ``offset``.
+    """
+    query = _filtered_query(shape)
+
+    count_query = select(func.count()).select_from(query.subquery())
+
+    page_query = query.options(
+        selectinload(Vehicule.photos),
+        selectinload(Vehicule.proprietaire)
+    )
+    if keyset:
+        page_query = page_query.where(CATALOG_KEYSET.after(CATALOG_KEYSET.bindparams()))
+    else:
+        page_query = page_query.offset(bindparam("offset"))
+    page_query = page_query.order_by(*CATALOG_KEYSET.order_by()).limit(bindparam("limit"))
+    return count_query, page_query
+
+
+@lru_cache(maxsize=256)
+def _ranked_statements(shape: Tuple[str, ...]):
+    """(identifiants filtrés parmi ``search_ids``, véhicules d'une page d'identifiants)."""
+    shape = tuple("search_ids" if name == "search" else name for name in shape)
+    ids_query = _filtered_query(shape).with_only_columns(Vehicule.IdentifiantVehicule)
+    page_query = (
+        select(Vehicule)
+        .where(Vehicule.IdentifiantVehicule.in_(bindparam("page_ids", expanding=True)))
+        .options(
+            selectinload(Vehicule.photos),
+            selectinload(Vehicule.proprietaire)
+        )
+    )
+    return ids_query, page_query
+
+
+@lru_cache(maxsize=256)
+def _facet_statement(shape: Tuple[str, ...]):
+    """Comptes par facette pour une forme de filtres, en un seul passage."""
+    price = Vehicule.PrixJournalier
+    bucket = case(
+        (price.is_(None), None),
+        *((price < bound, index) for index, bound in enumerate(PRICE_BUCKETS)),
+        else_=len(PRICE_BUCKETS),
+    )
+    rows = _filtered_query(shape).with_only_columns(
+        Vehicule.LocalisationVille.label("city"),
+        Vehicule.TypeCarburant.label("fuel"),
+        Vehicule.TypeTransmission.label("transmission"),
+        Vehicule.IdentifiantCategorie.label("category"),
+        bucket.label("price"),
+    ).subquery()
+    columns = [rows.c[name] for name in FACETS]
+    # Un ensemble par facette ; le nom de catégorie accompagne son identifiant
+    sets = [
+        tuple_(column, CategorieVehicule.NomCategorie) if column.name == "category" else column
+        for column in columns
+    ]
+    return (
+        select(
+            *columns,
+            CategorieVehicule.NomCategorie,
+            *(func.grouping(column) for column in columns),
+            func.count(),
+        )
+        .select_from(rows)
+        .outerjoin(CategorieVehicule, CategorieVehicule.IdentifiantCategorie == rows.c.category)
+        .group_by(func.grouping_sets(*sets))
+    )
+
+
+def _price_bucket(index: int) -> Dict[str, Optional[int]]:
+    bounds = (0,) + PRICE_BUCKETS
+    return {"min": bounds[index], "max": PRICE_BUCKETS[index] if index < len(PRICE_BUCKETS) else None}
+
+
+class VehicleCatalogService:
+    """Liste paginée et filtrée des véhicules du catalogue."""
+
+    @staticmethod
+    async def list_vehicles(
+        db,
+        filters: VehicleFilters,
+        page: int,
+        page_size: int,
+        cursor: Optional[str] = None,
+        count: CountStrategy = CountStrategy.EXACT,
+    ) -> Tuple[List[Vehicule], Optional[int], Optional[str]]:
+        """Retourne (véhicules de la page, total, curseur suivant) pour les filtres donnés.
+
+        Avec ``cursor``, ``page`` est ignoré. En mode page, le curseur suivant
+        est aussi fourni : un client peut passer au curseur après la page 1.
+        Il n'y a pas de page suivante quand le curseur est ``None``.
+        """
+        ranked = _ranked_candidates(filters)
+        if ranked is not None:
+            return await VehicleCatalogService._list_ranked(db, filters, ranked, page, page_size, cursor)
+
+        after = _decode_cursor(cursor, _KEYSET_CURSOR, len(CATALOG_KEYSET.keys)) if cursor else None
+        count_query, page_query = _catalog_statements(filters.shape, after is not None)
+        params = filters.bind_values()
+
+        total = await count_rows(
+            db, _filtered_query(filters.shape), count, params=params, tags=(VEHICLES_CACHE_TAG,),
+            exact=lambda: db.scalar(count_query, params),
+        )
+        page_params = {**params, "limit": page_size + 1}
+        if after is not None:
+            page_params.update(CATALOG_KEYSET.bind(after))
+        else:
+            page_params["offset"] = 0 if cursor is not None else (page - 1) * page_size
+        result = await db.execute(page_query, page_params)
+        rows = result.scalars().all()
+        vehicles = list(rows[:page_size])
+        next_cursor = (
+            _encode_cursor(_KEYSET_CURSOR, CATALOG_KEYSET.values(vehicles[-1])) if len(rows) > page_size else None
+        )
+        return vehicles, total, next_cursor
+
+    @staticmethod
+    async def _list_ranked(
+        db,
+        filters: VehicleFilters,
+        ranked: List[Tuple[int, float]],
+        page: int,
+        page_size: int,
+        cursor: Optional[str] = None,
+    ) -> Tuple[List[Vehicule], int, Optional[str]]:
+        """Recherche par l'index : tri par pertinence, filtres restants en base."""
+        if not ranked:
+            return [], 0, None
+
+        ids_query, page_query = _ranked_statements(filters.shape)
+        params = filters.bind_values()
+        del params["search"]
+        result = await db.execute(ids_query, {**params, "search_ids": [vid for vid, _ in ranked]})
+        matching = set(result.scalars().all())
+
+        ordered = [(vid, score) for vid, score in ranked if vid in matching]
+        total = len(ordered)
+        after = _decode_cursor(cursor, _RANKED_CURSOR, 2) if cursor else None
+        if after is not None:
+            last_score, last_id = after
+            remaining = [(vid, score) for vid, score in ordered if (-score, vid) > (-last_score, last_id)]
+        elif cursor is None:
+            remaining = ordered[(page - 1) * page_size:]
+        else:
+            remaining = ordered
+        window = remaining[:page_size]
+        next_cursor = (
+            _encode_cursor(_RANKED_CURSOR, [window[-1][1], window[-1][0]]) if len(remaining) > page_size else None
+        )
+        page_ids = [vid for vid, _ in window]
+        if not page_ids:
+            return [], total, None
+
+        result = await db.execute(page_query, {"page_ids": page_ids})
+        position = {vid: i for i, vid in enumerate(page_ids)}
+        vehicles = sorted(result.scalars().all(), key=lambda v: position[v.IdentifiantVehicule])
+        return vehicles, total, next_cursor
+
+    @staticmethod
+    async def list_vehicle_page(
+        db,
+        filters: VehicleFilters,
+        page: int,
+        page_size: int,
+        cursor: Optional[str] = None,
+        count: CountStrategy = CountStrategy.EXACT,
+    ) -> Dict[str, Any]:
+        """``{"vehicles", "total", "has_more", "next_cursor"}`` sérialisé, servi depuis le cache si possible."""
+        async def load():
+            vehicles, total, next_cursor = await VehicleCatalogService.list_vehicles(
+                db, filters, page, page_size, cursor, count
+            )
+            return {
+                "vehicles": [VehicleResponse.model_validate(v).model_dump() for v in vehicles],
+                "total": total,
+                "has_more": next_cursor is not None,
+                "next_cursor": next_cursor,
+            }
+
+        key = make_cache_key(
+            "vehicle_catalog", page=page if cursor is None else None, page_size=page_size,
+            cursor=cursor, count=CountStrategy(count).value, ranked=_use_search_index(filters),
+            **filters.cache_key_values()
+        )
+        return await cache_get_or_set(key, load, CACHE_TTL_MEDIUM, tags=(VEHICLES_CACHE_TAG,))
+
+    @staticmethod
+    async def facets(db, filters: VehicleFilters) -> Dict[str, List[Dict[str, Any]]]:
+        """Histogrammes ``{facette: [{"value"|"min"/"max", "count"}]}`` des filtres courants (cachés)."""
+        async def load():
+            shape, params = filters.shape, filters.bind_values()
+            ranked = _ranked_candidates(filters)
+            if ranked is not None:
+                if not ranked:
+                    return {name: [] for name in FACETS}
+                shape = tuple("search_ids" if name == "search" else name for name in shape)
+                del params["search"]
+                params["search_ids"] = [vid for vid, _ in ranked]
+
+            result = await db.execute(_facet_statement(shape), params)
+            histograms: Dict[str, List[Dict[str, Any]]] = {name: [] for name in FACETS}
+            for row in result.all():
+                values, category_name = row[:len(FACETS)], row[len(FACETS)]
+                grouped = row[len(FACETS) + 1:-1]
+                # GROUPING() = 0 pour la seule colonne de l'ensemble de cette ligne
+                name = FACETS[list(grouped).index(0)]
+                value = values[FACETS.index(name)]
+                if name == "category":
+                    value = category_name
+                if value is None:
+                    continue
+                entry = _price_bucket(value) if name == "price" else {"value": value}
+                histograms[name].append({**entry, "count": row[-1]})
+            for name, entries in histograms.items():
+                if name == "price":
+                    entries.sort(key=lambda e: e["min"])
+                else:
+                    entries.sort(key=lambda e: (-e["count"], str(e["value"])))
+            return histograms
+
+        key = make_cache_key(
+            "vehicle_facets", ranked=_use_search_index(filters), **filters.cache_key_values()
+        )
+        return await cache_get_or_set(key, load, CACHE_TTL_MEDIUM, tags=(VEHICLES_CACHE_TAG,))
+
+    @staticmethod
+    async def invalidate_caches(vehicle_id: Optional[int] = None) -> None:
+        """À appeler après toute écriture visible dans le catalogue.
+
+        ``vehicle_id`` : véhicule dont le titre, la description ou la ville ont
+        pu changer — son entrée de l'index de recherche est mise à jour.
+        """
+        if vehicle_id is not None:
+            await update_search_index(vehicle_id)
+        await cache_invalidate_tags(VEHICLES_CACHE_TAG)
+
+    @staticmethod
+    def statement_cache_info() -> Dict[str, int]:
+        info = _catalog_statements.cache_info()
+        return {"hits": info.hits, "misses": info.misses, "shapes": info.currsize}
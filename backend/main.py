@@ -18,7 +18,13 @@ from typing import AsyncGenerator
 
 # Import de la configuration
 from app.core.config import settings
-from app.core.database import engine, Base
+from app.core.database import engine, Base, dispose_engines
+from app.core.cache import close_redis, start_invalidation_listener, stop_invalidation_listener
+from app.core.db_instrumentation import query_stats_middleware
+from app.core.query_profiler import RouteContextMiddleware
+from app.core.cache_warmup import is_ready, readiness, start_cache_warmup, stop_cache_warmup
+from app.services.cache_stats_service import start_cache_stats_flusher, stop_cache_stats_flusher
+from app.services.search_index_service import start_search_index, stop_search_index
 from app.core.database_init import init_database, check_database_connection, verify_tables_exist
 
 # Import de tous les modèles pour que SQLAlchemy puisse résoudre les relations
@@ -89,11 +95,25 @@ async def lifespan(app: FastAPI) -> AsyncGenerator:
                 if not verify_tables_exist():
                     logger.warning("Some required tables are missing")
 
+    # Invalidation du cache L1 entre workers (Redis pub/sub)
+    start_invalidation_listener()
+    start_cache_stats_flusher()
+    if settings.SEARCH_INDEX_ENABLED:
+        start_search_index()
+    # Préchauffage des lectures chaudes ; GET /ready répond 503 jusqu'à la fin
+    start_cache_warmup()
+
     logger.info("AUTOLOCO Backend started successfully")
 
     yield
 
     logger.info("Shutting down AUTOLOCO Backend...")
+    await stop_cache_warmup()
+    await stop_search_index()
+    await stop_invalidation_listener()
+    await stop_cache_stats_flusher()
+    await dispose_engines()
+    await close_redis()
     logger.info("Shutdown complete")
 
 
@@ -120,13 +140,25 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
-    expose_headers=["X-Total-Count", "X-Page", "X-Page-Size"],
+    expose_headers=[
+        "X-Total-Count", "X-Page", "X-Page-Size",
+        "X-DB-Query-Count", "X-DB-Query-Time-Ms", "X-DB-Duplicate-Queries",
+    ],
 )
 
 # GZip Compression
 app.add_middleware(GZipMiddleware, minimum_size=1000)
 
 
+# Compteur de requêtes SQL par requête HTTP (opt-in, détection N+1)
+if settings.DB_QUERY_STATS_ENABLED:
+    app.middleware("http")(query_stats_middleware)
+
+# Route courante pour le journal des requêtes SQL lentes
+if settings.DB_QUERY_PROFILER_ENABLED:
+    app.add_middleware(RouteContextMiddleware)
+
+
 # Middleware de logging des requêtes
 @app.middleware("http")
 async def log_requests(request: Request, call_next):
@@ -207,6 +239,17 @@ async def health_check():
     }
 
 
+@app.get("/ready", tags=["System"])
+async def readiness_check():
+    """Prêt à recevoir du trafic : 503 tant que le préchauffage du cache n'est pas terminé.
+
+    Distinct de ``/health`` (le processus répond) pour les sondes readiness.
+    """
+    if not is_ready():
+        return JSONResponse(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, content=readiness())
+    return readiness()
+
+
 # Root endpoint
 @app.get("/", tags=["System"])
 async def root():
@@ -0,0 +1,107 @@
+#!/usr/bin/env python
+"""
+Benchmark des sérialiseurs du cache
+===================================
+
+Compare, sur une page de véhicules synthétique de la taille d'une réponse
+``GET /vehicles``, l'ancien format (``json.dumps(default=str)``) et les
+sérialiseurs de ``app.core.cache_serializers`` avec et sans compression :
+temps d'encodage / de décodage et taille stockée dans Redis.
+
+Usage:
+    python scripts/benchmark_cache_serializers.py --vehicles 100 --iterations 2000
+
+Le format msgpack nécessite le paquet ``msgpack``.
+"""
+
+import sys
+import argparse
+import json
+import random
+import time
+from datetime import datetime, timedelta
+from decimal import Decimal
+from pathlib import Path
+from uuid import uuid4
+
+# Ajouter le répertoire parent au PYTHONPATH
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.core import cache_serializers
+
+CITIES = ["Douala", "Yaoundé", "Bafoussam", "Garoua", "Kribi", "Limbé"]
+FUELS = ["Essence", "Diesel", "Hybride", "Electrique"]
+
+
+def _vehicle(rng: random.Random, i: int) -> dict:
+    created = datetime(2024, 1, 1) + timedelta(minutes=rng.randint(0, 500_000))
+    return {
+        "IdentifiantVehicule": i,
+        "TitreAnnonce": f"Toyota Corolla {2015 + i % 9} - {rng.choice(CITIES)}",
+        "DescriptionVehicule": "Véhicule climatisé, entretenu, idéal pour la ville. " * 3,
+        "PrixJournalier": Decimal(rng.randint(15, 80) * 1000),
+        "Caution": Decimal("100000.00"),
+        "LocalisationVille": rng.choice(CITIES),
+        "TypeCarburant": rng.choice(FUELS),
+        "NombrePlaces": rng.choice([4, 5, 7]),
+        "NotesVehicule": Decimal(str(round(rng.uniform(3, 5), 2))),
+        "EstVedette": rng.random() < 0.1,
+        "DateCreation": created,
+        "DateModification": created + timedelta(days=3),
+        "Reference": uuid4(),
+        "photos": [
+            {"url": f"https://cdn.autoloco.local/vehicles/{i}/{n}.jpg", "principale": n == 0}
+            for n in range(4)
+        ],
+    }
+
+
+def _legacy_encode(value) -> bytes:
+    return json.dumps(value, default=str).encode()
+
+
+def _time(fn, iterations: int) -> float:
+    started = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - started) / iterations * 1_000_000
+
+
+def run(vehicles: int, iterations: int) -> None:
+    rng = random.Random(7)
+    payload = {"vehicles": [_vehicle(rng, i) for i in range(vehicles)], "total": vehicles * 10}
+
+    candidates = [("json (legacy)", lambda: _legacy_encode(payload), json.loads)]
+    names = ["json"] + (["msgpack"] if cache_serializers._MSGPACK_AVAILABLE else [])
+    for name in names:
+        serializer = cache_serializers.get_serializer(name)
+        for threshold, label in ((0, name), (1024, f"{name}+zlib")):
+            candidates.append((
+                label,
+                lambda s=serializer, t=threshold: cache_serializers.encode(payload, s, compress_threshold=t),
+                cache_serializers.decode,
+            ))
+
+    print(f"\nvehicles={vehicles} iterations={iterations}")
+    print(f"{'format':<16}{'bytes':>10}{'encode µs':>12}{'decode µs':>12}{'types':>8}")
+    for label, encode, decode in candidates:
+        data = encode()
+        faithful = decode(data) == payload
+        print(
+            f"{label:<16}{len(data):>10}{_time(encode, iterations):>12.1f}"
+            f"{_time(lambda: decode(data), iterations):>12.1f}{'yes' if faithful else 'no':>8}"
+        )
+    if not cache_serializers._MSGPACK_AVAILABLE:
+        print("(msgpack not installed: pip install msgpack)")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--vehicles", type=int, default=100)
+    parser.add_argument("--iterations", type=int, default=2000)
+    args = parser.parse_args()
+    run(args.vehicles, args.iterations)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,269 @@
+#!/usr/bin/env python
+"""
+Benchmark des modes de driver base de données
+==============================================
+
+Compare ``DB_DRIVER_MODE=sync`` (psycopg2 + threadpool) et
+``DB_DRIVER_MODE=async`` (asyncpg natif) sur le même jeu de données,
+en appelant directement la requête du catalogue (``GET /vehicles`` sans son
+cache de pages, qui mesurerait sinon des lectures de cache) et l'endpoint
+``list_bookings``.
+
+Usage:
+    python scripts/benchmark_db_modes.py seed --vehicles 2000 --bookings 5000
+    python scripts/benchmark_db_modes.py run --concurrency 50 --requests 2000
+    python scripts/benchmark_db_modes.py cleanup
+
+Le mode async nécessite le paquet ``asyncpg``.
+"""
+
+import sys
+import argparse
+import asyncio
+import inspect
+import random
+import statistics
+import time
+from datetime import datetime, timedelta
+from decimal import Decimal
+from pathlib import Path
+
+# Ajouter le répertoire parent au PYTHONPATH
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sqlalchemy import select, delete
+from fastapi.params import Depends as DependsParam
+from fastapi.params import Param
+
+from app.core.config import settings
+from app.core import database
+from app.core.database import SessionLocal
+import app.models  # noqa: F401
+from app.models.user import Utilisateur
+from app.models.vehicle import Vehicule, PhotoVehicule
+from app.models.vehicle_category import CategorieVehicule, MarqueVehicule, ModeleVehicule
+from app.models.booking import Reservation
+from app.api.v1.endpoints.bookings import list_bookings
+from app.schemas.vehicle import VehicleResponse
+from app.services.vehicle_catalog_service import VehicleCatalogService, VehicleFilters
+
+
+BENCH_EMAIL_OWNER = "bench-owner@autoloco.local"
+BENCH_EMAIL_RENTER = "bench-renter@autoloco.local"
+BENCH_TITLE_PREFIX = "BENCH"
+CITIES = ["Douala", "Yaoundé", "Bafoussam", "Garoua", "Kribi", "Limbé"]
+FUELS = ["Essence", "Diesel", "Hybride", "Electrique"]
+TRANSMISSIONS = ["Manuelle", "Automatique"]
+
+
+# ============================================================
+# JEU DE DONNÉES
+# ============================================================
+
+def seed(vehicles: int, bookings: int) -> None:
+    """Insère un jeu de données reproductible (graine fixe)."""
+    rng = random.Random(42)
+    session = SessionLocal()
+    try:
+        owner = Utilisateur(
+            Nom="Bench", Prenom="Owner", Email=BENCH_EMAIL_OWNER,
+            MotDePasse="x", TypeUtilisateur="proprietaire",
+        )
+        renter = Utilisateur(
+            Nom="Bench", Prenom="Renter", Email=BENCH_EMAIL_RENTER,
+            MotDePasse="x", TypeUtilisateur="locataire",
+        )
+        category = CategorieVehicule(NomCategorie=f"{BENCH_TITLE_PREFIX}-Categorie")
+        brand = MarqueVehicule(NomMarque=f"{BENCH_TITLE_PREFIX}-Marque")
+        session.add_all([owner, renter, category, brand])
+        session.flush()
+        model = ModeleVehicule(NomModele=f"{BENCH_TITLE_PREFIX}-Modele", IdentifiantMarque=brand.IdentifiantMarque)
+        session.add(model)
+        session.flush()
+
+        created = []
+        for i in range(vehicles):
+            vehicle = Vehicule(
+                IdentifiantProprietaire=owner.IdentifiantUtilisateur,
+                IdentifiantCategorie=category.IdentifiantCategorie,
+                IdentifiantModele=model.IdentifiantModele,
+                TitreAnnonce=f"{BENCH_TITLE_PREFIX} Véhicule {i}",
+                DescriptionVehicule="Véhicule de benchmark",
+                Annee=rng.randint(2010, 2025),
+                NombrePlaces=rng.choice([2, 4, 5, 7]),
+                TypeCarburant=rng.choice(FUELS),
+                TypeTransmission=rng.choice(TRANSMISSIONS),
+                PrixJournalier=Decimal(rng.randint(10, 120) * 1000),
+                LocalisationVille=rng.choice(CITIES),
+                NotesVehicule=Decimal(str(round(rng.uniform(0, 5), 2))),
+                EstVedette=rng.random() < 0.1,
+                StatutVehicule="Actif",
+            )
+            vehicle.photos = [
+                PhotoVehicule(URLPhoto=f"https://cdn.autoloco.cm/bench/{i}-{n}.jpg", OrdreAffichage=n, EstPhotoPrincipale=n == 0)
+                for n in range(3)
+            ]
+            created.append(vehicle)
+        session.add_all(created)
+        session.flush()
+
+        start = datetime(2025, 1, 1)
+        for i in range(bookings):
+            vehicle = rng.choice(created)
+            debut = start + timedelta(days=rng.randint(0, 365))
+            session.add(Reservation(
+                NumeroReservation=f"{BENCH_TITLE_PREFIX}-{i}",
+                IdentifiantVehicule=vehicle.IdentifiantVehicule,
+                IdentifiantLocataire=renter.IdentifiantUtilisateur,
+                IdentifiantProprietaire=owner.IdentifiantUtilisateur,
+                DateDebut=debut,
+                DateFin=debut + timedelta(days=rng.randint(1, 14)),
+                PrixJournalier=vehicle.PrixJournalier,
+                MontantLocation=vehicle.PrixJournalier,
+                MontantTotal=vehicle.PrixJournalier,
+                StatutReservation="Confirmee",
+                StatutPaiement="Paye",
+                DateCreationReservation=debut - timedelta(days=7),
+            ))
+        session.commit()
+        print(f"Seeded {vehicles} vehicles and {bookings} bookings")
+    except Exception:
+        session.rollback()
+        raise
+    finally:
+        session.close()
+
+
+def cleanup() -> None:
+    """Supprime le jeu de données de benchmark."""
+    session = SessionLocal()
+    try:
+        owner_ids = select(Utilisateur.IdentifiantUtilisateur).where(
+            Utilisateur.Email.in_([BENCH_EMAIL_OWNER, BENCH_EMAIL_RENTER])
+        )
+        vehicle_ids = select(Vehicule.IdentifiantVehicule).where(
+            Vehicule.IdentifiantProprietaire.in_(owner_ids)
+        )
+        session.execute(delete(Reservation).where(Reservation.IdentifiantVehicule.in_(vehicle_ids)))
+        session.execute(delete(PhotoVehicule).where(PhotoVehicule.IdentifiantVehicule.in_(vehicle_ids)))
+        session.execute(delete(Vehicule).where(Vehicule.IdentifiantProprietaire.in_(owner_ids)))
+        session.execute(delete(ModeleVehicule).where(ModeleVehicule.NomModele.like(f"{BENCH_TITLE_PREFIX}-%")))
+        session.execute(delete(MarqueVehicule).where(MarqueVehicule.NomMarque.like(f"{BENCH_TITLE_PREFIX}-%")))
+        session.execute(delete(CategorieVehicule).where(CategorieVehicule.NomCategorie.like(f"{BENCH_TITLE_PREFIX}-%")))
+        session.execute(delete(Utilisateur).where(Utilisateur.Email.in_([BENCH_EMAIL_OWNER, BENCH_EMAIL_RENTER])))
+        session.commit()
+        print("Benchmark dataset removed")
+    finally:
+        session.close()
+
+
+# ============================================================
+# EXÉCUTION
+# ============================================================
+
+def _endpoint_defaults(endpoint) -> dict:
+    """Résout les valeurs par défaut ``Query(...)`` d'un endpoint pour un appel direct."""
+    kwargs = {}
+    for name, param in inspect.signature(endpoint).parameters.items():
+        default = param.default
+        if isinstance(default, DependsParam):
+            continue
+        kwargs[name] = default.default if isinstance(default, Param) else default
+    return kwargs
+
+
+async def _call(endpoint, **overrides) -> None:
+    async for db in database.get_db():
+        kwargs = {**_endpoint_defaults(endpoint), **overrides, "db": db}
+        await endpoint(**kwargs)
+
+
+async def _list_vehicles(page: int, city: str) -> None:
+    """Travail de ``GET /vehicles`` hors cache : comptage, page et sérialisation."""
+    async for db in database.get_db():
+        vehicles, _, _ = await VehicleCatalogService.list_vehicles(
+            db, VehicleFilters.from_query(city=city), page, 20
+        )
+        [VehicleResponse.model_validate(v).model_dump() for v in vehicles]
+
+
+async def _run_mode(mode: str, concurrency: int, requests: int, renter) -> dict:
+    settings.DB_DRIVER_MODE = mode
+    rng = random.Random(7)
+    latencies = []
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(i: int) -> None:
+        async with semaphore:
+            started = time.perf_counter()
+            if i % 2 == 0:
+                await _list_vehicles(page=rng.randint(1, 20), city=rng.choice(CITIES))
+            else:
+                await _call(list_bookings, page=rng.randint(1, 20), current_user=renter)
+            latencies.append((time.perf_counter() - started) * 1000)
+
+    # Warm-up (pool + caches de compilation SQLAlchemy)
+    await asyncio.gather(*(one(i) for i in range(min(concurrency, requests))))
+    latencies.clear()
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(requests)))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "mode": mode,
+        "requests": requests,
+        "throughput_rps": requests / elapsed,
+        "p50_ms": statistics.median(latencies),
+        "p95_ms": latencies[int(len(latencies) * 0.95) - 1],
+        "p99_ms": latencies[int(len(latencies) * 0.99) - 1],
+    }
+
+
+def run(concurrency: int, requests: int, modes) -> None:
+    session = SessionLocal()
+    try:
+        renter = session.execute(
+            select(Utilisateur).where(Utilisateur.Email == BENCH_EMAIL_RENTER)
+        ).scalar_one_or_none()
+        if renter is None:
+            sys.exit("Benchmark dataset missing, run `seed` first")
+        session.expunge(renter)
+    finally:
+        session.close()
+
+    results = [asyncio.run(_run_mode(mode, concurrency, requests, renter)) for mode in modes]
+
+    print(f"\nconcurrency={concurrency} requests={requests} pool={settings.DB_POOL_SIZE}+{settings.DB_MAX_OVERFLOW}")
+    print(f"{'mode':<8}{'req/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    for r in results:
+        print(f"{r['mode']:<8}{r['throughput_rps']:>10.1f}{r['p50_ms']:>10.2f}{r['p95_ms']:>10.2f}{r['p99_ms']:>10.2f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    seed_parser = sub.add_parser("seed", help="Insérer le jeu de données")
+    seed_parser.add_argument("--vehicles", type=int, default=2000)
+    seed_parser.add_argument("--bookings", type=int, default=5000)
+
+    run_parser = sub.add_parser("run", help="Comparer les modes sync et async")
+    run_parser.add_argument("--concurrency", type=int, default=50)
+    run_parser.add_argument("--requests", type=int, default=2000)
+    run_parser.add_argument("--modes", nargs="+", default=["sync", "async"], choices=["sync", "async"])
+
+    sub.add_parser("cleanup", help="Supprimer le jeu de données")
+
+    args = parser.parse_args()
+    if args.command == "seed":
+        seed(args.vehicles, args.bookings)
+    elif args.command == "run":
+        run(args.concurrency, args.requests, args.modes)
+    else:
+        cleanup()
+
+
+if __name__ == "__main__":
+    main()
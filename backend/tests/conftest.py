@@ -14,6 +14,7 @@ from sqlalchemy.orm import sessionmaker, Session
 
 from app.core.config import settings
 from app.core.database import Base, engine as app_engine
+from app.core.db_instrumentation import assert_max_queries as _assert_max_queries
 
 
 @pytest.fixture(scope="session")
@@ -40,3 +41,14 @@ def db(engine) -> Session:
     session.close()
     transaction.rollback()
     connection.close()
+
+
+@pytest.fixture
+def assert_max_queries():
+    """
+    Borne le nombre de requêtes SQL d'un bloc (détection N+1).
+
+        with assert_max_queries(3):
+            client.get("/api/v1/favorites")
+    """
+    return _assert_max_queries
@@ -0,0 +1,227 @@
+"""
+Cache Tests
+===========
+
+Tests du cache L1 en mémoire et de l'application des invalidations reçues
+des autres workers (sans serveur Redis).
+"""
+
+import asyncio
+import json
+import time
+from contextlib import asynccontextmanager
+
+import pytest
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+
+from app.core import cache as cache_module, database
+from app.core.cache import (
+    LocalCache, WORKER_ID, cache_get_or_set, cache_set, cached, forget_missing, is_known_missing,
+    remember_missing, _dispatch, _invalidation_handlers, _ns_versions, _physical_key,
+    _remember_version, local_cache, on_invalidation,
+)
+
+
+class TestLocalCache:
+    """Tests du LRU L1"""
+
+    def test_lru_eviction(self):
+        cache = LocalCache(max_entries=2, max_ttl=60)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+
+        assert cache.get("b") is None
+        assert cache.get("a") == 1
+        assert cache.stats()["evictions"] == 1
+
+    def test_ttl_is_bounded_by_max_ttl(self):
+        cache = LocalCache(max_entries=10, max_ttl=0.01)
+        cache.set("a", 1, ttl=3600)
+        time.sleep(0.02)
+        assert cache.get("a") is None
+
+    def test_delete_prefix(self):
+        cache = LocalCache(max_entries=10, max_ttl=60)
+        cache.set("autoloco:vehicles:1", 1)
+        cache.set("autoloco:vehicles:2", 2)
+        cache.set("autoloco:featured_vehicles:1", 3)
+
+        assert cache.delete_prefix("autoloco:vehicles:") == 2
+        assert cache.get("autoloco:featured_vehicles:1") == 3
+
+
+class TestInvalidationMessages:
+    """Tests des messages pub/sub"""
+
+    def test_remote_version_bump_is_applied(self):
+        message = json.dumps({
+            "origin": "other-worker", "op": "version",
+            "value": {"namespace": "reviews_test", "version": 7},
+        })
+        asyncio.run(_dispatch(message))
+        assert _ns_versions["reviews_test"][0] == 7
+
+        # une génération plus ancienne (message en retard) est ignorée
+        asyncio.run(_dispatch(message.replace('"version": 7', '"version": 3')))
+        assert _ns_versions["reviews_test"][0] == 7
+
+    def test_own_messages_and_custom_handlers(self):
+        received = []
+
+        @on_invalidation
+        async def handler(message):
+            received.append(message["op"])
+
+        try:
+            local_cache.set("autoloco:k:1", 1)
+            asyncio.run(_dispatch(json.dumps({"origin": WORKER_ID, "op": "key", "value": "autoloco:k:1"})))
+            asyncio.run(_dispatch(json.dumps({"origin": "other-worker", "op": "custom", "value": None})))
+        finally:
+            _invalidation_handlers.remove(handler)
+
+        assert local_cache.get("autoloco:k:1") == 1
+        assert received == ["custom"]
+
+
+class TestNamespaceVersions:
+    """Tests des clés physiques versionnées"""
+
+    def test_physical_key_embeds_namespace_generations(self):
+        _remember_version("catalog_test", 4)
+        _remember_version("tag_test", 2)
+
+        key = asyncio.run(_physical_key(None, "autoloco:catalog_test:abc", ("tag_test",)))
+        assert key == "autoloco:catalog_test:v4.2:abc"
+
+        _remember_version("tag_test", 3)
+        bumped = asyncio.run(_physical_key(None, "autoloco:catalog_test:abc", ("tag_test",)))
+        assert bumped == "autoloco:catalog_test:v4.3:abc"
+
+    def test_generation_cache_is_bounded(self, monkeypatch):
+        monkeypatch.setattr(cache_module.settings, "CACHE_NAMESPACE_VERSION_MAX_ENTRIES", 3)
+        for user_id in range(5):
+            _remember_version(f"loyalty_user_test:{user_id}", 1)
+        assert len(_ns_versions) == 3
+        assert list(_ns_versions)[-1] == "loyalty_user_test:4"
+
+    def test_unprefixed_key_without_tags_is_unchanged(self):
+        assert asyncio.run(_physical_key(None, "plain-key")) == "plain-key"
+
+
+@pytest.fixture
+def no_redis(monkeypatch):
+    async def get_redis():
+        return None
+    monkeypatch.setattr(cache_module, "get_redis", get_redis)
+
+
+@pytest.mark.usefixtures("no_redis")
+class TestCacheGetOrSet:
+    """Tests du single-flight et du stale-while-revalidate (L1 seul, sans Redis)"""
+
+    def test_concurrent_misses_share_one_load(self):
+        calls = []
+
+        async def loader():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return {"n": len(calls)}
+
+        async def scenario():
+            results = await asyncio.gather(
+                *(cache_get_or_set("autoloco:sf_test:a", loader, 60) for _ in range(10))
+            )
+            again = await cache_get_or_set("autoloco:sf_test:a", loader, 60)
+            return results, again
+
+        results, again = asyncio.run(scenario())
+
+        assert len(calls) == 1
+        assert all(r == {"n": 1} for r in results)
+        assert again == {"n": 1}
+
+    def test_stale_value_served_while_refreshing(self):
+        async def loader():
+            return "fresh"
+
+        async def scenario():
+            await cache_set(
+                "autoloco:swr_test:a", {"__fresh_until__": time.time() - 1, "value": "stale"}, 60
+            )
+            first = await cache_get_or_set("autoloco:swr_test:a", loader, 60, stale_ttl=30)
+            await asyncio.sleep(0.01)
+            second = await cache_get_or_set("autoloco:swr_test:a", loader, 60, stale_ttl=30)
+            return first, second
+
+        assert asyncio.run(scenario()) == ("stale", "fresh")
+
+
+@pytest.mark.usefixtures("no_redis")
+class TestCachedDecorator:
+    """Tests du décorateur ``@cached`` sur une vraie route FastAPI"""
+
+    def test_key_uses_query_params_and_user(self):
+        calls = []
+
+        class User:
+            def __init__(self, user_id):
+                self.IdentifiantUtilisateur = user_id
+
+        def current_user(user: int = 1):
+            return User(user)
+
+        app = FastAPI()
+
+        @app.get("/items")
+        @cached("decorator_test", 60, key_params=("q",), per_user=True)
+        async def items(q: str, current_user=Depends(current_user)):
+            calls.append((q, current_user.IdentifiantUtilisateur))
+            return {"q": q, "user": current_user.IdentifiantUtilisateur}
+
+        client = TestClient(app)
+        assert client.get("/items?q=a&user=1").json() == {"q": "a", "user": 1}
+        assert client.get("/items?q=a&user=1").json() == {"q": "a", "user": 1}
+        assert client.get("/items?q=a&user=2").json() == {"q": "a", "user": 2}
+        assert client.get("/items?q=b&user=1").json() == {"q": "b", "user": 1}
+
+        assert calls == [("a", 1), ("a", 2), ("b", 1)]
+
+    def test_loader_uses_its_own_session(self, monkeypatch):
+        opened = []
+
+        @asynccontextmanager
+        async def session_scope(read=False):
+            opened.append(read)
+            yield f"loader-session-{read}"
+
+        monkeypatch.setattr(database, "session_scope", session_scope)
+        app = FastAPI()
+
+        @app.get("/sessions")
+        @cached("decorator_session_test", 60)
+        async def sessions(db=Depends(database.get_db_read)):
+            return {"db": db}
+
+        app.dependency_overrides[database.get_db_read] = lambda: "request-session"
+        assert TestClient(app).get("/sessions").json() == {"db": "loader-session-True"}
+        assert opened == [True]
+
+
+@pytest.mark.usefixtures("no_redis")
+class TestNegativeCache:
+    """Tests des entrées négatives (404)"""
+
+    def test_missing_entries_until_created(self):
+        async def scenario():
+            before = await is_known_missing("vehicle_test", 42)
+            await remember_missing("vehicle_test", 42)
+            remembered = await is_known_missing("vehicle_test", 42)
+            other = await is_known_missing("vehicle_test", 43)
+            await forget_missing("vehicle_test", 42)
+            after = await is_known_missing("vehicle_test", 42)
+            return before, remembered, other, after
+
+        assert asyncio.run(scenario()) == (False, True, False, False)
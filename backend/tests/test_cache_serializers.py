@@ -0,0 +1,59 @@
+"""
+Cache Serializer Tests
+======================
+
+Tests des formats de stockage des valeurs du cache (types riches,
+compression, lecture des anciennes entrées JSON).
+"""
+
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from uuid import uuid4
+
+import pytest
+
+from app.core import cache_serializers
+from app.core.cache_serializers import COMPRESSED, JsonSerializer, decode, encode, get_serializer
+
+VALUE = {
+    "vehicles": [
+        {
+            "id": 1,
+            "price": Decimal("25000.50"),
+            "created": datetime(2024, 5, 1, 12, 30),
+            "available_from": date(2024, 6, 1),
+            "ref": uuid4(),
+            "photos": ["a.jpg", "b.jpg"],
+        }
+    ],
+    "total": 1,
+}
+
+
+def _serializers():
+    names = ["json"]
+    if cache_serializers._MSGPACK_AVAILABLE:
+        names.append("msgpack")
+    return names
+
+
+class TestCacheSerializers:
+    """Tests des sérialiseurs du cache"""
+
+    @pytest.mark.parametrize("name", _serializers())
+    def test_rich_types_round_trip(self, name):
+        data = encode(VALUE, get_serializer(name), compress_threshold=0)
+        assert decode(data) == VALUE
+
+    def test_large_payloads_are_compressed(self):
+        big = {"vehicles": [VALUE["vehicles"][0]] * 200}
+        data = encode(big, JsonSerializer(), compress_threshold=1024)
+
+        assert data[0] & COMPRESSED
+        assert len(data) < len(JsonSerializer().dumps(big)) / 5
+        assert decode(data) == big
+
+    def test_legacy_json_values_are_still_readable(self):
+        legacy = json.dumps({"total": 3, "items": [1, 2, 3]}).encode()
+        assert decode(legacy) == {"total": 3, "items": [1, 2, 3]}
@@ -0,0 +1,75 @@
+"""
+Cache Statistics Tests
+======================
+
+Tests des compteurs par type de cache et de leur persistance dans
+``CacheStatistiques`` (SQLite en mémoire).
+"""
+
+import asyncio
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.core.cache_metrics import CacheMetrics, cache_metrics
+from app.core.database import AsyncSessionSyncWrapper
+from app.models.search import CacheStatistique
+from app.services.cache_stats_service import CacheStatsService
+
+
+@pytest.fixture
+def db():
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    CacheStatistique.__table__.create(engine)
+    session = sessionmaker(bind=engine, expire_on_commit=False)()
+    yield AsyncSessionSyncWrapper(session)
+    session.close()
+    engine.dispose()
+
+
+class TestCacheMetrics:
+    """Tests des compteurs en mémoire"""
+
+    def test_hit_ratio_and_time_saved(self):
+        metrics = CacheMetrics()
+        metrics.record_miss("vehicle_catalog")
+        metrics.record_load("vehicle_catalog", 40.0)
+        for _ in range(3):
+            metrics.record_hit("vehicle_catalog", 1.0)
+
+        stats = metrics.snapshot()["vehicle_catalog"]
+        assert stats["hit_ratio"] == 0.75
+        assert stats["time_saved_ms"] == 117.0
+
+        metrics.drain()
+        assert metrics.snapshot() == {}
+
+
+class TestCacheStatsService:
+    """Tests de l'écriture et de l'agrégation"""
+
+    def test_flush_then_report(self, db):
+        async def scenario():
+            cache_metrics.drain()
+            for period in range(2):
+                cache_metrics.record_miss("reviews")
+                cache_metrics.record_load("reviews", 20.0)
+                cache_metrics.record_hit("reviews", 2.0)
+                cache_metrics.record_hit("reviews", 2.0)
+                assert await CacheStatsService(db).flush() == 1
+            return await CacheStatsService(db).effectiveness(hours=1)
+
+        [row] = asyncio.run(scenario())
+
+        assert row["type"] == "reviews"
+        assert (row["requests"], row["hits"], row["misses"]) == (6, 4, 2)
+        assert row["hit_ratio"] == pytest.approx(0.6667, abs=1e-4)
+        assert row["avg_hit_ms"] == 2.0
+        assert row["avg_load_ms"] == 20.0
+        assert row["time_saved_ms"] == 72.0
@@ -0,0 +1,45 @@
+"""
+Cache Warm-up Tests
+===================
+
+Tests du préchauffage (parallélisme, budget de temps, erreurs) et de l'état
+de readiness.
+"""
+
+import asyncio
+
+from app.core import cache_warmup
+from app.core.cache_warmup import cache_warmer, is_ready, warm_caches
+
+
+class TestCacheWarmup:
+    """Tests de warm_caches"""
+
+    def test_budget_errors_and_readiness(self):
+        @cache_warmer("test_fast")
+        async def fast():
+            await asyncio.sleep(0.01)
+
+        @cache_warmer("test_slow")
+        async def slow():
+            await asyncio.sleep(5)
+
+        @cache_warmer("test_broken")
+        async def broken():
+            raise RuntimeError("db down")
+
+        try:
+            result = asyncio.run(
+                warm_caches(["test_fast", "test_slow", "test_broken", "test_missing"], budget=0.2)
+            )
+        finally:
+            for name in ("test_fast", "test_slow", "test_broken"):
+                cache_warmup._warmers.pop(name, None)
+
+        warmers = result["warmers"]
+        assert warmers["test_fast"]["status"] == "ok"
+        assert warmers["test_slow"]["status"] == "timeout"
+        assert warmers["test_broken"] == {"status": "error", "error": "db down"}
+        assert warmers["test_missing"]["status"] == "unknown"
+        assert result["warmup_ms"] < 2000
+        assert is_ready()
@@ -0,0 +1,53 @@
+"""
+Circuit Breaker Tests
+=====================
+
+Tests des transitions closed → open → half_open → closed et du backoff.
+"""
+
+import time
+
+from app.core.circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker
+
+
+class TestCircuitBreaker:
+    """Tests du CircuitBreaker"""
+
+    def test_opens_after_threshold_and_rejects(self):
+        breaker = CircuitBreaker("test", failure_threshold=2, base_delay=60)
+        breaker.record_failure()
+        assert breaker.allow_request()
+
+        breaker.record_failure()
+        assert breaker.state == OPEN
+        assert not breaker.allow_request()
+        assert breaker.stats()["rejected_total"] == 1
+
+    def test_trip_opens_immediately(self):
+        breaker = CircuitBreaker("test", failure_threshold=5, base_delay=60)
+        breaker.record_failure(trip=True)
+        assert breaker.state == OPEN
+
+    def test_half_open_allows_single_probe(self):
+        breaker = CircuitBreaker("test", failure_threshold=1, base_delay=0.01)
+        breaker.record_failure()
+        time.sleep(0.02)
+
+        assert breaker.allow_request()
+        assert breaker.state == HALF_OPEN
+        assert not breaker.allow_request()
+
+        breaker.record_success()
+        assert breaker.state == CLOSED
+        assert breaker.allow_request()
+
+    def test_failed_probe_doubles_delay(self):
+        breaker = CircuitBreaker("test", failure_threshold=1, base_delay=0.01, max_delay=10)
+        breaker.record_failure()
+        time.sleep(0.02)
+        assert breaker.allow_request()
+
+        breaker.record_failure()
+        assert breaker.state == OPEN
+        assert breaker.stats()["retry_in_seconds"] >= 0.01
+        assert breaker.stats()["opened_total"] == 2
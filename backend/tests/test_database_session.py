@@ -0,0 +1,164 @@
+"""
+Database Session Wrapper Tests
+===============================
+
+Tests du wrapper de session async (run_sync, batch) et des garde-fous du
+mode natif sur une base SQLite en mémoire, sans dépendre du serveur de base
+de données.
+"""
+
+import asyncio
+
+import pytest
+from sqlalchemy import Column, ForeignKey, Integer, String, create_engine, select
+from sqlalchemy.exc import InvalidRequestError
+from sqlalchemy.orm import declarative_base, relationship, selectinload, sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.core.database import AsyncSessionNativeWrapper, AsyncSessionSyncWrapper, _NativeSyncSession
+
+
+LocalBase = declarative_base()
+
+
+class Item(LocalBase):
+    __tablename__ = "items"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    name = Column(String(50), nullable=False)
+
+
+class Tag(LocalBase):
+    __tablename__ = "tags"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    item_id = Column(Integer, ForeignKey("items.id"), nullable=False)
+    item = relationship(Item)
+
+
+@pytest.fixture
+def session_factory():
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    LocalBase.metadata.create_all(engine)
+    yield sessionmaker(bind=engine, expire_on_commit=False, autoflush=False)
+    engine.dispose()
+
+
+def _count(factory) -> int:
+    with factory() as session:
+        return len(session.execute(select(Item)).scalars().all())
+
+
+class TestAsyncSessionSyncWrapper:
+    """Tests du wrapper AsyncSessionSyncWrapper"""
+
+    def test_run_sync_executes_unit_of_work(self, session_factory):
+        db = AsyncSessionSyncWrapper(session_factory())
+
+        def create(session, name):
+            item = Item(name=name)
+            session.add(item)
+            session.commit()
+            session.refresh(item)
+            return item.id
+
+        item_id = asyncio.run(db.run_sync(create, "alpha"))
+
+        assert item_id is not None
+        assert _count(session_factory) == 1
+
+    def test_batch_defers_writes_until_exit(self, session_factory):
+        db = AsyncSessionSyncWrapper(session_factory())
+        item = Item(name="beta")
+
+        async def scenario():
+            async with db.batch():
+                await db.add(item)
+                await db.commit()
+                await db.refresh(item)
+                # Rien n'est encore écrit tant que le bloc n'est pas terminé
+                assert item.id is None
+                assert _count(session_factory) == 0
+            return item.id
+
+        assert asyncio.run(scenario()) is not None
+        assert _count(session_factory) == 1
+
+    def test_batch_flush_assigns_ids(self, session_factory):
+        db = AsyncSessionSyncWrapper(session_factory())
+        item = Item(name="gamma")
+
+        async def scenario():
+            async with db.batch():
+                await db.add(item)
+                await db.flush()
+                return item.id
+
+        assert asyncio.run(scenario()) is not None
+
+    def test_batch_rolls_back_on_error(self, session_factory):
+        db = AsyncSessionSyncWrapper(session_factory())
+
+        async def scenario():
+            async with db.batch():
+                await db.add(Item(name="delta"))
+                await db.flush()
+                raise ValueError("boom")
+
+        with pytest.raises(ValueError):
+            asyncio.run(scenario())
+
+        assert _count(session_factory) == 0
+
+    def test_lazy_session_not_created_until_used(self, session_factory):
+        calls = []
+
+        def factory():
+            calls.append(1)
+            return session_factory()
+
+        async def unused():
+            db = AsyncSessionSyncWrapper(factory=factory)
+            await db.rollback()
+            await db.commit()
+            await db.close()
+
+        asyncio.run(unused())
+        assert calls == []
+
+        async def used():
+            db = AsyncSessionSyncWrapper(factory=factory)
+            result = await db.execute(select(Item))
+            await db.close()
+            return result
+
+        asyncio.run(used())
+        assert calls == [1]
+
+
+class TestNativeSessionGuards:
+    """Tests des erreurs explicites du mode ``DB_DRIVER_MODE=async``"""
+
+    def test_legacy_query_is_rejected(self):
+        with pytest.raises(NotImplementedError, match="DB_DRIVER_MODE=async"):
+            AsyncSessionNativeWrapper(session=object()).query(Item)
+
+    def test_lazy_load_needing_sql_raises(self, session_factory):
+        with session_factory() as setup:
+            setup.add(Tag(item=Item(name="a")))
+            setup.commit()
+
+        session = _NativeSyncSession(bind=session_factory.kw["bind"])
+        tag = session.execute(select(Tag)).scalar_one()
+        with pytest.raises(InvalidRequestError, match="raise_on_sql"):
+            tag.item
+        session.close()
+
+        session = _NativeSyncSession(bind=session_factory.kw["bind"])
+        tag = session.execute(select(Tag).options(selectinload(Tag.item))).scalar_one()
+        assert tag.item.name == "a"
+        session.close()
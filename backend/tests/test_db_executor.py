@@ -0,0 +1,52 @@
+"""
+Database Executor Tests
+=======================
+
+Tests de la comptabilité de file de l'exécuteur dédié à la base de données.
+"""
+
+import asyncio
+import threading
+
+from app.core.db_executor import DatabaseExecutor
+
+
+class TestDatabaseExecutor:
+    """Tests de DatabaseExecutor"""
+
+    def test_runs_calls_and_counts_them(self):
+        executor = DatabaseExecutor(max_workers=2, wait_warning_ms=1000)
+        assert asyncio.run(executor.run(lambda a, b: a + b, 1, b=2)) == 3
+
+        stats = executor.stats()
+        assert stats["submitted"] == stats["completed"] == 1
+        assert stats["queue_depth"] == stats["active"] == 0
+        executor.shutdown()
+
+    def test_cancelled_queued_call_leaves_the_queue(self):
+        executor = DatabaseExecutor(max_workers=1, wait_warning_ms=1000)
+        release = threading.Event()
+        started = threading.Event()
+        ran = []
+
+        def blocking():
+            started.set()
+            release.wait(5)
+
+        async def scenario():
+            busy = asyncio.ensure_future(executor.run(blocking))
+            await asyncio.get_running_loop().run_in_executor(None, started.wait, 5)
+            queued = asyncio.ensure_future(executor.run(ran.append, 1))
+            await asyncio.sleep(0)
+            depth = executor.stats()["queue_depth"]
+            queued.cancel()
+            await asyncio.sleep(0)
+            release.set()
+            await busy
+            return depth
+
+        assert asyncio.run(scenario()) == 1
+        stats = executor.stats()
+        assert stats["queue_depth"] == 0 and stats["active"] == 0
+        assert ran == []
+        executor.shutdown()
@@ -0,0 +1,75 @@
+"""
+Connection Pool Liveness Tests
+==============================
+
+Tests du ping des connexions inactives au checkout (remplace pool_pre_ping).
+"""
+
+import time
+
+import pytest
+from sqlalchemy import create_engine, text
+
+from app.core.db_pool import InstrumentedQueuePool, install_liveness_checks, instrument_pool
+
+
+@pytest.fixture
+def make_engine(tmp_path):
+    engines = []
+
+    def factory(idle_seconds):
+        engine = create_engine(
+            f"sqlite:///{tmp_path / 'pool.db'}",
+            poolclass=InstrumentedQueuePool,
+            pool_size=1,
+            max_overflow=0,
+        )
+        metrics = instrument_pool(engine, "test")
+        install_liveness_checks(engine, metrics, idle_seconds)
+        engines.append(engine)
+        return engine, metrics
+
+    yield factory
+    for engine in engines:
+        engine.dispose()
+
+
+class TestLivenessChecks:
+    """Tests des vérifications de vie du pool"""
+
+    def test_recently_used_connection_is_not_pinged(self, make_engine):
+        engine, metrics = make_engine(idle_seconds=60)
+        for _ in range(3):
+            with engine.connect() as conn:
+                conn.execute(text("SELECT 1"))
+
+        assert metrics.liveness["pings"] == 0
+        assert metrics.liveness["connections_opened"] == 1
+
+    def test_idle_connection_is_pinged(self, make_engine):
+        engine, metrics = make_engine(idle_seconds=0.01)
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+        time.sleep(0.02)
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+
+        assert metrics.liveness["pings"] == 1
+        assert metrics.liveness["ping_failures"] == 0
+
+    def test_dead_connection_is_replaced_on_checkout(self, make_engine, monkeypatch):
+        engine, metrics = make_engine(idle_seconds=0)
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+
+        # Le serveur a fermé la connexion pendant qu'elle dormait dans le pool
+        def dead_ping(dbapi_connection):
+            monkeypatch.undo()
+            raise engine.dialect.dbapi.OperationalError("server closed the connection")
+
+        monkeypatch.setattr(engine.dialect, "do_ping", dead_ping)
+        with engine.connect() as conn:
+            assert conn.execute(text("SELECT 1")).scalar() == 1
+
+        assert metrics.liveness["ping_failures"] == 1
+        assert metrics.liveness["connections_opened"] == 2
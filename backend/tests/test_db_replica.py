@@ -0,0 +1,43 @@
+"""
+Read Replica Monitor Tests
+==========================
+
+Tests du verdict de santé du réplica (sonde, retard, erreurs de connexion).
+"""
+
+from sqlalchemy.exc import OperationalError, ProgrammingError
+
+from app.core.db_replica import ReplicaMonitor, is_connection_error
+
+
+class TestReplicaMonitor:
+    """Tests du ReplicaMonitor"""
+
+    def test_probe_result_is_cached_for_interval(self):
+        monitor = ReplicaMonitor(check_interval=60)
+        assert monitor.needs_check()
+
+        monitor.record_probe(1)
+
+        assert not monitor.needs_check()
+        assert monitor.healthy
+
+    def test_lag_above_bound_removes_replica(self):
+        monitor = ReplicaMonitor(check_interval=0, max_lag_seconds=5)
+
+        assert monitor.record_probe(2.5) is True
+        assert monitor.record_probe(12.0) is False
+        assert monitor.stats()["lag_seconds"] == 12.0
+
+    def test_connection_error_marks_unhealthy_until_next_probe(self):
+        monitor = ReplicaMonitor(check_interval=0)
+        error = OperationalError("SELECT 1", {}, Exception("connection refused"))
+
+        monitor.mark_unhealthy(error)
+        assert not monitor.healthy
+        assert monitor.record_probe(1) is True
+
+    def test_is_connection_error(self):
+        assert is_connection_error(OperationalError("SELECT 1", {}, Exception("down")))
+        assert not is_connection_error(ProgrammingError("SELECT x", {}, Exception("syntax")))
+        assert not is_connection_error(ValueError("boom"))
@@ -0,0 +1,265 @@
+"""
+Pagination Tests
+================
+
+Tests des curseurs opaques, des conditions de reprise (keyset) et des
+stratégies de calcul du total.
+"""
+
+import asyncio
+from contextlib import contextmanager
+from datetime import datetime
+from decimal import Decimal
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import create_engine, select
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import Session
+
+import app.models  # noqa: F401 — résolution des relations
+from app.core import cache as cache_module
+from app.api.v1.endpoints.messages import _MESSAGES_KEYSET
+from app.core.pagination import (
+    NULL_DATETIME, CountStrategy, Keyset, SortKey, count_rows, decode_cursor, encode_cursor,
+    fetch_offset_page, fetch_page,
+)
+from app.models.message import Message
+from app.models.vehicle import Vehicule
+from app.services.vehicle_catalog_service import CATALOG_KEYSET, _catalog_statements
+
+
+def _sql(statement) -> str:
+    return str(statement.compile(dialect=postgresql.dialect()))
+
+
+class TestCursor:
+    """Tests de l'encodage des curseurs"""
+
+    def test_round_trip_keeps_types(self):
+        values = [True, Decimal("4.50"), datetime(2024, 5, 1, 12, 30), 42]
+        cursor = encode_cursor(values)
+        assert "=" not in cursor
+        assert decode_cursor(cursor, 4) == values
+
+    @pytest.mark.parametrize("cursor", ["not-a-cursor", encode_cursor([1]), "e30"])
+    def test_invalid_cursor_is_rejected(self, cursor):
+        with pytest.raises(HTTPException) as exc:
+            decode_cursor(cursor, 2)
+        assert exc.value.status_code == 400
+
+
+class TestKeyset:
+    """Tests des conditions de reprise"""
+
+    def test_same_direction_uses_row_comparison(self):
+        keyset = Keyset(SortKey(Message.DateEnvoi), SortKey(Message.IdentifiantMessage))
+        sql = _sql(keyset.apply(Message.__table__.select(), encode_cursor([datetime(2024, 1, 1), 7]), 10))
+
+        assert '("Messages"."DateEnvoi", "Messages"."IdentifiantMessage") <' in sql
+        assert "OFFSET" not in sql and "LIMIT" in sql
+
+    def test_mixed_directions_expand_to_or(self):
+        keyset = Keyset(SortKey(Vehicule.PrixJournalier, descending=False), SortKey(Vehicule.IdentifiantVehicule))
+        sql = _sql(keyset.after([1000, 5]))
+        assert " OR " in sql and '"Vehicules"."PrixJournalier" >' in sql
+
+    def test_null_sort_values_use_replacement(self):
+        row = SimpleNamespace(EstVedette=None, NotesVehicule=None, IdentifiantVehicule=3)
+        assert decode_cursor(CATALOG_KEYSET.cursor_for(row), 3) == [False, 0, 3]
+
+    def test_catalog_cursor_statement_has_no_offset(self):
+        _, page_query = _catalog_statements(("city",), True)
+        sql = _sql(page_query)
+        assert "OFFSET" not in sql and "%(cursor_2)s" in sql
+
+
+class _ListSession:
+    def __init__(self, rows, count=0, plan_rows=None):
+        self.rows = rows
+        self.count = count
+        self.plan_rows = plan_rows
+        self.statements = []
+        self.savepoints = []
+
+    def _scalar(self, statement):
+        self.statements.append(statement)
+        if str(statement).startswith("EXPLAIN"):
+            if self.plan_rows is None:
+                raise RuntimeError("EXPLAIN failed")
+            return [{"Plan": {"Plan Rows": self.plan_rows}}]
+        return self.count
+
+    async def scalar(self, statement, params=None):
+        return self._scalar(statement)
+
+    async def run_sync(self, fn):
+        db = self
+
+        class _Sync:
+            @contextmanager
+            def begin_nested(self):
+                try:
+                    yield
+                except Exception:
+                    db.savepoints.append("rollback")
+                    raise
+                db.savepoints.append("release")
+
+            def scalar(self, statement, params=None):
+                return db._scalar(statement)
+
+        return fn(_Sync())
+
+    async def execute(self, statement, params=None):
+        self.statements.append(statement)
+        rows = self.rows
+
+        class _Result:
+            def scalars(self):
+                return self
+
+            def all(self):
+                return rows
+
+        return _Result()
+
+
+class _SyncSession:
+    """Session synchrone (SQLite en mémoire) derrière l'interface asynchrone."""
+
+    def __init__(self, session):
+        self.session = session
+
+    async def execute(self, statement, params=None):
+        return self.session.execute(statement, params)
+
+
+class TestFetchPage:
+    """Tests de fetch_page"""
+
+    def test_extra_row_produces_next_cursor(self):
+        rows = [SimpleNamespace(DateEnvoi=datetime(2024, 1, d), IdentifiantMessage=d) for d in (3, 2, 1)]
+        keyset = Keyset(SortKey(Message.DateEnvoi), SortKey(Message.IdentifiantMessage))
+        db = _ListSession(rows)
+
+        page, next_cursor = asyncio.run(
+            fetch_page(db, Message.__table__.select(), keyset, page=1, page_size=2)
+        )
+
+        assert [r.IdentifiantMessage for r in page] == [3, 2]
+        assert decode_cursor(next_cursor, 2) == [datetime(2024, 1, 2), 2]
+        assert "LIMIT" in _sql(db.statements[0])
+
+    def test_last_page_has_no_cursor(self):
+        rows = [SimpleNamespace(DateEnvoi=datetime(2024, 1, 1), IdentifiantMessage=1)]
+        keyset = Keyset(SortKey(Message.DateEnvoi), SortKey(Message.IdentifiantMessage))
+        page, next_cursor = asyncio.run(
+            fetch_page(_ListSession(rows), Message.__table__.select(), keyset, page=1, page_size=2, cursor="")
+        )
+        assert len(page) == 1 and next_cursor is None
+
+    def test_cursor_pages_across_null_dates(self):
+        engine = create_engine("sqlite://")
+        Message.__table__.create(engine)
+        with Session(engine) as session:
+            session.add_all(
+                Message(IdentifiantMessage=i, IdentifiantConversation=1, IdentifiantExpediteur=1,
+                        IdentifiantDestinataire=2, ContenuMessage="m", DateEnvoi=date)
+                for i, date in [(1, datetime(2024, 1, 1)), (2, None), (3, datetime(2024, 1, 3)), (4, None)]
+            )
+            session.flush()
+            # DateEnvoi=None reçoit la valeur par défaut à l'insertion
+            session.execute(
+                Message.__table__.update().where(Message.IdentifiantMessage.in_([2, 4])).values(DateEnvoi=None)
+            )
+            session.expire_all()
+
+            db = _SyncSession(session)
+            query = select(Message)
+
+            async def scroll():
+                seen, cursor = [], None
+                while True:
+                    rows, cursor = await fetch_page(
+                        db, query, _MESSAGES_KEYSET, page=1, page_size=1, cursor=cursor
+                    )
+                    seen += [r.IdentifiantMessage for r in rows]
+                    if cursor is None:
+                        return seen
+
+            assert asyncio.run(scroll()) == [3, 1, 4, 2]
+        null_row = SimpleNamespace(DateEnvoi=None, IdentifiantMessage=4)
+        assert decode_cursor(_MESSAGES_KEYSET.cursor_for(null_row), 2) == [NULL_DATETIME, 4]
+
+    def test_offset_page_reports_has_more(self):
+        db = _ListSession([1, 2, 3])
+        rows, has_more = asyncio.run(
+            fetch_offset_page(db, Message.__table__.select(), page=2, page_size=2)
+        )
+        assert rows == [1, 2] and has_more
+        assert "OFFSET" in _sql(db.statements[0])
+
+
+@pytest.fixture
+def no_redis(monkeypatch):
+    async def get_redis():
+        return None
+    monkeypatch.setattr(cache_module, "get_redis", get_redis)
+
+
+class TestCountRows:
+    """Tests des stratégies de total"""
+
+    query = Message.__table__.select().where(Message.IdentifiantConversation == 7)
+
+    def test_none_skips_the_query(self):
+        db = _ListSession([], count=12)
+        assert asyncio.run(count_rows(db, self.query, CountStrategy.NONE)) is None
+        assert db.statements == []
+
+    def test_exact_counts_the_filtered_query(self):
+        db = _ListSession([], count=12)
+        assert asyncio.run(count_rows(db, self.query, CountStrategy.EXACT)) == 12
+        assert "count(*)" in _sql(db.statements[0])
+
+    @pytest.mark.usefixtures("no_redis")
+    def test_cached_count_is_shared_until_ttl(self):
+        db = _ListSession([], count=5)
+        query = Message.__table__.select().where(Message.IdentifiantConversation == 70001)
+
+        async def scenario():
+            first = await count_rows(db, query, CountStrategy.CACHED)
+            db.count = 6
+            second = await count_rows(db, query, CountStrategy.CACHED)
+            other = await count_rows(db, query.where(Message.EstLu == False), CountStrategy.CACHED)
+            return first, second, other
+
+        assert asyncio.run(scenario()) == (5, 5, 6)
+
+    def test_estimate_used_above_threshold(self):
+        db = _ListSession([], count=3, plan_rows=250000)
+        assert asyncio.run(count_rows(db, self.query, CountStrategy.ESTIMATED)) == 250000
+        assert len(db.statements) == 1 and db.savepoints == ["release"]
+
+    def test_estimate_binds_filter_values(self):
+        db = _ListSession([], count=3, plan_rows=250000)
+        query = Message.__table__.select().where(
+            Message.ContenuMessage == "12:30 100%", Message.IdentifiantMessage.in_([4, 5])
+        )
+        assert asyncio.run(count_rows(db, query, CountStrategy.ESTIMATED)) == 250000
+
+        explain = db.statements[0].compile(dialect=postgresql.dialect())
+        assert "12:30" not in str(explain) and "IN (%(IdentifiantMessage_1_1)s" in str(explain)
+        assert "12:30 100%" in explain.params.values()
+
+    def test_failed_estimate_rolls_back_its_savepoint(self):
+        db = _ListSession([], count=3)
+        assert asyncio.run(count_rows(db, self.query, CountStrategy.ESTIMATED)) == 3
+        assert db.savepoints == ["rollback"]
+        assert "count(*)" in _sql(db.statements[-1])
+
+    def test_small_estimate_falls_back_to_exact(self):
+        db = _ListSession([], count=3, plan_rows=4)
+        assert asyncio.run(count_rows(db, self.query, CountStrategy.ESTIMATED)) == 3
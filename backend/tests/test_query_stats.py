@@ -0,0 +1,111 @@
+"""
+Query Instrumentation Tests
+===========================
+
+Tests du comptage de requêtes SQL, de la détection N+1 et du profiler
+par empreinte, sur SQLite en mémoire.
+"""
+
+import pytest
+from sqlalchemy import Column, Integer, String, create_engine, select, text
+from sqlalchemy.orm import declarative_base, sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.core.db_instrumentation import fingerprint_sql, track_queries
+from app.core.query_profiler import OTHER_FINGERPRINT, QueryProfiler
+
+
+LocalBase = declarative_base()
+
+
+class Item(LocalBase):
+    __tablename__ = "items"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    name = Column(String(50), nullable=False)
+
+
+@pytest.fixture
+def sqlite_engine():
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    LocalBase.metadata.create_all(engine)
+    with sessionmaker(bind=engine)() as session:
+        session.add_all([Item(name=f"item-{i}") for i in range(5)])
+        session.commit()
+    yield engine
+    engine.dispose()
+
+
+class TestFingerprint:
+    """Tests de la normalisation SQL"""
+
+    def test_literals_and_params_are_ignored(self):
+        a = fingerprint_sql("SELECT * FROM t WHERE id = %(id_1)s AND name = 'x' LIMIT 10")
+        b = fingerprint_sql("SELECT *  FROM t\n WHERE id = %(id_1)s AND name = 'yy' LIMIT 20")
+        assert a == b == "SELECT * FROM t WHERE id = ? AND name = ? LIMIT ?"
+
+    def test_in_lists_are_collapsed(self):
+        a = fingerprint_sql("SELECT * FROM t WHERE id IN (?, ?, ?)")
+        b = fingerprint_sql("SELECT * FROM t WHERE id IN (%(id_1_1)s)")
+        assert a == b
+
+
+class TestQueryCounting:
+    """Tests du comptage par bloc"""
+
+    def test_n_plus_one_is_reported_as_duplicates(self, sqlite_engine, assert_max_queries):
+        session = sessionmaker(bind=sqlite_engine)()
+        with assert_max_queries(10, engine=sqlite_engine) as stats:
+            ids = session.execute(select(Item.id)).scalars().all()
+            for item_id in ids:
+                session.execute(select(Item).where(Item.id == item_id)).scalar_one()
+        session.close()
+
+        assert stats.count == 6
+        (fingerprint, repeated), = stats.duplicates()
+        assert repeated == 5
+        assert "WHERE items.id = ?" in fingerprint
+
+    def test_assert_max_queries_fails_when_exceeded(self, sqlite_engine, assert_max_queries):
+        with pytest.raises(AssertionError, match="at most 1 SQL statements, got 2"):
+            with assert_max_queries(1, engine=sqlite_engine):
+                with sqlite_engine.connect() as conn:
+                    conn.execute(text("SELECT 1"))
+                    conn.execute(text("SELECT 2"))
+
+    def test_statements_outside_tracking_are_ignored(self, sqlite_engine, assert_max_queries):
+        with assert_max_queries(0, engine=sqlite_engine):
+            pass
+        with sqlite_engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+        with track_queries() as stats:
+            pass
+        assert stats.count == 0
+
+
+class TestQueryProfiler:
+    """Tests du profiler par empreinte"""
+
+    def test_latencies_grouped_by_fingerprint(self):
+        profiler = QueryProfiler(slow_query_ms=100, max_fingerprints=10)
+        for i in range(3):
+            profiler.observe(f"SELECT * FROM items WHERE id = {i}", 5.0)
+        profiler.observe("SELECT * FROM items WHERE id = 9", 150.0)
+
+        (row,) = profiler.snapshot()
+        assert row["count"] == 4
+        assert row["total_ms"] == 165.0
+        assert row["max_ms"] == 150.0
+        assert len(profiler.slow_queries) == 1
+
+    def test_fingerprint_table_is_bounded(self):
+        profiler = QueryProfiler(slow_query_ms=1000, max_fingerprints=2)
+        for table in ("a", "b", "c", "d"):
+            profiler.observe(f"SELECT * FROM {table}", 1.0)
+
+        fingerprints = {row["fingerprint"] for row in profiler.snapshot()}
+        assert fingerprints == {"SELECT * FROM a", "SELECT * FROM b", OTHER_FINGERPRINT}
@@ -0,0 +1,249 @@
+"""
+Search Index Tests
+==================
+
+Tests de la tokenisation, du classement et de la mise à jour de l'index plein
+texte du catalogue, de l'index d'autocomplétion et de leur utilisation par
+``VehicleCatalogService``.
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+from sqlalchemy.dialects import postgresql
+
+import app.models  # noqa: F401 — résolution des relations
+from app.services import vehicle_catalog_service as catalog_module
+from app.services.search_index_service import SearchIndex, tokenize
+from app.services.vehicle_catalog_service import (
+    VehicleCatalogService, VehicleFilters, _ranked_candidates, _ranked_statements,
+)
+
+
+def _index(*rows):
+    index = SearchIndex()
+    index.replace_all(rows)
+    index.ready = True
+    return index
+
+
+class TestTokenize:
+    """Tests de la normalisation des termes"""
+
+    def test_accents_case_and_ligatures_are_folded(self):
+        assert tokenize("Yaoundé CŒUR Élégante") == ["yaounde", "coeur", "elegante"]
+
+    def test_french_stopwords_and_plurals(self):
+        assert tokenize("Location de voitures à Douala pour le weekend") == [
+            "location", "voiture", "douala", "weekend",
+        ]
+
+    def test_digits_are_kept(self):
+        assert tokenize("Peugeot 3008, 7 places") == ["peugeot", "3008", "7", "place"]
+
+
+class TestSearchIndex:
+    """Tests du classement et des mises à jour"""
+
+    def test_title_match_ranks_above_description_match(self):
+        index = _index(
+            (1, "Berline confortable", "Idéale pour un Toyota fan", "Douala"),
+            (2, "Toyota Corolla", "Berline fiable", "Douala"),
+        )
+        assert [vid for vid, _ in index.search("toyota")] == [2, 1]
+
+    def test_all_terms_must_match_and_last_is_prefix(self):
+        index = _index(
+            (1, "Toyota Corolla", None, "Douala"),
+            (2, "Toyota Hilux", None, "Yaoundé"),
+        )
+        assert [vid for vid, _ in index.search("toyota yaoun")] == [2]
+        assert index.search("toyota yaoun ") == []
+        assert [vid for vid, _ in index.search("Yaounde")] == [2]
+
+    def test_incremental_upsert_and_remove(self):
+        index = _index((1, "Toyota Corolla", None, "Douala"))
+        index.upsert(2, "Kia Picanto", "Citadine", "Kribi")
+        assert [vid for vid, _ in index.search("picanto")] == [2]
+
+        index.upsert(1, "Honda Civic", None, "Douala")
+        assert index.search("corolla") == []
+        assert [vid for vid, _ in index.search("civic")] == [1]
+
+        index.remove(2)
+        assert index.search("kribi") == []
+        assert index.stats()["documents"] == 1
+
+
+class TestSuggestionIndex:
+    """Tests de l'autocomplétion"""
+
+    def _index(self):
+        return _index(
+            (1, "Corolla propre", None, "Douala", "Toyota", "Corolla", "Berline", True),
+            (2, "Hilux 4x4", None, "Douala", "Toyota", "Hilux", "SUV", True),
+            (3, "Corolla récente", None, "Yaoundé", "Toyota", "Corolla", "Berline", True),
+            (4, "Vieille Corolla", None, "Kribi", "Toyota", "Corolla", "Berline", False),
+        )
+
+    def test_counts_only_active_vehicles(self):
+        suggestions = self._index().suggestions.suggest("toy")
+        assert suggestions[0] == {"text": "Toyota", "type": "brand", "count": 3}
+
+    def test_matches_word_starts_and_ranks_by_count(self):
+        suggestions = self._index().suggestions.suggest("coro", limit=3)
+        assert suggestions == [
+            {"text": "Toyota Corolla", "type": "model", "count": 2},
+            {"text": "Corolla propre", "type": "title", "count": 1},
+            {"text": "Corolla récente", "type": "title", "count": 1},
+        ]
+        assert self._index().suggestions.suggest("yaounde") == [
+            {"text": "Yaoundé", "type": "city", "count": 1},
+        ]
+
+    def test_incremental_updates_adjust_counts(self):
+        index = self._index()
+        index.upsert(2, "Hilux 4x4", None, "Limbé", "Toyota", "Hilux", "SUV", True)
+        index.remove(1)
+
+        cities = {s["text"]: s["count"] for s in index.suggestions.suggest("d")}
+        assert "Douala" not in cities
+        assert index.suggestions.suggest("limbe") == [{"text": "Limbé", "type": "city", "count": 1}]
+
+        index.upsert(4, "Vieille Corolla", None, "Kribi", "Toyota", "Corolla", "Berline", True)
+        assert index.suggestions.suggest("toyota c")[0]["count"] == 2
+
+    def test_short_prefix_ranks_beyond_first_keys(self):
+        rows = [(vid, None, None, f"Aa{vid:04d}") for vid in range(1, 701)]
+        rows += [(1000 + vid, None, None, None, "Audi") for vid in range(5)]
+        index = _index(*rows)
+        assert index.suggestions.suggest("a", limit=1) == [{"text": "Audi", "type": "brand", "count": 5}]
+
+        for vid in range(6):
+            index.upsert(2000 + vid, None, None, None, "Alfa Romeo")
+        assert index.suggestions.suggest("a", limit=2) == [
+            {"text": "Alfa Romeo", "type": "brand", "count": 6},
+            {"text": "Audi", "type": "brand", "count": 5},
+        ]
+
+
+class _RankedSession:
+    """Session factice : ne garde que les identifiants de ``matching``."""
+
+    def __init__(self, matching):
+        self.matching = matching
+        self.statements = []
+
+    async def execute(self, statement, params=None):
+        self.statements.append(params)
+        if "search_ids" in params:
+            rows = [vid for vid in params["search_ids"] if vid in self.matching]
+        else:
+            # ordre volontairement différent de la pertinence
+            rows = [SimpleNamespace(IdentifiantVehicule=vid) for vid in sorted(params["page_ids"])]
+
+        class _Result:
+            def scalars(self):
+                return self
+
+            def all(self):
+                return rows
+
+        return _Result()
+
+
+class TestRankedCatalog:
+    """Tests du catalogue appuyé sur l'index"""
+
+    def test_ranked_statement_binds_ids(self):
+        filters = VehicleFilters.from_query(search="corolla", city="Douala")
+        ids_query, _ = _ranked_statements(filters.shape)
+        sql = str(ids_query.compile(dialect=postgresql.dialect()))
+
+        assert "ILIKE" not in sql.upper()
+        assert "search_ids" in sql and "%(city)s" in sql
+
+    def test_untokenizable_or_capped_queries_fall_back_to_ilike(self, monkeypatch):
+        index = _index(*[(vid, f"Toyota {vid}", None, "Douala") for vid in range(1, 4)])
+        monkeypatch.setattr(catalog_module, "search_index", index)
+
+        for query in ("de la", "a"):
+            assert _ranked_candidates(VehicleFilters.from_query(search=query)) is None
+        assert len(_ranked_candidates(VehicleFilters.from_query(search="toyota"))) == 3
+
+        monkeypatch.setattr(catalog_module.settings, "SEARCH_INDEX_MAX_CANDIDATES", 2)
+        assert _ranked_candidates(VehicleFilters.from_query(search="toyota")) is None
+        assert [vid for vid, _ in _ranked_candidates(VehicleFilters.from_query(search="toyota 2"))] == [2]
+
+    def test_results_follow_relevance_and_db_filters(self, monkeypatch):
+        index = _index(
+            (1, "Berline", "Une Toyota", "Douala"),
+            (2, "Toyota Corolla", None, "Douala"),
+            (3, "Toyota Hilux", None, "Kribi"),
+        )
+        monkeypatch.setattr(catalog_module, "search_index", index)
+        db = _RankedSession(matching={1, 2})
+        filters = VehicleFilters.from_query(search="toyota", city="Douala")
+
+        vehicles, total, next_cursor = asyncio.run(VehicleCatalogService.list_vehicles(db, filters, 1, 20))
+
+        assert total == 2 and next_cursor is None
+        assert [v.IdentifiantVehicule for v in vehicles] == [2, 1]
+        assert "search" not in db.statements[0]
+
+    def test_cursor_resumes_after_last_ranked_vehicle(self, monkeypatch):
+        index = _index(*[(vid, f"Toyota {vid}", None, "Douala") for vid in range(1, 6)])
+        monkeypatch.setattr(catalog_module, "search_index", index)
+        db = _RankedSession(matching={1, 2, 3, 4, 5})
+        filters = VehicleFilters.from_query(search="toyota")
+
+        async def scroll():
+            seen, cursor = [], ""
+            while cursor is not None:
+                vehicles, total, cursor = await VehicleCatalogService.list_vehicles(db, filters, 1, 2, cursor)
+                seen.append([v.IdentifiantVehicule for v in vehicles])
+            return seen
+
+        assert asyncio.run(scroll()) == [[1, 2], [3, 4], [5]]
+
+    def test_cursor_from_the_other_mode_restarts(self, monkeypatch):
+        index = _index(*[(vid, f"Toyota {vid}", None, "Douala") for vid in range(1, 4)])
+        monkeypatch.setattr(catalog_module, "search_index", index)
+        filters = VehicleFilters.from_query(search="toyota")
+        keyset_cursor = catalog_module._encode_cursor("k", [False, 0, 2])
+
+        vehicles, _, _ = asyncio.run(
+            VehicleCatalogService.list_vehicles(_RankedSession({1, 2, 3}), filters, 1, 2, keyset_cursor)
+        )
+        assert [v.IdentifiantVehicule for v in vehicles] == [1, 2]
+
+        index.ready = False
+        db = _KeysetSession()
+        _, _, next_cursor = asyncio.run(VehicleCatalogService.list_vehicles(db, filters, 1, 1, ""))
+        ranked_cursor = catalog_module._encode_cursor("r", [1.5, 2])
+        asyncio.run(VehicleCatalogService.list_vehicles(db, filters, 1, 1, ranked_cursor))
+        assert db.params[-1]["offset"] == 0 and "cursor_0" not in db.params[-1]
+        assert catalog_module._decode_cursor(next_cursor, "k", 3) == [False, 0, 2]
+
+
+class _KeysetSession:
+    """Session factice du chemin ``ILIKE`` : deux véhicules, paramètres enregistrés."""
+
+    def __init__(self):
+        self.params = []
+
+    async def scalar(self, statement, params=None):
+        return 2
+
+    async def execute(self, statement, params=None):
+        self.params.append(params)
+        rows = [SimpleNamespace(EstVedette=False, NotesVehicule=None, IdentifiantVehicule=vid) for vid in (2, 1)]
+
+        class _Result:
+            def scalars(self):
+                return self
+
+            def all(self):
+                return rows
+
+        return _Result()
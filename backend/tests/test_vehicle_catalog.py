@@ -0,0 +1,169 @@
+"""
+Vehicle Catalog Service Tests
+=============================
+
+Tests de la normalisation des filtres, du cache de statements par forme, du
+cache des pages et des facettes.
+"""
+
+import asyncio
+
+from sqlalchemy.dialects import postgresql
+
+import app.models  # noqa: F401 — résolution des relations
+from app.core import cache as cache_module
+from app.services.vehicle_catalog_service import (
+    VehicleCatalogService, VehicleFilters, _catalog_statements, _facet_statement,
+)
+
+
+class TestVehicleFilters:
+    """Tests de VehicleFilters"""
+
+    def test_all_and_empty_values_are_not_filters(self):
+        filters = VehicleFilters.from_query(city="all", type="", fuel=None, min_price=0, available=False)
+        assert filters.shape == ()
+        assert filters.bind_values() == {}
+
+    def test_bind_values_follow_shape(self):
+        filters = VehicleFilters.from_query(search="corolla", city="Douala", seats=5, featured=True)
+        assert filters.shape == ("search", "city", "seats", "featured_only")
+        assert filters.bind_values() == {"search": "%corolla%", "city": "Douala", "seats": 5}
+
+    def test_cache_key_ignores_case_of_ilike_filters(self):
+        a = VehicleFilters.from_query(search="Corolla", fuel="Diesel", city="Douala")
+        b = VehicleFilters.from_query(search="corolla", fuel="diesel", city="Douala")
+        c = VehicleFilters.from_query(search="corolla", fuel="diesel", city="douala")
+        assert a.cache_key_values() == b.cache_key_values()
+        assert b.cache_key_values() != c.cache_key_values()
+
+    def test_cache_key_keeps_whitespace_bound_in_ilike(self):
+        padded = VehicleFilters.from_query(search=" corolla ")
+        trimmed = VehicleFilters.from_query(search="corolla")
+        assert padded.bind_values() == {"search": "% corolla %"}
+        assert padded.cache_key_values() != trimmed.cache_key_values()
+
+
+class TestStatementCache:
+    """Tests du cache de statements"""
+
+    def test_same_shape_reuses_statements(self):
+        a = VehicleFilters.from_query(city="Douala", max_price=30000)
+        b = VehicleFilters.from_query(city="Yaoundé", max_price=15000)
+        assert _catalog_statements(a.shape) is _catalog_statements(b.shape)
+
+    def test_values_are_bound_not_inlined(self):
+        filters = VehicleFilters.from_query(search="corolla", type="SUV")
+        count_query, page_query = _catalog_statements(filters.shape)
+        sql = str(page_query.compile(dialect=postgresql.dialect()))
+
+        assert "corolla" not in sql
+        assert "%(search)s" in sql and "%(category)s" in sql
+        assert "LIMIT %(limit)s OFFSET %(offset)s" in sql
+
+
+class _FakeSession:
+    def __init__(self):
+        self.calls = 0
+
+    async def scalar(self, statement, params=None):
+        self.calls += 1
+        return 0
+
+    async def execute(self, statement, params=None):
+        self.calls += 1
+
+        class _Result:
+            def scalars(self):
+                return self
+
+            def all(self):
+                return []
+
+        return _Result()
+
+
+class TestPageCache:
+    """Tests du cache des pages du catalogue (L1 seul, sans Redis)"""
+
+    def test_pages_are_cached_until_invalidation(self, monkeypatch):
+        async def no_redis():
+            return None
+        monkeypatch.setattr(cache_module, "get_redis", no_redis)
+        db = _FakeSession()
+        filters = VehicleFilters.from_query(city="Page-cache-test")
+
+        async def scenario():
+            first = await VehicleCatalogService.list_vehicle_page(db, filters, 1, 20)
+            await VehicleCatalogService.list_vehicle_page(db, filters, 1, 20)
+            cached_calls = db.calls
+            await VehicleCatalogService.invalidate_caches()
+            await VehicleCatalogService.list_vehicle_page(db, filters, 1, 20)
+            return first, cached_calls
+
+        first, cached_calls = asyncio.run(scenario())
+
+        assert first == {"vehicles": [], "total": 0, "has_more": False, "next_cursor": None}
+        assert cached_calls == 2
+        assert db.calls == 4
+
+
+class _FacetSession:
+    """Lignes GROUPING SETS : (city, fuel, transmission, category, price, nom, g1..g5, count)."""
+
+    rows = [
+        ("Douala", None, None, None, None, None, 0, 1, 1, 1, 1, 7),
+        ("Kribi", None, None, None, None, None, 0, 1, 1, 1, 1, 2),
+        (None, "Diesel", None, None, None, None, 1, 0, 1, 1, 1, 5),
+        (None, None, None, None, None, None, 1, 0, 1, 1, 1, 4),
+        (None, None, "Manuelle", None, None, None, 1, 1, 0, 1, 1, 9),
+        (None, None, None, 3, None, "SUV", 1, 1, 1, 0, 1, 6),
+        (None, None, None, None, 5, None, 1, 1, 1, 1, 0, 1),
+        (None, None, None, None, 0, None, 1, 1, 1, 1, 0, 8),
+    ]
+
+    def __init__(self):
+        self.calls = 0
+
+    async def execute(self, statement, params=None):
+        self.calls += 1
+        rows = self.rows
+
+        class _Result:
+            def all(self):
+                return rows
+
+        return _Result()
+
+
+class TestFacets:
+    """Tests des facettes du catalogue"""
+
+    def test_single_grouping_sets_statement_per_shape(self):
+        sql = str(_facet_statement(("city",)).compile(dialect=postgresql.dialect()))
+        assert sql.count("SELECT") == 2
+        assert "GROUP BY GROUPING SETS" in sql
+        assert _facet_statement(("city",)) is _facet_statement(("city",))
+
+    def test_histograms_are_decoded_and_cached(self, monkeypatch):
+        async def no_redis():
+            return None
+        monkeypatch.setattr(cache_module, "get_redis", no_redis)
+        db = _FacetSession()
+        filters = VehicleFilters.from_query(city="Facet-test")
+
+        async def scenario():
+            first = await VehicleCatalogService.facets(db, filters)
+            await VehicleCatalogService.facets(db, filters)
+            return first
+
+        facets = asyncio.run(scenario())
+
+        assert db.calls == 1
+        assert facets["city"] == [{"value": "Douala", "count": 7}, {"value": "Kribi", "count": 2}]
+        assert facets["fuel"] == [{"value": "Diesel", "count": 5}]
+        assert facets["category"] == [{"value": "SUV", "count": 6}]
+        assert facets["price"] == [
+            {"min": 0, "max": 10000, "count": 8},
+            {"min": 100000, "max": None, "count": 1},
+        ]